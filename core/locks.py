@@ -0,0 +1,65 @@
+import time
+import fcntl
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from core.logs.logger import logger
+
+# seconds between two attempts to take the lock file
+POLL_INTERVAL = 0.05
+_held = threading.local()
+
+
+class WriteLockTimeout(TimeoutError):
+    """
+    Raised when the SQLite write lock could not be taken within the timeout.
+    Base classes:
+        - TimeoutError
+    """
+
+
+@contextmanager
+def write_lock(using=DEFAULT_DB_ALIAS, timeout=None):
+    """
+    Serialize long write batches of every process sharing the SQLite file.
+    gunicorn, the Celery worker and beat take the same lock file, so batches queue
+    here with a bounded wait instead of holding SQLite's write lock in turns until
+    short writers run out of busy timeout. Re-entrant within a thread, and a no-op
+    on other database backends.
+    Args:
+        - using (str): database alias the batch writes to.
+        - timeout (float, optional): seconds to wait, defaults to SQLITE_WRITE_LOCK_TIMEOUT.
+    Returns:
+        - context manager, raises WriteLockTimeout when the wait runs out.
+    """
+    if connections[using].vendor != 'sqlite':
+        yield
+        return
+    if getattr(_held, 'depth', 0):
+        _held.depth += 1
+        try:
+            yield
+        finally:
+            _held.depth -= 1
+        return
+    timeout = settings.SQLITE_WRITE_LOCK_TIMEOUT if timeout is None else timeout
+    started = time.monotonic()
+    with open(settings.SQLITE_WRITE_LOCK_FILE, 'a') as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() - started >= timeout:
+                    raise WriteLockTimeout(f"SQLite write lock not acquired within {timeout}s")
+                time.sleep(POLL_INTERVAL)
+        waited = time.monotonic() - started
+        if waited >= 1:
+            logger.info(f"Waited {waited:.2f}s for the SQLite write lock")
+        _held.depth = 1
+        try:
+            yield
+        finally:
+            _held.depth = 0
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,35 +1,277 @@
-import pytz
+import os
+import copy
+import time
+import queue
+import atexit
+import random
 import logging
-from decouple import config
+import threading
+import orjson
+import pytz
+from datetime import datetime
+from decouple import config, Csv
 from asgiref.local import Local
-from django.utils import timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 nepali_timezone = pytz.timezone(config('TIME_ZONE'))
-current_time = timezone.now().astimezone(nepali_timezone)
-formatted_time = current_time.strftime("%Y-%m-%d %I:%M:%S %p")
 
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_FILE = config('LOG_FILE', default='reportcardsystem.log')
+# 'text' keeps the original line format, 'json' writes one object per line
+LOG_FORMAT = config('LOG_FORMAT', default='text')
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=50 * 1024 * 1024, cast=int)
+LOG_ROTATE_INTERVAL_HOURS = config('LOG_ROTATE_INTERVAL_HOURS', default=24, cast=float)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=10, cast=int)
+# records waiting for the writer thread, requests never block on a full queue, the record is dropped
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+# INFO and DEBUG records kept per call site and window, 0 keeps every record
+LOG_RATE_LIMIT = config('LOG_RATE_LIMIT', default=0, cast=int)
+LOG_RATE_LIMIT_WINDOW = config('LOG_RATE_LIMIT_WINDOW', default=60, cast=float)
+# fraction of INFO and DEBUG records kept per logger, e.g. "django.request=0.1,core.logs.logger=0.5"
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (item.split('=', 1) for item in config('LOG_SAMPLE_RATES', default='', cast=Csv()))
+}
+
+TEXT_FORMAT = '%(levelname)s -- %(logged_time)s -- %(short_path)s:%(lineno)d -- User: %(username)s -- Message: %(message)s'
+TIME_FORMAT = "%Y-%m-%d %I:%M:%S %p"
 
-nepali_time = timezone.now()
 _local = Local()
 
+
 class UserFilter(logging.Filter):
+    """
+    Add the username and the short path of the caller to every record.
+    Runs on the queue handler, in the thread that logged the record.
+    """
     def filter(self, record):
         record.username = getattr(_local, 'username', 'Anonymous')
-        record.logged_time = formatted_time
         full_path = record.pathname
         record.short_path = '/'.join(full_path.split('/')[-3:])
         return True
 
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop hot-path INFO and DEBUG records before they are queued.
+    Each logger keeps its LOG_SAMPLE_RATES fraction of records, and each call site
+    (file and line) keeps at most rate_limit records per window. The first record of
+    the next window carries the number suppressed. Warnings and errors always pass.
+    Args:
+        - sample_rates (dict): logger name to the fraction of records kept.
+        - rate_limit (int): records per call site and window, 0 for no limit.
+        - window (float): seconds of a rate limit window.
+    Returns:
+        - SamplingFilter
+    """
+    def __init__(self, sample_rates=None, rate_limit=0, window=60):
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.rate_limit = rate_limit
+        self.window = window
+        self.call_sites = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.sample_rates.get(record.name)
+        if rate is not None and random.random() >= rate:
+            return False
+        if not self.rate_limit:
+            return True
+        site = (record.pathname, record.lineno)
+        with self.lock:
+            window_start, count, suppressed = self.call_sites.get(site, (record.created, 0, 0))
+            if record.created - window_start >= self.window:
+                window_start, count = record.created, 0
+                if suppressed:
+                    record.suppressed = suppressed
+                    suppressed = 0
+            if count >= self.rate_limit:
+                self.call_sites[site] = (window_start, count, suppressed + 1)
+                return False
+            self.call_sites[site] = (window_start, count + 1, suppressed)
+        return True
+
+
+class LocalTimeFormatter(logging.Formatter):
+    """
+    Text formatter stamping each record with its own creation time in TIME_ZONE.
+    """
+    def format(self, record):
+        record.logged_time = datetime.fromtimestamp(record.created, nepali_timezone).strftime(TIME_FORMAT)
+        message = super().format(record)
+        if getattr(record, 'suppressed', 0):
+            message += f" ({record.suppressed} similar messages suppressed)"
+        return message
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record, for log shippers.
+    """
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, nepali_timezone).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'path': f"{getattr(record, 'short_path', record.pathname)}:{record.lineno}",
+            'user': getattr(record, 'username', 'Anonymous'),
+            'process': record.process,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotate the log file when it reaches max_bytes or when interval seconds have passed
+    since it was started, keeping backup_count numbered backups.
+    Several processes can share the file: a process that finds the file already
+    rotated by another one reopens it instead of rotating again.
+    Args:
+        - filename (str): path of the log file.
+        - max_bytes (int): size that triggers a rotation, 0 for no size limit.
+        - interval (float): seconds that trigger a rotation, 0 for no time limit.
+        - backup_count (int): rotated files kept.
+    Returns:
+        - SizeAndTimeRotatingFileHandler
+    """
+    def __init__(self, filename, max_bytes=0, interval=0, backup_count=0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.interval = interval
+        try:
+            started = os.stat(self.baseFilename).st_mtime
+        except FileNotFoundError:
+            started = time.time()
+        self.rollover_at = started + interval
+
+    def shouldRollover(self, record):
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def rotated_elsewhere(self):
+        if self.stream is None:
+            return False
+        try:
+            return os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def doRollover(self):
+        if self.rotated_elsewhere():
+            self.stream.close()
+            self.stream = self._open()
+        else:
+            super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+    Filters run here, in the thread that logged, while formatting and disk I/O happen on
+    the listener thread. A record that finds the queue full is dropped and counted.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # resolve the message and traceback now, the listener formats the rest of the record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            try:
+                self.queue.put_nowait(self.dropped_record())
+            except queue.Full:
+                pass
+
+    def dropped_record(self):
+        """
+        A warning record for the records dropped so far, resetting the count.
+        """
+        dropped, self.dropped = self.dropped, 0
+        return logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f"{dropped} log records dropped, the log queue was full",
+            'pathname': __file__, 'username': 'Anonymous', 'short_path': 'core/logs/logger.py',
+        })
+
+
+class LogListener(QueueListener):
+    """
+    Queue listener that waits for room in a full queue to stop, instead of losing the queued records.
+    """
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def build_handlers():
+    formatter = JSONFormatter() if LOG_FORMAT == 'json' else LocalTimeFormatter(TEXT_FORMAT)
+    file_handler = SizeAndTimeRotatingFileHandler(
+        LOG_FILE,
+        max_bytes=LOG_MAX_BYTES,
+        interval=LOG_ROTATE_INTERVAL_HOURS * 3600,
+        backup_count=LOG_BACKUP_COUNT,
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    return file_handler, stream_handler
+
+
+def start_listener():
+    """
+    Start the thread writing queued records, again in every forked child (Celery's
+    prefork pool) since threads do not survive a fork.
+    """
+    global listener
+    queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    listener = LogListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+
+def stop_listener():
+    # flush the queued records on exit
+    if listener._thread is not None:
+        if queue_handler.dropped:
+            listener.queue.put(queue_handler.dropped_record())
+        listener.stop()
+
+
 LOGGING_CONFIG = None
 
-logging.basicConfig(
-    format='%(levelname)s -- %(logged_time)s -- %(short_path)s:%(lineno)d -- User: %(username)s -- Message: %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler('reportcardsystem.log'),
-        logging.StreamHandler()
-    ]
-)
+handlers = build_handlers()
+queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+queue_handler.addFilter(UserFilter())
+queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES, LOG_RATE_LIMIT, LOG_RATE_LIMIT_WINDOW))
+listener = None
+start_listener()
+atexit.register(stop_listener)
+os.register_at_fork(after_in_child=start_listener)
 
-logger = logging.getLogger(__name__)
-logger.addFilter(UserFilter())
+root_logger = logging.getLogger()
+root_logger.setLevel(LOG_LEVEL)
+root_logger.addHandler(queue_handler)
 
+logger = logging.getLogger(__name__)
@@ -0,0 +1,193 @@
+import os
+import time
+import hmac
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+"""
+Per route request metrics, collected by core.middleware.PerformanceMiddleware.
+
+Under gunicorn every worker keeps its own histograms. Set PROMETHEUS_MULTIPROC_DIR (entrypoint.sh
+does) and prometheus_client stores them in memory mapped files in that directory, which the
+/metrics/ endpoint sums so any worker answers the scrape with the totals of all of them.
+"""
+
+# a route label for requests that resolved to no url pattern, keeps the label set bounded
+UNMATCHED_ROUTE = 'unmatched'
+LABELS = ('route', 'method')
+
+REQUESTS = Counter('http_requests', 'Requests by route, method and status code.', [*LABELS, 'status'])
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Wall time of a request, until the response headers.', LABELS,
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries run by a request.', LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250, 500, 1000),
+)
+DB_DURATION = Histogram('http_request_db_duration_seconds', 'Time a request spent in database queries.', LABELS)
+SERIALIZE_DURATION = Histogram(
+    'http_request_serialize_duration_seconds', 'Time a request spent serializing objects into response data.', LABELS,
+)
+ENCODE_DURATION = Histogram(
+    'http_request_encode_duration_seconds', 'Time a request spent encoding its response body.', LABELS,
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Size of the response body.', LABELS,
+    buckets=tuple(256 * 4 ** power for power in range(9)),
+)
+
+# stats of the request being handled, shared with the threads sync_to_async runs the ORM in
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Counters of one request.
+    Returns:
+        - RequestStats: db_queries, db_time, serialize_time and encode_time, times in seconds.
+    """
+    __slots__ = ('started', 'db_queries', 'db_time', 'serialize_time', 'encode_time', 'phase')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.encode_time = 0.0
+        # the phase being timed, blocks nested in it are part of it
+        self.phase = None
+
+
+def query_timer(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_timer(connection, **kwargs):
+    """
+    Add query_timer to a database connection, once.
+    """
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def install_query_timers():
+    # connections opened before this module was imported never sent connection_created
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(connection)
+
+
+connection_created.connect(install_query_timer)
+
+
+@contextmanager
+def phase_timer(phase):
+    """
+    Count the time spent inside the block as <phase>_time of the current request.
+    Queries run inside the block stay database time, and a block nested in a timed one is not counted twice.
+    Args:
+        - phase (str): 'serialize' or 'encode'.
+    """
+    stats = _request_stats.get()
+    if stats is None or stats.phase is not None:
+        yield
+        return
+    stats.phase = phase
+    started, db_time = time.perf_counter(), stats.db_time
+    try:
+        yield
+    finally:
+        stats.phase = None
+        elapsed = time.perf_counter() - started - (stats.db_time - db_time)
+        setattr(stats, f'{phase}_time', getattr(stats, f'{phase}_time') + elapsed)
+
+
+def serialize_timer():
+    """
+    Time turning model instances or values() rows into response data.
+    """
+    return phase_timer('serialize')
+
+
+def encode_timer():
+    """
+    Time a renderer encoding response data into the body.
+    """
+    return phase_timer('encode')
+
+
+@contextmanager
+def collect_request_stats():
+    """
+    Collect the stats of the queries and serialization inside the block.
+    Returns:
+        - context manager yielding the RequestStats.
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return UNMATCHED_ROUTE
+    return match.url_name
+
+
+def observe(route, method, status_code, stats, duration, size=None):
+    """
+    Add one request to the histograms.
+    Args:
+        - route (str): url name the request resolved to.
+        - method (str): HTTP method.
+        - status_code (int): status code of the response.
+        - stats (RequestStats): counters collected during the request.
+        - duration (float): wall time in seconds.
+        - size (int, optional): body size in bytes, None when not known yet.
+    """
+    REQUESTS.labels(route, method, str(status_code)).inc()
+    REQUEST_DURATION.labels(route, method).observe(duration)
+    DB_QUERIES.labels(route, method).observe(stats.db_queries)
+    DB_DURATION.labels(route, method).observe(stats.db_time)
+    SERIALIZE_DURATION.labels(route, method).observe(stats.serialize_time)
+    ENCODE_DURATION.labels(route, method).observe(stats.encode_time)
+    if size is not None:
+        RESPONSE_SIZE.labels(route, method).observe(size)
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the request metrics of every worker.
+    Requires "Authorization: Bearer <METRICS_TOKEN>" when METRICS_TOKEN is set.
+    Args:
+        - request: the scrape request.
+    Returns:
+        - HttpResponse in the Prometheus text format.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponseForbidden()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
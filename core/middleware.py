@@ -0,0 +1,69 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from core.metrics import collect_request_stats, install_query_timers, observe, route_name
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, database queries and time, serialize and encode time and response size of every
+    request per resolved route, into the core.metrics histograms and a Server-Timing header.
+    Works in both the WSGI and the ASGI handler without a thread hop. Listed first in
+    MIDDLEWARE so the wall time covers the other middleware too.
+    Args:
+        - get_response: the next middleware or the view.
+    Returns:
+        - PerformanceMiddleware
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_query_timers()
+        with collect_request_stats() as stats:
+            response = self.get_response(request)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        with collect_request_stats() as stats:
+            response = await self.get_response(request)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        duration = time.perf_counter() - stats.started
+        route, method = route_name(request), request.method
+        if settings.SERVER_TIMING:
+            db_ms, serialize_ms, encode_ms = stats.db_time * 1000, stats.serialize_time * 1000, stats.encode_time * 1000
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.2f};desc="{stats.db_queries} queries", '
+                f'serialize;dur={serialize_ms:.2f}, '
+                f'encode;dur={encode_ms:.2f}, '
+                f'app;dur={max(duration * 1000 - db_ms - serialize_ms - encode_ms, 0):.2f}, '
+                f'total;dur={duration * 1000:.2f}'
+            )
+        if not response.streaming:
+            observe(route, method, response.status_code, stats, duration, len(response.content))
+        elif response.is_async:
+            observe(route, method, response.status_code, stats, duration)
+        else:
+            # the size of a streamed body is known once the server has sent it
+            response.streaming_content = self.measure(
+                response.streaming_content, route, method, response.status_code, stats, duration
+            )
+        return response
+
+    def measure(self, content, route, method, status_code, stats, duration):
+        size = 0
+        try:
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            observe(route, method, status_code, stats, duration, size)
@@ -0,0 +1,119 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.views import get_schema_view
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer
+from core.logs.logger import logger
+
+# the document every process of this deploy serves, loaded from OPENAPI_SCHEMA_FILE once
+_schema = {}
+_schema_lock = threading.Lock()
+
+
+def generate_schema():
+    """
+    Generate the OpenAPI document of the whole API.
+    Generated without a request, so it names no host and the docs use the host serving them.
+    Returns:
+        - bytes: the JSON document, encoded like drf_yasg's spec renderers.
+    """
+    started = time.perf_counter()
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(swagger_settings.DEFAULT_INFO, version='')
+    content = OpenAPICodecJson(validators=[]).encode(generator.get_schema(request=None, public=True))
+    logger.info(f"OpenAPI schema generated in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return content
+
+
+def write_schema(content, path=None):
+    """
+    Atomically replace the schema file, so a worker never reads a half written document.
+    Args:
+        - content (bytes): the JSON document.
+        - path (str, optional): defaults to OPENAPI_SCHEMA_FILE.
+    Returns:
+        - str: the path written.
+    """
+    path = str(path or settings.OPENAPI_SCHEMA_FILE)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return path
+
+
+def schema_document():
+    """
+    The cached OpenAPI document and its ETag.
+    Read from OPENAPI_SCHEMA_FILE, written on deploy by generate_openapi_schema. When the
+    file is missing the first request generates and writes it for the other workers.
+    Returns:
+        - tuple (bytes, str): the JSON document and its ETag.
+    """
+    if not _schema:
+        with _schema_lock:
+            if not _schema:
+                try:
+                    with open(settings.OPENAPI_SCHEMA_FILE, 'rb') as schema_file:
+                        content = schema_file.read()
+                except FileNotFoundError:
+                    content = generate_schema()
+                    write_schema(content)
+                _schema['etag'] = hashlib.sha256(content).hexdigest()
+                _schema['content'] = content
+    return _schema['content'], _schema['etag']
+
+
+def clear_schema_cache():
+    """
+    Drop the document held in memory, the next request reads the schema file again.
+    """
+    with _schema_lock:
+        _schema.clear()
+
+
+class CachedSchemaMixin:
+    """
+    Schema view mixin that serves the JSON document from schema_document with an ETag.
+    The Swagger and ReDoc pages and the YAML format are left to drf_yasg, the pages
+    are cheap and load the JSON document from this view.
+    Returns:
+        - None
+    """
+
+    def get(self, request, version='', format=None):
+        renderer = request.accepted_renderer
+        if not settings.OPENAPI_SCHEMA_CACHE or not isinstance(renderer, (OpenAPIRenderer, SwaggerJSONRenderer)):
+            return super().get(request, version, format)
+        content, etag = schema_document()
+        response = get_conditional_response(request, etag=quote_etag(etag))
+        if response is None:
+            response = HttpResponse(content, content_type=f"{renderer.media_type}; charset={renderer.charset}")
+        response['ETag'] = quote_etag(etag)
+        # clients revalidate on every poll, the document only changes on deploy
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+def cached_schema_view(**kwargs):
+    """
+    drf_yasg's get_schema_view with the JSON document served from the schema cache.
+    Args:
+        - kwargs: passed to get_schema_view.
+    Returns:
+        - SchemaView class.
+    """
+    return type('CachedSchemaView', (CachedSchemaMixin, get_schema_view(**kwargs)), {})
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import connections
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Estimate the number of rows of a model's table without scanning it.
+    Args:
+        - model: the model class.
+        - using (str): database alias.
+    Returns:
+        - int, or None when the backend keeps no cheap estimate.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # the largest rowid is one seek on the primary key, deleted rows only make it overestimate
+            cursor.execute(f"SELECT MAX(rowid) FROM {table}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*) on a large table.
+    The unfiltered count comes from the table statistics and filtered counts stop
+    at ADMIN_EXACT_COUNT_LIMIT rows, small results are still counted exactly.
+    Base classes:
+        - Paginator
+    Returns:
+        - EstimatedCountPaginator: estimated is True when count is not exact.
+    """
+    estimated = False
+    # largest exact count, defaults to ADMIN_EXACT_COUNT_LIMIT
+    count_limit = None
+
+    @cached_property
+    def count(self):
+        limit = self.count_limit or settings.ADMIN_EXACT_COUNT_LIMIT
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > limit:
+                self.estimated = True
+                return estimate
+            return queryset.count()
+        count = queryset.order_by()[:limit + 1].count()
+        if count > limit:
+            self.estimated = True
+            return limit
+        return count
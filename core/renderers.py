@@ -0,0 +1,91 @@
+import orjson
+import msgpack
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from core.metrics import encode_timer
+
+# types orjson and msgpack do not know (Decimal, lazy strings, querysets, ...) are encoded
+# exactly like DRF's JSONEncoder did, so responses keep the same values
+encode_default = JSONEncoder().default
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson, producing the same compact UTF-8 output as DRF's JSONRenderer.
+    Base classes:
+        - BaseRenderer
+    Returns:
+        - bytes: the JSON document.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        # indented output (browsable API, ?indent=) is rare, leave it to the stdlib renderer
+        if renderer_context.get('indent') or 'indent=' in (accepted_media_type or ''):
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+        with encode_timer():
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        # escape the line and paragraph separators like DRF does, they are not valid in javascript strings
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer for bulk consumers that prefer a compact binary format.
+    Base classes:
+        - BaseRenderer
+    Returns:
+        - bytes: the MessagePack document.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        with encode_timer():
+            return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
+
+
+class ORJSONParser(BaseParser):
+    """
+    JSON request parser backed by orjson.
+    Base classes:
+        - BaseParser
+    Returns:
+        - the parsed request body.
+    """
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f"JSON parse error - {e}")
+
+
+class MessagePackParser(BaseParser):
+    """
+    MessagePack request parser.
+    Base classes:
+        - BaseParser
+    Returns:
+        - the parsed request body.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+            raise ParseError(f"MessagePack parse error - {e}")
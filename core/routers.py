@@ -0,0 +1,133 @@
+import time
+import random
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from core.logs.logger import logger
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# table every replica must have, so an empty or missing replica is never read from
+HEALTH_CHECK_QUERY = "SELECT 1 FROM report_cards LIMIT 1"
+
+# set by use_replicas for the duration of a request or task, None means every read goes to the primary
+_replica_reads = ContextVar('replica_reads', default=None)
+_replica_health = {}
+_round_robin = itertools.count()
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    """
+    Send the reads inside the block to a healthy replica.
+    A write, or a transaction opened inside the block, pins the rest of the block
+    to the primary so a request always reads its own writes. Works as a decorator too.
+    Args:
+        - enabled (bool): False keeps every read on the primary.
+    Returns:
+        - context manager
+    """
+    state = None
+    if enabled and settings.DATABASE_REPLICAS:
+        state = {
+            'alias': None,
+            'pinned': False,
+            'atomic_depth': len(connections[DEFAULT_DB_ALIAS].atomic_blocks),
+        }
+    token = _replica_reads.set(state)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_is_healthy(alias):
+    """
+    Check a replica at most once every DATABASE_REPLICA_HEALTH_CHECK_INTERVAL seconds.
+    Args:
+        - alias (str): database alias of the replica.
+    Returns:
+        - bool: True when the replica answered the health check query.
+    """
+    healthy, checked_at = _replica_health.get(alias, (False, None))
+    now = time.monotonic()
+    if checked_at is not None and now - checked_at < settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL:
+        return healthy
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(HEALTH_CHECK_QUERY)
+        healthy = True
+    except DatabaseError as e:
+        connections[alias].close()
+        if _replica_health.get(alias, (True, None))[0]:
+            logger.warning(f"Database replica {alias} failed its health check: {e}")
+        healthy = False
+    _replica_health[alias] = (healthy, now)
+    return healthy
+
+
+def choose_replica():
+    """
+    Pick a healthy replica with the DATABASE_REPLICA_SELECTION strategy.
+    Returns:
+        - str: alias of the replica, or None when no replica is healthy.
+    """
+    replicas = [alias for alias in settings.DATABASE_REPLICAS if replica_is_healthy(alias)]
+    if not replicas:
+        return None
+    if settings.DATABASE_REPLICA_SELECTION == 'random':
+        return random.choice(replicas)
+    return replicas[next(_round_robin) % len(replicas)]
+
+
+class ReadReplicaRouter:
+    """
+    Database router that sends reads inside use_replicas to the replicas and
+    everything else to the primary.
+    Returns:
+        - ReadReplicaRouter: listed in DATABASE_ROUTERS.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _replica_reads.get()
+        if state is None or state['pinned']:
+            return DEFAULT_DB_ALIAS
+        if len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > state['atomic_depth']:
+            # a transaction on the primary must see its own rows
+            state['pinned'] = True
+            return DEFAULT_DB_ALIAS
+        if state['alias'] is None:
+            # one replica per request, so every query of the response sees the same snapshot
+            state['alias'] = choose_replica() or DEFAULT_DB_ALIAS
+        return state['alias']
+
+    def db_for_write(self, model, **hints):
+        state = _replica_reads.get()
+        if state is not None:
+            state['pinned'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas get their schema from the primary
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin that serves GET, HEAD and OPTIONS requests from the replicas.
+    Returns:
+        - None
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_replicas(request.method in SAFE_METHODS):
+            return super().dispatch(request, *args, **kwargs)
@@ -7,5 +7,10 @@ python manage.py migrate
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 python manage.py migrate django_celery_results --noinput
+echo "Generating the OpenAPI schema..."
+python manage.py generate_openapi_schema
 echo "Starting Gunicorn..."
+# every gunicorn worker writes its request metrics here, /metrics/ sums them
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 gunicorn reportcardsystem.wsgi:application --bind 0.0.0.0:8000
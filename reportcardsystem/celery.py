@@ -1,10 +1,12 @@
 import os
 import django
 from celery import Celery
+from datetime import timedelta
 from celery.schedules import crontab
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'reportcardsystem.settings')
 django.setup()
+from django.conf import settings
 
 app = Celery('reportcardsystem')
 app.config_from_object('django.conf:settings', namespace='CELERY')
@@ -15,4 +17,12 @@ app.conf.beat_schedule = {
         'task': 'students.tasks.calculate_student_term_summaries', 
         'schedule': crontab(hour=1, minute=0),
     },
+    'nightly-report-card-render': {
+        'task': 'students.tasks.render_term_report_cards',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'incremental-term-summary-update': {
+        'task': 'students.tasks.calculate_dirty_term_summaries',
+        'schedule': timedelta(minutes=settings.TERM_SUMMARY_DIRTY_INTERVAL_MINUTES),
+    },
 }
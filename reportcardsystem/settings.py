@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 from datetime import timedelta
 from django.core.management.utils import get_random_secret_key
 
@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -77,10 +78,57 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'reportcardsystem.wsgi.application'
 
+# SQLite connection profile shared by gunicorn, the Celery worker and beat: WAL lets readers run next to the
+# writer, IMMEDIATE transactions take the write lock up front instead of failing when a read turns into a write,
+# and timeout is how many seconds a writer waits for the lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = config('SQLITE_BUSY_TIMEOUT', default=20, cast=int)
+SQLITE_READ_PRAGMAS = ';'.join([
+    f"PRAGMA cache_size={config('SQLITE_CACHE_SIZE', default=-64000, cast=int)}",
+    f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=268435456, cast=int)}",
+    "PRAGMA temp_store=MEMORY",
+])
+SQLITE_WRITE_PRAGMAS = ';'.join([
+    "PRAGMA journal_mode=WAL",
+    f"PRAGMA synchronous={config('SQLITE_SYNCHRONOUS', default='NORMAL')}",
+    SQLITE_READ_PRAGMAS,
+])
+SQLITE_WRITE_LOCK_FILE = config('SQLITE_WRITE_LOCK_FILE', default=str(BASE_DIR / 'db.sqlite3.lock'))
+SQLITE_WRITE_LOCK_TIMEOUT = config('SQLITE_WRITE_LOCK_TIMEOUT', default=60, cast=int)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': SQLITE_WRITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_BUSY_TIMEOUT,
+        },
+    }
+}
+
+# read replicas, e.g. DATABASE_REPLICA_NAMES=db_replica.sqlite3, opened read only as replica_1, replica_2, ...
+DATABASE_REPLICAS = []
+for index, name in enumerate(config('DATABASE_REPLICA_NAMES', default='', cast=Csv()), start=1):
+    DATABASES[f'replica_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"{(BASE_DIR / name).as_uri()}?mode=ro",
+        'OPTIONS': {'uri': True, 'init_command': SQLITE_READ_PRAGMAS, 'timeout': SQLITE_BUSY_TIMEOUT},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['core.routers.ReadReplicaRouter']
+DATABASE_REPLICA_SELECTION = config('DATABASE_REPLICA_SELECTION', default='round_robin')
+DATABASE_REPLICA_HEALTH_CHECK_INTERVAL = config('DATABASE_REPLICA_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+
+# report card reads are cached in redis when REDIS_CACHE_URL is set, otherwise in local memory
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_CACHE_URL,
+    } if REDIS_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -90,6 +138,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'students.apis.v1.pagination.CustomPageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ('django_filters.rest_framework.DjangoFilterBackend',),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.ORJSONParser',
+        'core.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -103,6 +162,7 @@ SIMPLE_JWT = {
 }
 
 SWAGGER_SETTINGS = {
+    'DEFAULT_INFO': 'reportcardsystem.urls.api_info',
     'USE_SESSION_AUTH': False,
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -137,6 +197,37 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_BACKEND = 'django-db'
 CELERY_TASK_IGNORE_RESULT = False
 
+TERM_SUMMARY_CHUNK_SIZE = config('TERM_SUMMARY_CHUNK_SIZE', default=2000, cast=int)
+TERM_SUMMARY_BATCH_SIZE = config('TERM_SUMMARY_BATCH_SIZE', default=500, cast=int)
+TERM_SUMMARY_SHARD_SIZE = config('TERM_SUMMARY_SHARD_SIZE', default=1000, cast=int)
+TERM_SUMMARY_SHARD_CONCURRENCY = config('TERM_SUMMARY_SHARD_CONCURRENCY', default=1, cast=int)
+TERM_SUMMARY_DIRTY_INTERVAL_MINUTES = config('TERM_SUMMARY_DIRTY_INTERVAL_MINUTES', default=5, cast=int)
+
+MARK_IMPORT_BATCH_SIZE = config('MARK_IMPORT_BATCH_SIZE', default=2000, cast=int)
+MARK_IMPORT_MAX_ERRORS = config('MARK_IMPORT_MAX_ERRORS', default=1000, cast=int)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+REPORT_CARD_RENDER_WORKERS = config('REPORT_CARD_RENDER_WORKERS', default=os.cpu_count() or 1, cast=int)
+REPORT_CARD_RENDER_CHUNK_SIZE = config('REPORT_CARD_RENDER_CHUNK_SIZE', default=1000, cast=int)
+# embedded in report card PDFs, the first font is the main one and the others fill in missing scripts
+REPORT_CARD_PDF_FONTS = config(
+    'REPORT_CARD_PDF_FONTS',
+    default='/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf,'
+            '/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf',
+    cast=Csv()
+)
+REPORT_CARD_CACHE_ALIAS = config('REPORT_CARD_CACHE_ALIAS', default='default')
+REPORT_CARD_CACHE_TIMEOUT = config('REPORT_CARD_CACHE_TIMEOUT', default=300, cast=int)
+REPORT_CARD_BULK_MAX_ITEMS = config('REPORT_CARD_BULK_MAX_ITEMS', default=500, cast=int)
+ADMIN_PERFORMANCE_MODE = config('ADMIN_PERFORMANCE_MODE', default=True, cast=bool)
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+STUDENT_SEARCH_COUNT_LIMIT = config('STUDENT_SEARCH_COUNT_LIMIT', default=1000, cast=int)
+# the OpenAPI document is written on deploy by generate_openapi_schema and served from this file
+OPENAPI_SCHEMA_CACHE = config('OPENAPI_SCHEMA_CACHE', default=not DEBUG, cast=bool)
+OPENAPI_SCHEMA_FILE = config('OPENAPI_SCHEMA_FILE', default=str(BASE_DIR/'staticfiles'/'openapi.json'))
+SERVER_TIMING = config('SERVER_TIMING', default=True, cast=bool)
+# scrapes of /metrics/ must send "Authorization: Bearer <METRICS_TOKEN>" when it is set
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = config('TIME_ZONE', default='UTC')
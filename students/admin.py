@@ -1,5 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
 from django.db import models
+from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.contrib.admin.utils import get_fields_from_path
+from core.paginators import EstimatedCountPaginator
 from students.models import (
     Student,
     Subject,
@@ -10,13 +15,110 @@ from students.models import (
 from django.contrib.admin.widgets import AdminDateWidget
 from students.tasks import calculate_student_term_summaries
 
+# upper bound of every string starting with a prefix, so a prefix search is an index range scan
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def indexed_lookup(model, search_field, search_term):
+    """
+    Translate one admin search field into a lookup an index can answer.
+    Relations are followed with nested id subqueries instead of joins, so the
+    database starts from the few matching rows of the searched table.
+    Args:
+        - model: the model being searched.
+        - search_field (str): '^path' for a prefix match or '=path' for an exact match.
+        - search_term (str): the text typed in the admin search box.
+    Returns:
+        - Q, or None when the term cannot match the field (e.g. letters for a year).
+    """
+    path = search_field.lstrip('^=')
+    *relations, name = path.split('__')
+    fields = get_fields_from_path(model, path)
+    if search_field.startswith('='):
+        try:
+            query = Q(**{name: fields[-1].to_python(search_term)})
+        except ValidationError:
+            return None
+    else:
+        # admins tend to type names in lower case, also try the capitalized prefix
+        query = Q()
+        for prefix in {search_term, search_term[:1].upper() + search_term[1:]}:
+            query |= Q(**{f'{name}__gte': prefix, f'{name}__lt': prefix + PREFIX_UPPER_BOUND})
+    for relation, field in reversed(list(zip(relations, fields))):
+        query = Q(**{f'{relation}__in': field.related_model._base_manager.filter(query).values('pk')})
+    return query
+
+
+class PerformanceModeAdmin(admin.ModelAdmin):
+    """
+    Changelist behaviour for tables with millions of rows, enabled by ADMIN_PERFORMANCE_MODE.
+    Base classes:
+        - admin.ModelAdmin
+    Responsibilities:
+        - Count pages with EstimatedCountPaginator and skip the second, unfiltered count.
+        - Order the changelist by primary key instead of the joined model ordering.
+        - Search only with indexed prefix ('^') and exact ('=') matches of performance_search_fields.
+        - Drop the filters of performance_list_filter that need a scan, such as the date filters.
+        - Edit the foreign keys of performance_raw_id_fields as ids instead of a select of every row.
+    Without ADMIN_PERFORMANCE_MODE the regular search_fields, list_filter and select widgets apply.
+    """
+    performance_search_fields = None
+    performance_list_filter = None
+    performance_raw_id_fields = ()
+
+    @property
+    def show_full_result_count(self):
+        return not settings.ADMIN_PERFORMANCE_MODE
+
+    @property
+    def raw_id_fields(self):
+        # ModelAdmin reads raw_id_fields directly, e.g. in formfield_for_foreignkey, so it has no get_ hook
+        return self.performance_raw_id_fields if settings.ADMIN_PERFORMANCE_MODE else ()
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if settings.ADMIN_PERFORMANCE_MODE:
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_ordering(self, request):
+        if settings.ADMIN_PERFORMANCE_MODE:
+            return ['-pk']
+        return super().get_ordering(request)
+
+    def get_search_fields(self, request):
+        if settings.ADMIN_PERFORMANCE_MODE and self.performance_search_fields is not None:
+            return self.performance_search_fields
+        return super().get_search_fields(request)
+
+    def get_list_filter(self, request):
+        if settings.ADMIN_PERFORMANCE_MODE and self.performance_list_filter is not None:
+            return self.performance_list_filter
+        return super().get_list_filter(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not settings.ADMIN_PERFORMANCE_MODE or not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        matches = [
+            queryset.model._base_manager.filter(lookup).order_by().values('pk')
+            for lookup in (
+                indexed_lookup(queryset.model, search_field, search_term)
+                for search_field in self.get_search_fields(request)
+            )
+            if lookup is not None
+        ]
+        if not matches:
+            return queryset.none(), False
+        # a union of per field id lists lets every branch use its own index, an OR makes the database scan the table
+        return queryset.filter(pk__in=matches[0].union(*matches[1:], all=True)), False
+
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(PerformanceModeAdmin):
     """
     Admin interface for managing Student instances in the academic system.
     Base classes:
-        - admin.ModelAdmin
+        - PerformanceModeAdmin
     Responsibilities:
         - Display and edit Student fields such as name, email, and date of birth.
         - Provide search and filter capabilities in the admin interface.
@@ -27,6 +129,7 @@ class StudentAdmin(admin.ModelAdmin):
     list_display_links = ['id', 'name']
     search_fields = ['name', 'email']
     list_filter = ['created_date', 'updated_date']
+    performance_search_fields = ['^name', '^email']
     readonly_fields = ['created_date', 'updated_date']
 
     fieldsets = (
@@ -46,11 +149,11 @@ class StudentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Subject)
-class SubjectAdmin(admin.ModelAdmin):
+class SubjectAdmin(PerformanceModeAdmin):
     """
     Admin interface for managing Subject instances in the academic system.
     Base classes:
-        - admin.ModelAdmin
+        - PerformanceModeAdmin
     Returns:
         - Display and edit Subject fields such as name and code.
         - Provide search and filter capabilities in the admin.
@@ -60,6 +163,7 @@ class SubjectAdmin(admin.ModelAdmin):
     list_display_links = ['id', 'name']
     search_fields = ['name', 'code']
     list_filter = ['created_date', 'updated_date']
+    performance_search_fields = ['^name', '^code']
     readonly_fields = ['created_date', 'updated_date']
 
     fieldsets = (
@@ -94,11 +198,11 @@ def recalculate_term_summaries(modeladmin, request, queryset):
 
 
 @admin.register(ReportCard)
-class ReportCardAdmin(admin.ModelAdmin):
+class ReportCardAdmin(PerformanceModeAdmin):
     """
     Admin interface for managing ReportCard instances in the academic system.
     Base classes:
-        - admin.ModelAdmin
+        - PerformanceModeAdmin
     Returns:
         - Display and edit ReportCard fields such as student, term, and year.
         - Provide search and filter capabilities in the admin.
@@ -106,8 +210,12 @@ class ReportCardAdmin(admin.ModelAdmin):
     """
     list_display = ['id', 'student', 'term', 'year', 'created_date', 'updated_date']
     list_display_links = ['id', 'student']
+    list_select_related = ['student']
     search_fields = ['student__name', 'year']
     list_filter = ['term', 'year', 'created_date', 'updated_date']
+    performance_search_fields = ['^student__name', '=year']
+    performance_list_filter = ['year', 'term']
+    performance_raw_id_fields = ['student']
     readonly_fields = ['created_date', 'updated_date']
 
     fieldsets = (
@@ -127,11 +235,11 @@ class ReportCardAdmin(admin.ModelAdmin):
 
 
 @admin.register(Mark)
-class MarkAdmin(admin.ModelAdmin):
+class MarkAdmin(PerformanceModeAdmin):
     """
     Admin interface for managing Mark instances in the academic system.
     Base classes:
-        - admin.ModelAdmin
+        - PerformanceModeAdmin
     Returns:
         - Display and edit Mark fields such as report card, subject, and score.
         - Provide search and filter capabilities in the admin.
@@ -139,8 +247,12 @@ class MarkAdmin(admin.ModelAdmin):
     """
     list_display = ['id', 'report_card', 'subject', 'score', 'created_date', 'updated_date']
     list_display_links = ['id', 'report_card']
+    list_select_related = ['report_card__student', 'subject']
     search_fields = ['report_card__student__name', 'subject__name']
     list_filter = ['subject', 'created_date', 'updated_date']
+    performance_search_fields = ['^report_card__student__name', '^subject__name', '=subject__code']
+    performance_list_filter = ['subject']
+    performance_raw_id_fields = ['report_card']
     readonly_fields = ['created_date', 'updated_date']
 
     fieldsets = (
@@ -158,17 +270,20 @@ class MarkAdmin(admin.ModelAdmin):
 
 
 @admin.register(StudentTermSummary)
-class StudentTermSummaryAdmin(admin.ModelAdmin):
+class StudentTermSummaryAdmin(PerformanceModeAdmin):
     """
         Admin interface for managing student term summaries in the academic system.
         Base classes:
-            - admin.ModelAdmin
+            - PerformanceModeAdmin
         Returns:
             - StudentTermSummaryAdmin: Provides display, search, filtering, and editing capabilities
             for StudentTermSummary instances including student, term, year, average score, and timestamps.
     """
     list_display = ['student', 'term', 'year', 'average_score','total_score','grade']
+    list_select_related = ['student']
     search_fields = ['student__name', 'term', 'year']
+    performance_search_fields = ['^student__name', '=term', '=year']
+    performance_raw_id_fields = ['student']
     list_filter = ['term', 'year']
 
     fieldsets = (
@@ -0,0 +1,254 @@
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.exceptions import APIException, NotAuthenticated, AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from core.logs.logger import logger
+from core.routers import use_replicas
+from core.renderers import ORJSONRenderer
+from students.models import Student, Subject, ReportCard
+from students.summaries import ayearly_report
+from django_filters.utils import translate_validation
+from students.apis.v1.filters import ReportCardFilter
+from students.caching import acached_report_card, acached_report_card_page
+from students.conditional import (
+    areport_card_validators,
+    row_validators,
+    representation_validators,
+    validators_from_stats,
+    not_modified,
+    set_validators,
+)
+from students.apis.v1.pagination import CustomPageNumberPagination, KeysetPagination
+from .serializers import STUDENT_VALUES, SUBJECT_VALUES, REPORT_CARD_VALUES, aserialize_report_cards
+
+"""
+Async versions of the v1 read endpoints for ASGI servers.
+
+They answer like the sync ViewSets: the same JWT authentication, response envelope,
+pagination, caching and conditional GET, with every query on the async ORM so a slow
+query waits on the event loop instead of holding a worker.
+"""
+
+authentication = JWTAuthentication()
+renderer = ORJSONRenderer()
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(renderer.render(data), status=status_code, content_type=renderer.media_type)
+
+
+def async_api_view(view):
+    """
+    Wrap an async read view with JWT authentication, IsAuthenticated and replica reads.
+    Args:
+        - view (coroutine function): called with the request and the url kwargs.
+    Returns:
+        - coroutine function: the Django view.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = render({'detail': f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        with use_replicas():
+            try:
+                # the JWT lookup is one query, DRF's authenticator keeps the exact same rules
+                user_auth = await sync_to_async(authentication.authenticate)(request)
+                if user_auth is None:
+                    raise NotAuthenticated()
+            except (NotAuthenticated, AuthenticationFailed) as exc:
+                data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                response = render(data, exc.status_code)
+                response['WWW-Authenticate'] = authentication.authenticate_header(request)
+                return response
+            request.user, request.auth = user_auth
+            return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@async_api_view
+async def student_retrieve(request, pk):
+    try:
+        student = await Student.objects.values(*STUDENT_VALUES.columns, 'updated_date').aget(pk=pk)
+        validators = representation_validators(request, row_validators([student]))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        logger.info("successfully retrive student data")
+        return set_validators(render({
+            'success': True,
+            'data': STUDENT_VALUES.to_representation(student),
+            'message': 'Student retrieved successfully',
+        }), validators)
+    except Student.DoesNotExist as e:
+        logger.error(f"Error: {e}")
+        return render({
+            'success': False,
+            'message': 'Student not found',
+        }, status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        return render({
+            'success': False,
+            'message': str(e),
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_api_view
+async def subject_retrieve(request, pk):
+    try:
+        subject = await Subject.objects.values(*SUBJECT_VALUES.columns).aget(pk=pk)
+        logger.info("successfully retrive subject data")
+        return render({
+            'success': True,
+            'data': SUBJECT_VALUES.to_representation(subject),
+            'message': 'Subject retrieved successfully',
+        })
+    except Subject.DoesNotExist as e:
+        logger.error(f"Error: {e}")
+        return render({
+            'success': False,
+            'message': 'subject not found',
+        }, status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        return render({
+            'success': False,
+            'message': str(e),
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_api_view
+async def report_card_list(request):
+    try:
+        filterset = ReportCardFilter(request.GET, queryset=ReportCard.objects.all())
+        # validating the student filter looks the student up
+        if not await sync_to_async(filterset.is_valid)():
+            return render(translate_validation(filterset.errors).detail, status.HTTP_400_BAD_REQUEST)
+        queryset = filterset.qs
+        drf_request = Request(request)
+        url = request.build_absolute_uri()
+        keyset = request.GET.get('pagination') == 'cursor'
+
+        page = {}
+
+        async def paginate():
+            # the validators and the page data share one count and page query on a cold cache
+            if not page:
+                page['paginator'] = KeysetPagination() if keyset else CustomPageNumberPagination()
+                page['rows'] = await page['paginator'].apaginate_queryset(
+                    queryset.values(*REPORT_CARD_VALUES.columns), drf_request
+                )
+            return page['paginator'], page['rows']
+
+        async def load_validators():
+            # validate only the cards of this page, never the whole filtered set
+            paginator, rows = await paginate()
+            ids = [row['id'] for row in rows]
+            # page-number pages print the total count, which also moves when a card is added or removed elsewhere
+            page_key = paginator.get_next_link() if keyset else paginator.page.paginator.count
+            return await areport_card_validators(ReportCard.objects.filter(id__in=ids), url, ids, page_key)
+
+        validators = representation_validators(request, await acached_report_card_page(url, load_validators, part='validators'))
+        if validators:
+            response = not_modified(request, validators)
+            if response is not None:
+                return response
+
+        async def load_page():
+            paginator, rows = await paginate()
+            return paginator.get_paginated_response({
+                'success': True,
+                'data': await aserialize_report_cards(rows),
+                'message': 'ReportCards retrieved successfully',
+            }).data
+
+        data = await acached_report_card_page(url, load_page)
+        logger.info("ReportCard list retrieved successfully")
+        response = render(data)
+        return set_validators(response, validators) if validators else response
+    except APIException as e:
+        logger.error(f"Invalid ReportCard list request: {e.detail}")
+        return render({
+            'success': False,
+            'message': e.detail,
+        }, e.status_code)
+    except Exception as e:
+        logger.exception(f"Unexpected error retrieving ReportCard list: {e}")
+        return render({
+            'success': False,
+            'message': 'An unexpected error occurred',
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_api_view
+async def report_card_retrieve(request, pk):
+    try:
+        validators = representation_validators(request, await acached_report_card(
+            pk, lambda: areport_card_validators(ReportCard.objects.filter(pk=pk)), part='validators'
+        ))
+        if validators is None:
+            raise ReportCard.DoesNotExist
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
+        async def load_report_card():
+            report_cards = await aserialize_report_cards(ReportCard.objects.filter(pk=pk).values(*REPORT_CARD_VALUES.columns))
+            if not report_cards:
+                raise ReportCard.DoesNotExist
+            return report_cards[0]
+
+        data = await acached_report_card(pk, load_report_card)
+        logger.info(f"ReportCard [{pk}] retrieved successfully")
+        return set_validators(render({
+            'success': True,
+            'data': data,
+            'message': 'ReportCard retrieved successfully',
+        }), validators)
+    except ReportCard.DoesNotExist:
+        logger.error("ReportCard Dosent Exist")
+        return render({
+            'success': False,
+            'message': 'ReportCard Dosent Exist',
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+    except Exception as e:
+        logger.error(f"Unexpected error retrieving ReportCard [{pk}]: {e}")
+        return render({
+            'success': False,
+            'message': 'An unexpected error occurred',
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_api_view
+async def report_cards_with_summary(request, student_id, year):
+    try:
+        report_cards, summary, stats = await ayearly_report(student_id, year)
+        validators = representation_validators(request, validators_from_stats(stats))
+        if validators is None:
+            return render({
+                "success": False,
+                "message": "No report cards found for this student and year."
+            }, status.HTTP_404_NOT_FOUND)
+        not_modified_response = not_modified(request, validators)
+        if not_modified_response is not None:
+            return not_modified_response
+        logger.info("Report cards and summary retrieved successfully.")
+        return set_validators(render({
+            "success": True,
+            "data": {
+                "report_cards": report_cards,
+                "summary": summary
+            },
+            "message": "Report cards and summary fetched successfully."
+        }), validators)
+    except Exception as e:
+        logger.error(f"Error while fetching report card and summary: {e}")
+        return render({
+            "success": False,
+            "message": f"Internal server error: {str(e)}"
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
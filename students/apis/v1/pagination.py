@@ -1,4 +1,13 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+import base64
+from django.conf import settings
+from django.db.models import F, Q
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
+from django.core.paginator import InvalidPage
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from core.paginators import EstimatedCountPaginator
 
 class CustomPageNumberPagination(PageNumberPagination):
     """
@@ -11,3 +20,172 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of paginate_queryset, counting and fetching the page with the async ORM.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [row async for row in self.page.object_list]
+        return self.page.object_list
+
+
+class TypeaheadCountPaginator(EstimatedCountPaginator):
+    """
+    Paginator counting at most STUDENT_SEARCH_COUNT_LIMIT rows.
+    """
+    @property
+    def count_limit(self):
+        return settings.STUDENT_SEARCH_COUNT_LIMIT
+
+
+class TypeaheadPagination(CustomPageNumberPagination):
+    """
+    Page number pagination for type-ahead searches, where a one or two letter prefix can match
+    most of the table, the count stops at STUDENT_SEARCH_COUNT_LIMIT instead of counting every match.
+    Args:
+        - Base call : CustomPageNumberPagination
+    Returns:
+        - pagination with a capped count
+    """
+    django_paginator_class = TypeaheadCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row of the previous page on an indexed key
+    instead of counting and offsetting, so a deep page costs the same as the first one.
+    Args:
+        - Base call : BasePagination
+    Returns:
+        - pagination with a next link and no total count
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    orderings = {
+        'year': ('year', 'term', 'id'),
+        'student': ('student_id', 'id'),
+    }
+    default_ordering = 'year'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def encode_cursor(self, ordering, position):
+        encoded = json.dumps([ordering, *position]).encode()
+        return base64.urlsafe_b64encode(encoded).decode()
+
+    def decode_cursor(self, request):
+        """
+        Read the ordering and the last seen key from the request.
+        Returns:
+            - tuple: (ordering name, key values or None on the first page)
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+            if ordering not in self.orderings:
+                raise ValidationError({self.ordering_query_param: [f"Must be one of {', '.join(self.orderings)}."]})
+            return ordering, None
+        try:
+            ordering, *position = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if ordering not in self.orderings or len(position) != len(self.orderings[ordering]):
+            raise NotFound("Invalid cursor")
+        return ordering, position
+
+    def seek_ranges(self, fields, position):
+        """
+        Split the rows after the position into disjoint ranges in key order, each an equality
+        prefix and one range on the next column: (year=y, term=t, id>i), (year=y, term>t), (year>y).
+        Each range is a single index range scan, a combined OR or row value comparison
+        would only range on the leading column and walk every earlier row of it.
+        Returns:
+            - list of Q, in key order.
+        """
+        ranges = []
+        for depth in reversed(range(len(fields))):
+            prefix = Q()
+            for field, value in zip(fields[:depth], position[:depth]):
+                prefix &= Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+            field, value = fields[depth], position[depth]
+            # nulls sort first, so every non-null row comes after a null
+            after = Q(**{f'{field}__isnull': False}) if value is None else Q(**{f'{field}__gt': value})
+            ranges.append(prefix & after)
+        return ranges
+
+    def page_querysets(self, queryset, request):
+        """
+        Order the queryset on the cursor key and split what follows the cursor into seek ranges.
+        Returns:
+            - list of querysets, read in turn until the page and one extra row are filled.
+        """
+        self.request = request
+        self.ordering, position = self.decode_cursor(request)
+        fields = self.orderings[self.ordering]
+        self.limit = self.get_page_size(request)
+        self.model_meta = meta = queryset.model._meta
+        queryset = queryset.order_by(*[
+            F(field).asc(nulls_first=True) if meta.get_field(field).null else F(field).asc()
+            for field in fields
+        ])
+        if position is None:
+            return [queryset]
+        return [queryset.filter(seek) for seek in self.seek_ranges(fields, position)]
+
+    def finish_page(self, rows):
+        """
+        Drop the extra row fetched by paginate_queryset and remember the next cursor position.
+        """
+        self.next_position = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            attnames = [self.model_meta.get_field(field).attname for field in self.orderings[self.ordering]]
+            # rows are model instances or values() dicts keyed by attname
+            self.next_position = [last[name] if isinstance(last, dict) else getattr(last, name) for name in attnames]
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = []
+        for page_range in self.page_querysets(queryset, request):
+            rows += page_range[:self.limit + 1 - len(rows)]
+            if len(rows) > self.limit:
+                break
+        return self.finish_page(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        rows = []
+        for page_range in self.page_querysets(queryset, request):
+            rows += [row async for row in page_range[:self.limit + 1 - len(rows)]]
+            if len(rows) > self.limit:
+                break
+        return self.finish_page(rows)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.ordering, self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -1,13 +1,31 @@
+from decimal import Decimal
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from rest_framework.exceptions import ValidationError
-from students.models import Student, Subject, ReportCard, Mark
+from students.models import Student, Subject, ReportCard, Mark, StudentTermRank, StudentSubjectRank
+from students.caching import invalidate_report_cards
+from students.summaries import mark_term_summaries_dirty
+from core.metrics import serialize_timer
 
 
+class TimedSerializerMixin:
+    """
+    Count the serializer's to_representation as serialize time of the current request,
+    a nested or list child serializer is counted once with its parent.
+    """
+    def to_representation(self, instance):
+        with serialize_timer():
+            return super().to_representation(instance)
+
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer representing a student model with validation.
     Base classes:
+        - TimedSerializerMixin
         - serializers.ModelSerializer
     Returns:
         - StudentSerializer: A serializer instance for Student fields.
@@ -40,10 +58,11 @@ class StudentSerializer(serializers.ModelSerializer):
         return value
 
 
-class SubjectSerializer(serializers.ModelSerializer):
+class SubjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
         Serializer representing a subject model with validation.
         Base classes:
+            - TimedSerializerMixin
             - serializers.ModelSerializer
         Returns:
             - SubjectSerializer: A serializer instance for Subject fields.
@@ -62,10 +81,11 @@ class SubjectSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Code is requried.")
         return value
 
-class MarkSerializer(serializers.ModelSerializer):
+class MarkSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
         Serializer representing a report model with validation.
         Base classes:
+            - TimedSerializerMixin
             - serializers.ModelSerializer
         Returns:
             - ReportSerializer: A serializer instance for report fields.
@@ -75,10 +95,11 @@ class MarkSerializer(serializers.ModelSerializer):
         model = Mark
         fields = ['id', 'subject', 'score']
 
-class ReportCardSerializer(serializers.ModelSerializer):
+class ReportCardSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
         Serializer representing a report model with validation.
         Base classes:
+            - TimedSerializerMixin
             - serializers.ModelSerializer
         Returns:
             - ReportSerializer: A serializer instance for report fields.
@@ -88,6 +109,19 @@ class ReportCardSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportCard
         fields = ['id', 'student', 'year', 'term', 'marks']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Load report cards and all their marks in two queries with only the serialized columns.
+        Args:
+            - queryset (QuerySet): ReportCard queryset.
+        Returns:
+            - QuerySet: the queryset with the marks prefetched.
+        """
+        return queryset.only('id', 'student', 'year', 'term').prefetch_related(
+            Prefetch('marks', queryset=Mark.objects.only('id', 'report_card', 'subject', 'score').order_by('subject__name'))
+        )
     
     # this validation will not raise error becouse the unique_together = ('student', 'term','year') is used into the model if not used the validation will be reflected 
     def validate(self, attrs):
@@ -103,20 +137,221 @@ class ReportCardSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         marks_data = validated_data.pop('marks')
-        report_card = ReportCard.objects.create(**validated_data)
-        for mark in marks_data:
-            Mark.objects.create(report_card=report_card, **mark)
+        with transaction.atomic():
+            report_card = ReportCard.objects.create(**validated_data)
+            Mark.objects.bulk_create([Mark(report_card=report_card, **mark) for mark in marks_data])
         return report_card
 
     def update(self, instance, validated_data):
+        """
+        Save the term and year and upsert every mark in one statement, inside one transaction.
+        Marks missing from the payload are kept, or deleted in one statement when the
+        serializer context sets delete_missing_marks.
+        """
         marks_data = validated_data.pop('marks')
         instance.term = validated_data.get('term', instance.term)
         instance.year = validated_data.get('year', instance.year)
-        instance.save()
-        for mark_data in marks_data:
-            Mark.objects.update_or_create(
-                report_card=instance,
-                subject=mark_data['subject'],
-                defaults={'score': mark_data['score']}
+        with transaction.atomic():
+            # saving the card marks its summary dirty and invalidates its cache, which covers the bulk writes below
+            instance.save()
+            Mark.objects.bulk_create(
+                [Mark(report_card=instance, subject=mark['subject'], score=mark['score']) for mark in marks_data],
+                update_conflicts=True,
+                unique_fields=['report_card', 'subject'],
+                update_fields=['score', 'updated_date'],
             )
-        return instance
\ No newline at end of file
+            if self.context.get('delete_missing_marks'):
+                # a raw delete skips the per mark post_delete signal, the card is marked dirty and invalidated once
+                deleted = Mark.objects \
+                    .filter(report_card=instance) \
+                    .exclude(subject__in=[mark['subject'] for mark in marks_data]) \
+                    ._raw_delete(Mark.objects.db)
+                if deleted:
+                    mark_term_summaries_dirty([(instance.student_id, instance.term, instance.year)])
+                    invalidate_report_cards([instance.pk])
+        return instance
+
+
+class BulkMarkSerializer(serializers.Serializer):
+    """
+        Serializer validating one mark of a bulk report card item without database lookups.
+        Base classes:
+            - serializers.Serializer
+        Returns:
+            - BulkMarkSerializer: A serializer instance for subject id and score.
+    """
+    subject = serializers.IntegerField()
+    score = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+
+class BulkReportCardSerializer(serializers.Serializer):
+    """
+        Serializer validating one item of a bulk report card request without database lookups.
+        Students, subjects and uniqueness are checked for the whole batch at once.
+        Base classes:
+            - serializers.Serializer
+        Returns:
+            - BulkReportCardSerializer: A serializer instance for report card fields and marks.
+    """
+    student = serializers.IntegerField()
+    year = serializers.IntegerField(required=False, allow_null=True)
+    term = serializers.ChoiceField(choices=ReportCard._meta.get_field('term').choices)
+    marks = BulkMarkSerializer(many=True)
+
+    def validate_marks(self, value):
+        subjects = [mark['subject'] for mark in value]
+        if len(subjects) != len(set(subjects)):
+            raise serializers.ValidationError("Each subject can only have one mark.")
+        return value
+
+
+class StudentSubjectRankSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+        Serializer representing a student's rank in one subject.
+        Base classes:
+            - TimedSerializerMixin
+            - serializers.ModelSerializer
+        Returns:
+            - StudentSubjectRankSerializer: A serializer instance for subject rank fields.
+    """
+    class Meta:
+        model = StudentSubjectRank
+        fields = ['subject', 'score', 'rank', 'percentile', 'cohort_size']
+
+
+class StudentTermRankSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+        Serializer representing a student's overall rank in a term and year.
+        Base classes:
+            - TimedSerializerMixin
+            - serializers.ModelSerializer
+        Returns:
+            - StudentTermRankSerializer: A serializer instance for term rank fields.
+    """
+    class Meta:
+        model = StudentTermRank
+        fields = ['student', 'term', 'year', 'average_score', 'rank', 'percentile', 'cohort_size']
+
+
+class ValuesSerializer:
+    """
+        Read-only serializer compiled from a ModelSerializer that renders values() rows straight to dicts.
+        Plain fields are copied, scores are formatted directly, and any other field falls back to the
+        DRF field's own to_representation, so the output matches the ModelSerializer byte for byte.
+        Args:
+            - serializer_class: the ModelSerializer to mirror, nested serializers are left out.
+        Returns:
+            - ValuesSerializer: a compiled field plan with the values() columns to fetch.
+    """
+    copied_fields = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.BooleanField,
+    )
+
+    def __init__(self, serializer_class):
+        self.plan = []
+        model = serializer_class.Meta.model
+        for name, field in serializer_class().fields.items():
+            if isinstance(field, serializers.BaseSerializer):
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.plan.append((name, model._meta.get_field(field.source).attname, None))
+            else:
+                self.plan.append((name, field.source, self.converter(field)))
+        self.columns = [column for _, column, _ in self.plan]
+
+    def converter(self, field):
+        if isinstance(field, self.copied_fields) and not isinstance(field, serializers.DecimalField):
+            return None
+        if isinstance(field, serializers.DecimalField) and self.plain_decimal(field):
+            return self.decimal_converter(field)
+        return field.to_representation
+
+    def plain_decimal(self, field):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        return coerce_to_string and field.decimal_places is not None and not (field.normalize_output or field.localize)
+
+    def decimal_converter(self, field):
+        exponent = -field.decimal_places
+
+        def convert(value):
+            # database decimals already carry decimal_places digits and need no quantize
+            if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+                return f"{value:f}"
+            return field.to_representation(value)
+        return convert
+
+    def represent(self, row):
+        return {
+            name: row[column] if convert is None or row[column] is None else convert(row[column])
+            for name, column, convert in self.plan
+        }
+
+    def to_representation(self, row):
+        with serialize_timer():
+            return self.represent(row)
+
+    def serialize_rows(self, rows):
+        # one timed block for the whole page instead of one per row
+        with serialize_timer():
+            return [self.represent(row) for row in rows]
+
+    def serialize(self, queryset):
+        return self.serialize_rows(queryset.values(*self.columns))
+
+
+STUDENT_VALUES = ValuesSerializer(StudentSerializer)
+SUBJECT_VALUES = ValuesSerializer(SubjectSerializer)
+REPORT_CARD_VALUES = ValuesSerializer(ReportCardSerializer)
+MARK_VALUES = ValuesSerializer(MarkSerializer)
+
+
+def report_card_mark_rows(rows):
+    """
+    Query the marks of report card values() rows in one query, ordered by subject name.
+    """
+    return Mark.objects \
+        .filter(report_card_id__in=[row['id'] for row in rows]) \
+        .order_by('subject__name') \
+        .values('report_card_id', *MARK_VALUES.columns)
+
+
+def attach_marks(rows, mark_rows):
+    """
+    Render report card values() rows with their mark rows nested under 'marks'.
+    """
+    with serialize_timer():
+        marks = defaultdict(list)
+        for mark in mark_rows:
+            marks[mark['report_card_id']].append(MARK_VALUES.represent(mark))
+        return [
+            {**REPORT_CARD_VALUES.represent(row), 'marks': marks[row['id']]}
+            for row in rows
+        ]
+
+
+def serialize_report_cards(rows):
+    """
+    Render report card values() rows with their marks, matching ReportCardSerializer output.
+    Args:
+        - rows (iterable): dicts with the REPORT_CARD_VALUES columns, e.g. a page of a values() queryset.
+    Returns:
+        - list of report card dicts with nested marks, loaded in one query.
+    """
+    rows = list(rows)
+    return attach_marks(rows, report_card_mark_rows(rows))
+
+
+async def aserialize_report_cards(rows):
+    """
+    Async version of serialize_report_cards for the ASGI views.
+    Args:
+        - rows (QuerySet or list): values() rows with the REPORT_CARD_VALUES columns.
+    Returns:
+        - list of report card dicts with nested marks.
+    """
+    if not isinstance(rows, list):
+        rows = [row async for row in rows]
+    return attach_marks(rows, [mark async for mark in report_card_mark_rows(rows)])
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from students.apis.v1 import views as student_views
+from students.apis.v1 import async_views
 
 """
 URL configuration for the academic API endpoints.
@@ -10,6 +11,8 @@ Includes:
     - Subjects
     - Report Cards
     - Marks
+    - Ranks
+    - Async (ASGI) read endpoints under apis/v1/async/
 
 Base classes:
     - rest_framework.routers.DefaultRouter
@@ -23,5 +26,16 @@ router = DefaultRouter()
 router.register('apis/v1/student', student_views.StudentView, basename='student')
 router.register('apis/v1/subject', student_views.subjectView, basename='subject')
 router.register('apis/v1/reportcard', student_views.ReportCardView, basename='reportcard')
+router.register('apis/v1/rank', student_views.RankView, basename='rank')
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = router.urls + [
+    path('apis/v1/async/student/<int:pk>/', async_views.student_retrieve, name='async-student-detail'),
+    path('apis/v1/async/subject/<int:pk>/', async_views.subject_retrieve, name='async-subject-detail'),
+    path('apis/v1/async/reportcard/', async_views.report_card_list, name='async-reportcard-list'),
+    path('apis/v1/async/reportcard/<int:pk>/', async_views.report_card_retrieve, name='async-reportcard-detail'),
+    path(
+        'apis/v1/async/reportcard/student/<int:student_id>/year/<int:year>/',
+        async_views.report_cards_with_summary,
+        name='async-reportcard-summary',
+    ),
+]
\ No newline at end of file
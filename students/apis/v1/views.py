@@ -1,15 +1,35 @@
 from drf_yasg import openapi
-from django.db.models import Avg, F
-from django.db import transaction
+from django.db.models import F
+from django.db import transaction, IntegrityError
+from django.utils import timezone
 from core.logs.logger import logger
+from core.routers import ReplicaReadMixin
 from rest_framework import viewsets, status
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
 from django.shortcuts import get_object_or_404
+from django_filters.utils import translate_validation
 from students.apis.v1.filters import ReportCardFilter
+from students.summaries import mark_term_summaries_dirty, yearly_report
+from students.caching import cached_report_card, cached_report_card_page, invalidate_report_cards
+from students.conditional import (
+    report_card_validators,
+    row_validators,
+    representation_validators,
+    validators_from_stats,
+    not_modified,
+    set_validators,
+)
+from django.conf import settings
+from students.bulk import create_report_cards
+from students.search import search_students, is_prefix_search
+from students.imports import import_format, import_marks
+from students.exports import EXPORT_STREAMS, EXPORT_CONTENT_TYPES, export_rows
 from rest_framework.permissions import IsAuthenticated
-from students.apis.v1.pagination import CustomPageNumberPagination
+from rest_framework.exceptions import APIException
+from students.apis.v1.pagination import CustomPageNumberPagination, KeysetPagination, TypeaheadPagination
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from students.models import (
@@ -17,23 +37,34 @@ from students.models import (
     Subject,
     ReportCard,
     Mark,
+    StudentTermRank,
+    StudentSubjectRank,
 )
 from .serializers import (
     StudentSerializer,
     SubjectSerializer,
     ReportCardSerializer,
+    StudentTermRankSerializer,
+    StudentSubjectRankSerializer,
+    STUDENT_VALUES,
+    SUBJECT_VALUES,
+    REPORT_CARD_VALUES,
+    serialize_report_cards,
 )
 
-class StudentView(viewsets.ViewSet):
+class StudentView(ReplicaReadMixin, viewsets.ViewSet):
     """
     Handles CRUD operations for students model.
     Base classes:
+        - ReplicaReadMixin
         - viewsets.ViewSet
     Returns:
         - StudentView: Handles CRUD operations for Student instances.
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = CustomPageNumberPagination
+    typeahead_pagination_class = TypeaheadPagination
 
     @swagger_auto_schema(
         operation_summary="Create a New Student",
@@ -113,6 +144,54 @@ class StudentView(viewsets.ViewSet):
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+    @swagger_auto_schema(
+        operation_summary="List and search Students",
+        operation_description=(
+            "Returns a paginated list of students ordered by name. With search, only students whose name "
+            "or email contains the text are returned, looked up in a full-text index. Searches shorter than "
+            "three characters match name and email prefixes and count at most STUDENT_SEARCH_COUNT_LIMIT matches."
+        ),
+        manual_parameters=[
+            openapi.Parameter('search', openapi.IN_QUERY, description="Text contained in the name or email", type=openapi.TYPE_STRING),
+        ],
+        responses={200: StudentSerializer(many=True)},
+        tags=["Student Endpoints"],
+        security=[{'Bearer': []}]
+    )
+    def list(self, request):
+        try:
+            search = request.GET.get('search', '')
+            queryset = search_students(Student.objects.order_by('name', 'id'), search)
+            paginator = self.typeahead_pagination_class() if is_prefix_search(search) else self.pagination_class()
+            rows = paginator.paginate_queryset(queryset.values(*STUDENT_VALUES.columns, 'updated_date'), request)
+            # the page rows are validated as fetched, a 304 skips serializing and encoding them
+            validators = representation_validators(request, row_validators(
+                rows, request.build_absolute_uri(), paginator.page.paginator.count
+            ))
+            if validators:
+                response = not_modified(request, validators)
+                if response is not None:
+                    return response
+            logger.info("Student list retrieved successfully")
+            response = paginator.get_paginated_response({
+                'success': True,
+                'data': STUDENT_VALUES.serialize_rows(rows),
+                'message': 'Students retrieved successfully',
+            })
+            return set_validators(response, validators) if validators else response
+        except APIException as e:
+            logger.error(f"Invalid Student list request: {e.detail}")
+            return Response({
+                'success': False,
+                'message': e.detail,
+            }, status=e.status_code)
+        except Exception as e:
+            logger.exception(f"Unexpected error retrieving Student list: {e}")
+            return Response({
+                'success': False,
+                'message': 'An unexpected error occurred',
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @swagger_auto_schema(
         operation_summary="Retrieve a Student data by ID",
         operation_description="retrieves a student by their ID.",
@@ -159,18 +238,18 @@ class StudentView(viewsets.ViewSet):
     )
     def retrieve(self, request, pk=None):
         try:
-            student = get_object_or_404(
-                Student.objects.only('id', 'name', 'email', 'date_of_birth'),
-                pk=pk
-            )
-            serializer = StudentSerializer(student)
+            student = get_object_or_404(Student.objects.values(*STUDENT_VALUES.columns, 'updated_date'), pk=pk)
+            validators = representation_validators(request, row_validators([student]))
+            response = not_modified(request, validators)
+            if response is not None:
+                return response
             response = {
                 'success': True,
-                'data': serializer.data,
+                'data': STUDENT_VALUES.to_representation(student),
                 'message': 'Student retrieved successfully',
             }
             logger.info("successfully retrive student data")
-            return Response(response, status=status.HTTP_200_OK)
+            return set_validators(Response(response, status=status.HTTP_200_OK), validators)
         except Student.DoesNotExist as e:
             response = {
                 'success': False,
@@ -248,7 +327,8 @@ class StudentView(viewsets.ViewSet):
     )
     def update(self, request, pk=None):
         try:
-            student = get_object_or_404(Student.objects.only('id', 'name', 'email', 'date_of_birth'), pk=pk)
+            # a deferred instance saves only its loaded fields, updated_date must be one so the ETag moves
+            student = get_object_or_404(Student.objects.only('id', 'name', 'email', 'date_of_birth', 'updated_date'), pk=pk)
         except Student.DoesNotExist as e:
             logger.error(f"Error: {e}")
             return Response(
@@ -339,10 +419,11 @@ class StudentView(viewsets.ViewSet):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class subjectView(viewsets.ViewSet):
+class subjectView(ReplicaReadMixin, viewsets.ViewSet):
     """
     Handles CRUD operations for subject model.
     Base classes:
+        - ReplicaReadMixin
         - viewsets.ViewSet
     Returns:
         - subjectView: Handles CRUD operations for Student instances.
@@ -470,14 +551,10 @@ class subjectView(viewsets.ViewSet):
     )
     def retrieve(self, request, pk):
         try:
-            subject_obj = get_object_or_404(
-                Subject.objects.only('id', 'name', 'code'),
-                pk=pk
-            )
-            serializer = SubjectSerializer(subject_obj)
+            subject_obj = get_object_or_404(Subject.objects.values(*SUBJECT_VALUES.columns), pk=pk)
             response = {
                 'success': True,
-                'data': serializer.data,
+                'data': SUBJECT_VALUES.to_representation(subject_obj),
                 'message': 'Subject retrieved successfully',
             }
             logger.info("successfully retrive subject data")
@@ -649,10 +726,11 @@ class subjectView(viewsets.ViewSet):
             )
 
 
-class ReportCardView(viewsets.ViewSet):
+class ReportCardView(ReplicaReadMixin, viewsets.ViewSet):
     """
         Handles add and update operations for reportcard model.
         Base classes:
+            - ReplicaReadMixin
             - viewsets.ViewSet
         Returns:
             - subjectView: Handles add and update operations for reportcard instances.
@@ -660,6 +738,7 @@ class ReportCardView(viewsets.ViewSet):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPageNumberPagination
+    keyset_pagination_class = KeysetPagination
 
     @swagger_auto_schema(
         operation_summary="Create a New ReportCard with student and marks",
@@ -695,40 +774,148 @@ class ReportCardView(viewsets.ViewSet):
             }
             logger.error(f"Error : {e}")
             return Response(response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @swagger_auto_schema(
+        operation_summary="Create many ReportCards with their marks",
+        operation_description=(
+            "Creates a batch of report cards and their marks in one transaction. Uniqueness is checked for "
+            "the whole batch at once. With partial=true the valid items are created even when others fail. "
+            "Returns one result per item in request order."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['report_cards'],
+            properties={
+                'report_cards': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                'partial': openapi.Schema(type=openapi.TYPE_BOOLEAN, default=False),
+            },
+        ),
+        tags=["ReportCard Endpoints"],
+        security=[{'Bearer': []}]
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        items = request.data.get('report_cards')
+        if not isinstance(items, list) or not items:
+            return Response({
+                "success": False,
+                "message": "report_cards must be a non-empty list."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.REPORT_CARD_BULK_MAX_ITEMS:
+            return Response({
+                "success": False,
+                "message": f"At most {settings.REPORT_CARD_BULK_MAX_ITEMS} report cards can be created at once."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        partial = str(request.data.get('partial', False)).lower() in ('true', '1')
+        try:
+            results = create_report_cards(items, partial=partial)
+        except IntegrityError as e:
+            logger.error(f"Bulk ReportCard create conflicted: {e}")
+            return Response({
+                "success": False,
+                "message": "A ReportCard in the batch was created concurrently, nothing was created."
+            }, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            logger.exception(f"Unexpected error creating ReportCards in bulk: {e}")
+            return Response({
+                "success": False,
+                "message": f"An unexpected error occurred: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        created = sum(result['success'] for result in results)
+        if created == len(results):
+            response_status, message = status.HTTP_201_CREATED, "ReportCards created successfully"
+        elif created:
+            response_status, message = status.HTTP_207_MULTI_STATUS, "Some ReportCards were created"
+        else:
+            response_status, message = status.HTTP_400_BAD_REQUEST, "Failed to create ReportCards"
+        logger.info(f"Bulk ReportCard create: {created} of {len(results)} created")
+        return Response({
+            "success": created == len(results),
+            "data": results,
+            "message": message,
+        }, status=response_status)
+
     filter_params = [
         openapi.Parameter('year', openapi.IN_QUERY, description="Filter by year", type=openapi.TYPE_INTEGER),
         openapi.Parameter('term', openapi.IN_QUERY, description="Filter by term", type=openapi.TYPE_STRING),
         openapi.Parameter('student', openapi.IN_QUERY, description="Filter by student ID", type=openapi.TYPE_INTEGER),
     ]
+    list_params = filter_params + [
+        openapi.Parameter(
+            'pagination', openapi.IN_QUERY, description="cursor to page with a seek cursor instead of page numbers",
+            type=openapi.TYPE_STRING, enum=['cursor']
+        ),
+        openapi.Parameter(
+            'ordering', openapi.IN_QUERY, description="Cursor pagination key: year (year, term, id) or student (student, id)",
+            type=openapi.TYPE_STRING, enum=sorted(KeysetPagination.orderings)
+        ),
+        openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor from the previous page's next link", type=openapi.TYPE_STRING),
+    ]
 
     @swagger_auto_schema(
         operation_summary="List All the ReportCards",
-        operation_description="Returns a paginated list of report cards with related student data.",
+        operation_description=(
+            "Returns a paginated list of report cards with related student data. "
+            "Pass pagination=cursor for cursor pages without a total count."
+        ),
         tags=["ReportCard Endpoints"],
         security=[{'Bearer': []}],
-        manual_parameters=filter_params,
+        manual_parameters=list_params,
         responses={200: ReportCardSerializer(many=True)}
     )
     def list(self, request):
         try:
-            queryset = ReportCard.objects.select_related('student').defer(
-                'created_date', 'updated_date', 
-                'student__created_date', 'student__updated_date'
-            )
+            queryset = ReportCard.objects.all()
             filterset = ReportCardFilter(request.GET, queryset=queryset)
             if filterset.is_valid():
                 queryset = filterset.qs
             else:
-                return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
-            paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
-            serializer = ReportCardSerializer(paginated_qs, many=True)
+                return Response(translate_validation(filterset.errors).detail, status=status.HTTP_400_BAD_REQUEST)
+
+            url = request.build_absolute_uri()
+            keyset = request.GET.get('pagination') == 'cursor'
+
+            page = {}
+
+            def paginate():
+                # the validators and the page data share one count and page query on a cold cache
+                if not page:
+                    page['paginator'] = self.keyset_pagination_class() if keyset else self.pagination_class()
+                    page['rows'] = page['paginator'].paginate_queryset(queryset.values(*REPORT_CARD_VALUES.columns), request)
+                return page['paginator'], page['rows']
+
+            def load_validators():
+                # validate only the cards of this page, never the whole filtered set
+                paginator, rows = paginate()
+                ids = [row['id'] for row in rows]
+                # page-number pages print the total count, which also moves when a card is added or removed elsewhere
+                page_key = paginator.get_next_link() if keyset else paginator.page.paginator.count
+                return report_card_validators(ReportCard.objects.filter(id__in=ids), url, ids, page_key)
+
+            validators = representation_validators(request, cached_report_card_page(url, load_validators, part='validators'))
+            if validators:
+                response = not_modified(request, validators)
+                if response is not None:
+                    return response
+
+            def load_page():
+                paginator, rows = paginate()
+                return paginator.get_paginated_response({
+                    'success': True,
+                    'data': serialize_report_cards(rows),
+                    'message': 'ReportCards retrieved successfully',
+                }).data
+
+            data = cached_report_card_page(url, load_page)
             logger.info("ReportCard list retrieved successfully")
-            return paginator.get_paginated_response({
-                'success': True,
-                'data': serializer.data,
-                'message': 'ReportCards retrieved successfully',
-            })
+            response = Response(data)
+            return set_validators(response, validators) if validators else response
+        except APIException as e:
+            logger.error(f"Invalid ReportCard list request: {e.detail}")
+            return Response({
+                'success': False,
+                'message': e.detail,
+            }, status=e.status_code)
         except Exception as e:
             logger.exception(f"Unexpected error retrieving ReportCard list: {e}")
             return Response({
@@ -745,17 +932,28 @@ class ReportCardView(viewsets.ViewSet):
     )
     def retrieve(self, request, pk=None):
         try:
-            report_card = ReportCard.objects \
-            .select_related('student') \
-            .defer('created_date', 'updated_date', 'student__created_date', 'student__updated_date') \
-            .get(pk=pk)
-            serializer = ReportCardSerializer(report_card)
+            validators = representation_validators(request, cached_report_card(
+                int(pk), lambda: report_card_validators(ReportCard.objects.filter(pk=pk)), part='validators'
+            ))
+            if validators is None:
+                raise ReportCard.DoesNotExist
+            response = not_modified(request, validators)
+            if response is not None:
+                return response
+
+            def load_report_card():
+                report_cards = serialize_report_cards(ReportCard.objects.filter(pk=pk).values(*REPORT_CARD_VALUES.columns))
+                if not report_cards:
+                    raise ReportCard.DoesNotExist
+                return report_cards[0]
+
+            data = cached_report_card(int(pk), load_report_card)
             logger.info(f"ReportCard [{pk}] retrieved successfully")
-            return Response({
+            return set_validators(Response({
                 'success': True,
-                'data': serializer.data,
+                'data': data,
                 'message': 'ReportCard retrieved successfully',
-            }, status=status.HTTP_200_OK)
+            }, status=status.HTTP_200_OK), validators)
         except ReportCard.DoesNotExist:
             logger.error("ReportCard Dosent Exist")
             return Response({
@@ -780,12 +978,7 @@ class ReportCardView(viewsets.ViewSet):
     @action(detail=True, methods=['patch'], url_path='update-marks')
     def update_marks(self, request, pk=None):
         try:
-            report_card = ReportCard.objects \
-                .prefetch_related('marks') \
-                .defer(
-                    'created_date', 'updated_date',
-                    'marks__created_date', 'marks__updated_date'
-                ).get(pk=pk)
+            report_card = ReportCard.objects.only('id', 'student', 'term', 'year').get(pk=pk)
         except ReportCard.DoesNotExist:
             return Response({
                 "success": False,
@@ -814,6 +1007,8 @@ class ReportCardView(viewsets.ViewSet):
                 if subject_id in existing_lookup:
                     mark = existing_lookup[subject_id]
                     mark.score = score
+                    # bulk_update skips auto_now, keep updated_date current for the ETag and Last-Modified
+                    mark.updated_date = timezone.now()
                     marks_to_update.append(mark)
                 else:
                     marks_to_create.append(
@@ -821,14 +1016,19 @@ class ReportCardView(viewsets.ViewSet):
                     )
             with transaction.atomic():
                 if marks_to_update:
-                    Mark.objects.bulk_update(marks_to_update, ['score'])
+                    Mark.objects.bulk_update(marks_to_update, ['score', 'updated_date'])
                 if marks_to_create:
                     Mark.objects.bulk_create(marks_to_create)
+                mark_term_summaries_dirty([(report_card.student_id, report_card.term, report_card.year)])
+                # bulk writes skip the model signals
+                invalidate_report_cards([report_card.pk])
         except Exception as e:
             return Response({
                 "success": False,
                 "message": f"An unexpected error occurred: {str(e)}"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # reload so the response carries the marks as written, in one prefetch
+        report_card = ReportCardSerializer.setup_eager_loading(ReportCard.objects.all()).get(pk=report_card.pk)
         serializer = ReportCardSerializer(report_card)
         return Response({
             "success": True,
@@ -837,6 +1037,77 @@ class ReportCardView(viewsets.ViewSet):
         }, status=status.HTTP_200_OK)
 
 
+    @swagger_auto_schema(
+        operation_summary="Bulk import marks from CSV or NDJSON",
+        operation_description=(
+            "Streams a CSV (Content-Type: text/csv) or NDJSON (Content-Type: application/x-ndjson) body "
+            "with the columns student_email, subject_code, term, year and score. Report cards are created "
+            "when missing and marks are inserted or updated in batches. Returns a per-row error report."
+        ),
+        request_body=openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_BINARY),
+        tags=["ReportCard Endpoints"],
+        security=[{'Bearer': []}]
+    )
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        fmt = import_format(request.content_type)
+        if fmt is None:
+            return Response({
+                "success": False,
+                "message": "Upload must be text/csv or application/x-ndjson."
+            }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        try:
+            # read the raw Django request line by line so the upload is never loaded in memory
+            report = import_marks(request._request, fmt)
+        except Exception as e:
+            logger.exception(f"Unexpected error importing marks: {e}")
+            return Response({
+                "success": False,
+                "message": f"An unexpected error occurred: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({
+            "success": report['failed'] == 0,
+            "data": report,
+            "message": "Marks imported successfully." if report['failed'] == 0 else "Marks imported with errors.",
+        }, status=status.HTTP_200_OK)
+
+
+    export_params = filter_params + [
+        openapi.Parameter(
+            'export_format', openapi.IN_QUERY, description="csv (default) or ndjson",
+            type=openapi.TYPE_STRING, enum=sorted(EXPORT_STREAMS)
+        ),
+    ]
+
+    @swagger_auto_schema(
+        operation_summary="Export ReportCards and Marks",
+        operation_description="Streams every report card and mark matching the filters as CSV or NDJSON, one row per mark.",
+        tags=["ReportCard Endpoints"],
+        security=[{'Bearer': []}],
+        manual_parameters=export_params,
+    )
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        export_format = request.GET.get('export_format', 'csv')
+        if export_format not in EXPORT_STREAMS:
+            return Response({
+                "success": False,
+                "message": "export_format must be csv or ndjson."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        filterset = ReportCardFilter(request.GET, queryset=ReportCard.objects.all())
+        if not filterset.is_valid():
+            return Response(translate_validation(filterset.errors).detail, status=status.HTTP_400_BAD_REQUEST)
+        # the rows stream after the view returns, so keep them on the database picked for this request
+        rows = export_rows(filterset.qs.using(filterset.qs.db))
+        response = StreamingHttpResponse(
+            EXPORT_STREAMS[export_format](rows),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="report_cards.{export_format}"'
+        logger.info("ReportCard export started")
+        return response
+
+
     @swagger_auto_schema(
         operation_summary="Report Cards and Yearly Summary by Student and Year",
         operation_description="Fetches report cards and computes yearly average scores by student and year.",
@@ -846,31 +1117,92 @@ class ReportCardView(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path=r'student/(?P<student_id>\d+)/year/(?P<year>\d+)')
     def report_cards_with_summary(self, request, student_id=None, year=None):
         try:
-            report_cards = ReportCard.objects.select_related('student').defer('created_date', 'updated_date', 'student__created_date', 'student__updated_date').filter(student_id=student_id, year=year)
-            if not report_cards.exists():
+            report_cards, summary, stats = yearly_report(student_id, year)
+            validators = representation_validators(request, validators_from_stats(stats))
+            if validators is None:
                 return Response({
                     "success": False,
                     "message": "No report cards found for this student and year."
                 }, status=status.HTTP_404_NOT_FOUND)
-            serializer = ReportCardSerializer(report_cards, many=True)
-            subject_averages = report_cards.values('marks__subject').annotate(avg_score=Avg('marks__score'))
-            overall_avg = report_cards.aggregate(overall_avg=Avg('marks__score'))['overall_avg']
+            not_modified_response = not_modified(request, validators)
+            if not_modified_response is not None:
+                return not_modified_response
             response = {
                 "success": True,
                 "data": {
-                    "report_cards": serializer.data,
-                    "summary": {
-                        "average_per_subject": subject_averages,
-                        "overall_average": overall_avg
-                    }
+                    "report_cards": report_cards,
+                    "summary": summary
                 },
                 "message": "Report cards and summary fetched successfully."
             }
             logger.info("Report cards and summary retrieved successfully.")
-            return Response(response, status=status.HTTP_200_OK)
+            return set_validators(Response(response, status=status.HTTP_200_OK), validators)
         except Exception as e:
             logger.error(f"Error while fetching report card and summary: {e}")
             return Response({
                 "success": False,
                 "message": f"Internal server error: {str(e)}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class RankView(ReplicaReadMixin, viewsets.ViewSet):
+    """
+        Handles read operations for the precomputed student ranks.
+        Base classes:
+            - ReplicaReadMixin
+            - viewsets.ViewSet
+        Returns:
+            - RankView: Returns a student's overall and per-subject rank for a term and year.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    rank_params = [
+        openapi.Parameter('term', openapi.IN_QUERY, description="Term of the ranking", type=openapi.TYPE_STRING, required=True),
+        openapi.Parameter('year', openapi.IN_QUERY, description="Year of the ranking", type=openapi.TYPE_INTEGER, required=True),
+    ]
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve a Student Rank by student ID, term and year",
+        operation_description="Returns the student's overall rank and percentile and the rank in every subject for the term and year.",
+        tags=["Rank Endpoints"],
+        security=[{'Bearer': []}],
+        manual_parameters=rank_params,
+    )
+    def retrieve(self, request, pk=None):
+        term = request.GET.get('term')
+        year = request.GET.get('year')
+        if not term or not year or not year.isdigit():
+            return Response({
+                "success": False,
+                "message": "Both 'term' and 'year' query parameters are required."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if not str(pk).isdigit():
+            return Response({
+                "success": False,
+                "message": "Student ID must be a positive integer."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            term_rank = StudentTermRank.objects.get(student_id=pk, term=term, year=year)
+        except StudentTermRank.DoesNotExist:
+            return Response({
+                "success": False,
+                "message": "Rank not found for this student, term and year."
+            }, status=status.HTTP_404_NOT_FOUND)
+        try:
+            subject_ranks = StudentSubjectRank.objects \
+                .filter(student_id=pk, term=term, year=year) \
+                .order_by('subject_id')
+            data = StudentTermRankSerializer(term_rank).data
+            data['subjects'] = StudentSubjectRankSerializer(subject_ranks, many=True).data
+            logger.info(f"Rank of student [{pk}] for {term} {year} retrieved successfully")
+            return Response({
+                'success': True,
+                'data': data,
+                'message': 'Rank retrieved successfully',
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error while fetching rank of student [{pk}]: {e}")
+            return Response({
+                "success": False,
+                "message": f"Internal server error: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,95 @@
+from django.db import transaction
+from core.locks import write_lock
+from students.models import Student, Subject, ReportCard, Mark
+from students.caching import invalidate_report_cards
+from students.summaries import mark_term_summaries_dirty
+from students.apis.v1.serializers import BulkReportCardSerializer, MarkSerializer
+
+
+def validate_report_cards(items):
+    """
+    Validate a batch of report cards with one query each for students, subjects and existing cards.
+    Args:
+        - items (list): report card payloads with student, term, year and marks.
+    Returns:
+        - tuple: (list of (index, validated item), dict of index to errors)
+    """
+    valid = []
+    errors = {}
+    for index, item in enumerate(items):
+        serializer = BulkReportCardSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors[index] = serializer.errors
+    student_ids = {item['student'] for _, item in valid}
+    subject_ids = {mark['subject'] for _, item in valid for mark in item['marks']}
+    students = set(Student.objects.filter(id__in=student_ids).values_list('id', flat=True))
+    subjects = set(Subject.objects.filter(id__in=subject_ids).values_list('id', flat=True))
+    existing = set(
+        ReportCard.objects
+        .filter(student_id__in=students, term__in={item['term'] for _, item in valid})
+        .values_list('student_id', 'term', 'year')
+    )
+    accepted = []
+    for index, item in valid:
+        key = (item['student'], item['term'], item.get('year'))
+        item_errors = {}
+        if item['student'] not in students:
+            item_errors['student'] = [f"Invalid pk \"{item['student']}\" - object does not exist."]
+        missing = sorted({mark['subject'] for mark in item['marks']} - subjects)
+        if missing:
+            item_errors['marks'] = [f"Invalid subject pk \"{subject}\" - object does not exist." for subject in missing]
+        if not item_errors and key in existing:
+            item_errors['non_field_errors'] = ["A ReportCard for this student, year, and term already exists."]
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        # a later item for the same card in the batch is a duplicate too
+        existing.add(key)
+        accepted.append((index, item))
+    return accepted, errors
+
+
+def create_report_cards(items, partial=False):
+    """
+    Create many report cards with their marks using two bulk inserts in one transaction.
+    Args:
+        - items (list): report card payloads with student, term, year and marks.
+        - partial (bool): create the valid items even when other items fail validation.
+    Returns:
+        - list of per item results in request order, each with index, success and data or errors.
+    """
+    accepted, errors = validate_report_cards(items)
+    created = {}
+    if accepted and (partial or not errors):
+        with write_lock(), transaction.atomic():
+            report_cards = ReportCard.objects.bulk_create([
+                ReportCard(student_id=item['student'], term=item['term'], year=item.get('year'))
+                for _, item in accepted
+            ])
+            marks = {
+                index: [Mark(report_card=report_card, subject_id=mark['subject'], score=mark['score']) for mark in item['marks']]
+                for (index, item), report_card in zip(accepted, report_cards)
+            }
+            Mark.objects.bulk_create([mark for item_marks in marks.values() for mark in item_marks])
+            # bulk inserts skip the model signals
+            mark_term_summaries_dirty((card.student_id, card.term, card.year) for card in report_cards)
+            invalidate_report_cards(card.pk for card in report_cards)
+        for (index, _), report_card in zip(accepted, report_cards):
+            created[index] = {
+                'id': report_card.id,
+                'student': report_card.student_id,
+                'year': report_card.year,
+                'term': report_card.term,
+                'marks': MarkSerializer(marks[index], many=True).data,
+            }
+    results = []
+    for index in range(len(items)):
+        if index in created:
+            results.append({'index': index, 'success': True, 'data': created[index]})
+        elif index in errors:
+            results.append({'index': index, 'success': False, 'errors': errors[index]})
+        else:
+            results.append({'index': index, 'success': False, 'errors': {'non_field_errors': ["Not created because other items failed."]}})
+    return results
@@ -0,0 +1,167 @@
+import hashlib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import caches
+from core.routers import use_replicas
+
+HITS_KEY = 'reportcard:stats:hits'
+MISSES_KEY = 'reportcard:stats:misses'
+LIST_GENERATION_KEY = 'reportcard:list:generation'
+
+
+def report_card_cache():
+    return caches[settings.REPORT_CARD_CACHE_ALIAS]
+
+
+def _current_version(key):
+    """
+    Read a version counter, starting it at 1 the first time it is used.
+    """
+    cache = report_card_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_version(key):
+    cache = report_card_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 2, timeout=None)
+
+
+def _count(key):
+    cache = report_card_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def _read_through(key, loader):
+    """
+    Return the cached value of key, or load, store and return it on a miss.
+    The loader reads the primary, a lagging replica must never fill the shared cache.
+    """
+    cache = report_card_cache()
+    data = cache.get(key)
+    if data is not None:
+        _count(HITS_KEY)
+        return data
+    _count(MISSES_KEY)
+    with use_replicas(False):
+        data = loader()
+    cache.set(key, data, timeout=settings.REPORT_CARD_CACHE_TIMEOUT)
+    return data
+
+
+def _lookup(version_key, key_format):
+    """
+    Resolve the versioned key and read it, counting the hit or miss.
+    """
+    key = key_format.format(version=_current_version(version_key))
+    data = report_card_cache().get(key)
+    _count(HITS_KEY if data is not None else MISSES_KEY)
+    return key, data
+
+
+async def _aread_through(version_key, key_format, loader):
+    """
+    Async version of _read_through, loader is a coroutine function.
+    """
+    # the cache backends are synchronous, one thread hop covers the version, the read and the counter
+    key, data = await sync_to_async(_lookup)(version_key, key_format)
+    if data is None:
+        with use_replicas(False):
+            data = await loader()
+        await report_card_cache().aset(key, data, timeout=settings.REPORT_CARD_CACHE_TIMEOUT)
+    return data
+
+
+def cached_report_card(report_card_id, loader, part='data'):
+    """
+    Read-through cache of one report card, keyed by the card's version.
+    Args:
+        - report_card_id: primary key of the report card.
+        - loader (callable): returns the value on a miss.
+        - part (str): what is cached, e.g. 'data' for the serialized card or 'validators'.
+    Returns:
+        - the cached or loaded value.
+    """
+    version = _current_version(f'reportcard:{report_card_id}:version')
+    return _read_through(f'reportcard:{report_card_id}:v{version}:{part}', loader)
+
+
+def cached_report_card_page(url, loader, part='data'):
+    """
+    Read-through cache of one list page, keyed by the list generation and the full request url.
+    Args:
+        - url (str): absolute url of the page including the query string.
+        - loader (callable): returns the value on a miss.
+        - part (str): what is cached, e.g. 'data' for the paginated payload or 'validators'.
+    Returns:
+        - the cached or loaded value.
+    """
+    generation = _current_version(LIST_GENERATION_KEY)
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    return _read_through(f'reportcard:list:g{generation}:{digest}:{part}', loader)
+
+
+async def acached_report_card(report_card_id, loader, part='data'):
+    """
+    Async version of cached_report_card, sharing its keys so both views hit the same entries.
+    """
+    return await _aread_through(
+        f'reportcard:{report_card_id}:version', f'reportcard:{report_card_id}:v{{version}}:{part}', loader
+    )
+
+
+async def acached_report_card_page(url, loader, part='data'):
+    """
+    Async version of cached_report_card_page.
+    """
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    return await _aread_through(LIST_GENERATION_KEY, f'reportcard:list:g{{version}}:{digest}:{part}', loader)
+
+
+def invalidate_report_cards(report_card_ids):
+    """
+    Invalidate the cached report cards and every cached list page once the transaction commits.
+    Args:
+        - report_card_ids (iterable): primary keys of the changed report cards.
+    Returns:
+        - None
+    """
+    report_card_ids = set(report_card_ids)
+
+    def bump():
+        for report_card_id in report_card_ids:
+            _bump_version(f'reportcard:{report_card_id}:version')
+        _bump_version(LIST_GENERATION_KEY)
+
+    transaction.on_commit(bump)
+
+
+def cache_stats(reset=False):
+    """
+    Return the read-through cache hit and miss counters.
+    Args:
+        - reset (bool): set both counters back to zero after reading them.
+    Returns:
+        - dict: hits, misses and hit ratio.
+    """
+    cache = report_card_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    if reset:
+        cache.delete_many([HITS_KEY, MISSES_KEY])
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
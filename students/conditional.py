@@ -0,0 +1,120 @@
+import json
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+VALIDATOR_STATS = {
+    'card_count': Count('id', distinct=True),
+    'mark_count': Count('marks'),
+    'card_modified': Max('updated_date'),
+    'mark_modified': Max('marks__updated_date'),
+}
+
+
+def report_card_validators(report_cards, *extra):
+    """
+    Build the ETag and Last-Modified of a set of report cards from one aggregate query.
+    The newest updated_date of the cards and their marks catches every edit, and the
+    card and mark counts catch deletions, so nothing has to be serialized.
+    Args:
+        - report_cards (QuerySet): filtered ReportCard queryset.
+        - extra: values that also select the response, such as the page url.
+    Returns:
+        - dict with 'etag' and 'last_modified' (unix timestamp), or None when no report card matches.
+    """
+    stats = report_cards.order_by().aggregate(**VALIDATOR_STATS)
+    return validators_from_stats(stats, *extra)
+
+
+async def areport_card_validators(report_cards, *extra):
+    """
+    Async version of report_card_validators for the ASGI views.
+    """
+    stats = await report_cards.order_by().aaggregate(**VALIDATOR_STATS)
+    return validators_from_stats(stats, *extra)
+
+
+def validators_from_stats(stats, *extra):
+    """
+    Build the validators from card and mark counts and their newest updated_date.
+    Args:
+        - stats (dict): card_count, mark_count, card_modified and mark_modified.
+        - extra: values that also select the response.
+    Returns:
+        - dict with 'etag' and 'last_modified', or None when there is no card.
+    """
+    if not stats['card_count']:
+        return None
+    last_modified = max(filter(None, [stats['card_modified'], stats['mark_modified']]))
+    encoded = json.dumps([stats, *extra], sort_keys=True, default=str)
+    return {
+        'etag': hashlib.sha256(encoded.encode()).hexdigest(),
+        'last_modified': int(last_modified.timestamp()),
+    }
+
+
+def row_validators(rows, *extra):
+    """
+    Build the ETag and Last-Modified of values() rows that carry their own id and updated_date,
+    such as the students of a page, from the rows already fetched for the response.
+    Args:
+        - rows (list): dicts with 'id' and 'updated_date'.
+        - extra: values that also select the response, such as the page url and total count.
+    Returns:
+        - dict with 'etag' and 'last_modified' (unix timestamp), or None when there is no row.
+    """
+    if not rows:
+        return None
+    encoded = json.dumps([[(row['id'], row['updated_date']) for row in rows], *extra], default=str)
+    return {
+        'etag': hashlib.sha256(encoded.encode()).hexdigest(),
+        'last_modified': int(max(row['updated_date'] for row in rows).timestamp()),
+    }
+
+
+def representation_validators(request, validators):
+    """
+    Tie the validators to the negotiated media type, so the JSON and MessagePack
+    representations of the same report cards never share a strong ETag.
+    Args:
+        - request: the DRF request after content negotiation, or a Django request answered in JSON.
+        - validators (dict): built by report_card_validators, or None.
+    Returns:
+        - dict with 'etag' and 'last_modified', or None when validators is None.
+    """
+    if validators is None:
+        return None
+    renderer = getattr(request, 'accepted_renderer', None)
+    media_type = renderer.media_type if renderer is not None else 'application/json'
+    etag = hashlib.sha256(f"{validators['etag']}:{media_type}".encode()).hexdigest()
+    return {**validators, 'etag': etag}
+
+
+def not_modified(request, validators):
+    """
+    Answer If-None-Match and If-Modified-Since against the validators.
+    Args:
+        - request: the incoming request.
+        - validators (dict): built by representation_validators.
+    Returns:
+        - a 304 (or 412) response, or None when the full response must be sent.
+    """
+    response = get_conditional_response(
+        request,
+        etag=quote_etag(validators['etag']),
+        last_modified=validators['last_modified'],
+    )
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response, validators):
+    """
+    Add the ETag and Last-Modified headers to a response, varying on Accept like its ETag.
+    """
+    response['ETag'] = quote_etag(validators['etag'])
+    response['Last-Modified'] = http_date(validators['last_modified'])
+    patch_vary_headers(response, ['Accept'])
+    return response
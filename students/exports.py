@@ -0,0 +1,70 @@
+import csv
+import json
+from django.conf import settings
+
+EXPORT_COLUMNS = [
+    'report_card_id', 'student_id', 'student_name', 'student_email',
+    'term', 'year', 'subject_code', 'subject_name', 'score',
+]
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """
+    File-like object whose write returns the value, used to stream csv.writer output.
+    """
+    def write(self, value):
+        return value
+
+
+def export_rows(report_cards, chunk_size=None):
+    """
+    Stream one row per mark, or per report card without marks, from a single joined query.
+    Args:
+        - report_cards (QuerySet): filtered ReportCard queryset.
+        - chunk_size (int, optional): rows fetched from the database cursor at a time.
+    Returns:
+        - iterator of tuples in EXPORT_COLUMNS order.
+    """
+    return report_cards \
+        .order_by('year', 'term', 'id', 'marks__subject__code') \
+        .values_list(
+            'id', 'student_id', 'student__name', 'student__email',
+            'term', 'year', 'marks__subject__code', 'marks__subject__name', 'marks__score',
+        ) \
+        .iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(rows):
+    """
+    Encode export rows as CSV lines, header first.
+    Args:
+        - rows (iterable): tuples in EXPORT_COLUMNS order.
+    Returns:
+        - iterator of CSV lines.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows):
+    """
+    Encode export rows as one JSON object per line.
+    Args:
+        - rows (iterable): tuples in EXPORT_COLUMNS order.
+    Returns:
+        - iterator of NDJSON lines.
+    """
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + '\n'
+
+
+EXPORT_STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
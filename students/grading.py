@@ -0,0 +1,114 @@
+import numpy as np
+
+GRADE_BOUNDARIES = np.array([50, 60, 70, 80, 90], dtype=np.float64)
+GRADE_LABELS = np.array(['F', 'D', 'C', 'B', 'A', 'A+'])
+
+
+def grade_scores(scores):
+    """
+    Grade a whole column of scores with one boundary lookup.
+    Args:
+        - scores (array-like): scores or averages, Decimal values are accepted.
+    Returns:
+        - numpy array of grade labels, same grading as students.summaries.calculate_grade.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    return GRADE_LABELS[np.searchsorted(GRADE_BOUNDARIES, scores, side='right')]
+
+
+def group_index(*columns):
+    """
+    Encode one or more key columns into a dense group number per row.
+    Args:
+        - columns (array-like): key columns of equal length such as term, year or subject.
+    Returns:
+        - tuple: (group number per row, list of key tuples ordered by group number)
+    """
+    codes = []
+    uniques = []
+    for column in columns:
+        values, inverse = np.unique(np.asarray(column), return_inverse=True)
+        uniques.append(values)
+        codes.append(inverse.ravel())
+    shape = [len(values) for values in uniques]
+    flat = np.ravel_multi_index(codes, shape) if len(codes) > 1 else codes[0]
+    group_ids, groups = np.unique(flat, return_inverse=True)
+    key_codes = np.unravel_index(group_ids, shape)
+    keys = list(zip(*[values[code].tolist() for values, code in zip(uniques, key_codes)]))
+    return groups.ravel(), keys
+
+
+def _sorted_groups(scores, groups, descending=False):
+    """
+    Sort scores by group and then by score, returning the order and group offsets.
+    """
+    order = np.lexsort((-scores if descending else scores, groups))
+    counts = np.bincount(groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return order, counts, starts
+
+
+def group_statistics(scores, *columns, percentiles=(25, 75, 90)):
+    """
+    Compute count, mean, median, standard deviation, min, max and percentiles per group.
+    Args:
+        - scores (array-like): one score per row.
+        - columns (array-like): key columns defining the groups (term, year, subject...).
+        - percentiles (tuple): extra percentiles to compute, linear interpolation like numpy.percentile.
+    Returns:
+        - dict: 'keys' (list of key tuples) and one numpy array per statistic, aligned with 'keys'.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if not len(scores):
+        return {'keys': []}
+    groups, keys = group_index(*columns)
+    order, counts, starts = _sorted_groups(scores, groups)
+    sorted_scores = scores[order]
+    means = np.bincount(groups, weights=scores) / counts
+    squared = np.bincount(groups, weights=(scores - means[groups]) ** 2)
+
+    def percentile(q):
+        position = starts + (counts - 1) * (q / 100.0)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        return sorted_scores[low] + (sorted_scores[high] - sorted_scores[low]) * (position - low)
+
+    statistics = {
+        'keys': keys,
+        'count': counts,
+        'mean': means,
+        'median': percentile(50),
+        'std': np.sqrt(squared / counts),
+        'min': sorted_scores[starts],
+        'max': sorted_scores[starts + counts - 1],
+    }
+    for q in percentiles:
+        statistics[f'p{q}'] = percentile(q)
+    return statistics
+
+
+def rank_scores(scores, *columns):
+    """
+    Rank every row within its group, highest score first, ties sharing the best rank.
+    Args:
+        - scores (array-like): one score per row.
+        - columns (array-like): key columns defining the groups, no columns ranks all rows together.
+    Returns:
+        - tuple: (rank per row starting at 1, percentile per row where the top rank is 100)
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    size = len(scores)
+    if not size:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    groups = group_index(*columns)[0] if columns else np.zeros(size, dtype=np.int64)
+    order, counts, starts = _sorted_groups(scores, groups, descending=True)
+    sorted_groups = groups[order]
+    sorted_scores = scores[order]
+    positions = np.arange(size)
+    new_run = np.ones(size, dtype=bool)
+    new_run[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_scores[1:] != sorted_scores[:-1])
+    run_starts = np.maximum.accumulate(np.where(new_run, positions, 0))
+    ranks = np.empty(size, dtype=np.int64)
+    ranks[order] = run_starts - starts[sorted_groups] + 1
+    group_counts = counts[groups]
+    return ranks, 100.0 * (group_counts - ranks + 1) / group_counts
@@ -0,0 +1,188 @@
+import csv
+import json
+import time
+from django.conf import settings
+from django.db import transaction
+from core.locks import write_lock
+from django.core.exceptions import ValidationError
+from core.logs.logger import logger
+from students.models import Student, Subject, ReportCard, Mark
+from students.caching import invalidate_report_cards
+from students.summaries import mark_term_summaries_dirty
+
+IMPORT_FIELDS = {
+    'student_email': Student._meta.get_field('email'),
+    'subject_code': Subject._meta.get_field('code'),
+    'term': ReportCard._meta.get_field('term'),
+    'year': ReportCard._meta.get_field('year'),
+    'score': Mark._meta.get_field('score'),
+}
+IMPORT_FORMATS = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+
+
+def import_format(content_type):
+    """
+    Resolve the import format from a request content type.
+    Args:
+        - content_type (str): Content-Type header of the upload.
+    Returns:
+        - 'csv', 'ndjson' or None when the content type is not supported.
+    """
+    return IMPORT_FORMATS.get((content_type or '').split(';')[0].strip().lower())
+
+
+def read_rows(stream, fmt):
+    """
+    Lazily parse an uploaded CSV or NDJSON body line by line.
+    Args:
+        - stream (iterable): binary stream yielding lines, such as a Django HttpRequest.
+        - fmt (str): 'csv' or 'ndjson'.
+    Returns:
+        - iterator of (line number, row dict or None, error message or None)
+    """
+    lines = (line.decode('utf-8-sig') if isinstance(line, bytes) else line for line in stream)
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object."
+            continue
+        yield line_number, row, None
+
+
+def clean_row(row):
+    """
+    Validate one import row with the model field rules.
+    Args:
+        - row (dict): raw row with the IMPORT_FIELDS keys.
+    Returns:
+        - tuple: (cleaned dict, errors dict)
+    """
+    cleaned = {}
+    errors = {}
+    for column, field in IMPORT_FIELDS.items():
+        value = row.get(column)
+        if value is None or value == '':
+            errors[column] = ["This field is required."]
+            continue
+        try:
+            cleaned[column] = field.clean(value, None)
+        except ValidationError as e:
+            errors[column] = e.messages
+    return cleaned, errors
+
+
+def import_batch(rows):
+    """
+    Upsert the report cards and marks of one batch of cleaned rows in a single transaction.
+    Args:
+        - rows (list): (line number, cleaned row) tuples.
+    Returns:
+        - tuple: (number of marks written, list of row errors)
+    """
+    emails = {row['student_email'] for _, row in rows}
+    codes = {row['subject_code'] for _, row in rows}
+    students = dict(Student.objects.filter(email__in=emails).values_list('email', 'id'))
+    subjects = dict(Subject.objects.filter(code__in=codes).values_list('code', 'id'))
+    errors = []
+    marks = {}
+    for line_number, row in rows:
+        row_errors = {}
+        if row['student_email'] not in students:
+            row_errors['student_email'] = ["Student not found."]
+        if row['subject_code'] not in subjects:
+            row_errors['subject_code'] = ["Subject not found."]
+        if row_errors:
+            errors.append({'line': line_number, 'errors': row_errors})
+            continue
+        key = (students[row['student_email']], row['term'], row['year'])
+        # a later row for the same report card and subject wins
+        marks[key, subjects[row['subject_code']]] = row['score']
+    if not marks:
+        return 0, errors
+    card_keys = {key for key, _ in marks}
+    with write_lock(), transaction.atomic():
+        ReportCard.objects.bulk_create(
+            [ReportCard(student_id=student_id, term=term, year=year) for student_id, term, year in card_keys],
+            ignore_conflicts=True,
+        )
+        report_cards = {
+            (student_id, term, year): report_card_id
+            for report_card_id, student_id, term, year in ReportCard.objects
+            .filter(student_id__in={key[0] for key in card_keys}, year__in={key[2] for key in card_keys})
+            .values_list('id', 'student_id', 'term', 'year')
+        }
+        Mark.objects.bulk_create(
+            [
+                Mark(report_card_id=report_cards[key], subject_id=subject_id, score=score)
+                for (key, subject_id), score in marks.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['report_card', 'subject'],
+            update_fields=['score', 'updated_date'],
+        )
+        mark_term_summaries_dirty(card_keys)
+        invalidate_report_cards(report_cards[key] for key in card_keys)
+    return len(marks), errors
+
+
+def import_marks(stream, fmt, batch_size=None):
+    """
+    Stream a CSV or NDJSON mark upload into report cards and marks in bounded batches.
+    Args:
+        - stream (iterable): binary stream yielding lines.
+        - fmt (str): 'csv' or 'ndjson'.
+        - batch_size (int, optional): rows written per transaction.
+    Returns:
+        - dict: import report with row counts and per-row errors.
+    """
+    batch_size = batch_size or settings.MARK_IMPORT_BATCH_SIZE
+    started = time.monotonic()
+    report = {'rows': 0, 'imported': 0, 'failed': 0, 'errors': []}
+
+    def add_errors(row_errors):
+        report['failed'] += len(row_errors)
+        room = settings.MARK_IMPORT_MAX_ERRORS - len(report['errors'])
+        report['errors'].extend(row_errors[:max(room, 0)])
+
+    batch = []
+    for line_number, row, error in read_rows(stream, fmt):
+        report['rows'] += 1
+        if error:
+            add_errors([{'line': line_number, 'errors': {'non_field_errors': [error]}}])
+            continue
+        cleaned, row_errors = clean_row(row)
+        if row_errors:
+            add_errors([{'line': line_number, 'errors': row_errors}])
+            continue
+        batch.append((line_number, cleaned))
+        if len(batch) >= batch_size:
+            imported, row_errors = import_batch(batch)
+            report['imported'] += imported
+            add_errors(row_errors)
+            batch = []
+    if batch:
+        imported, row_errors = import_batch(batch)
+        report['imported'] += imported
+        add_errors(row_errors)
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"Mark import finished: {report['rows']} rows, {report['imported']} marks imported, "
+        f"{report['failed']} failed ({report['elapsed_seconds']}s)"
+    )
+    return report
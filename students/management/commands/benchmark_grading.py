@@ -0,0 +1,51 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from students.grading import grade_scores, group_statistics
+from students.summaries import calculate_grade
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark of the scalar calculate_grade loop against the vectorized grading engine.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the timings for every mark count
+    """
+    help = "Benchmark scalar grading against the vectorized NumPy grading engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[10_000, 1_000_000, 10_000_000],
+            help="Number of marks to grade in each run.",
+        )
+        parser.add_argument('--seed', type=int, default=2025)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        self.stdout.write(f"{'marks':>12} {'scalar (s)':>12} {'vector (s)':>12} {'speedup':>9} {'stats (s)':>10}")
+        for size in options['sizes']:
+            scores = np.round(rng.uniform(0, 100, size), 2)
+            subjects = rng.integers(0, 12, size)
+            terms = rng.integers(1, 4, size)
+            score_list = scores.tolist()
+
+            started = time.perf_counter()
+            scalar = [calculate_grade(score) for score in score_list]
+            scalar_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            vector = grade_scores(scores)
+            vector_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            group_statistics(scores, terms, subjects)
+            stats_seconds = time.perf_counter() - started
+
+            if vector.tolist() != scalar:
+                self.stderr.write(f"grades differ for {size} marks")
+            self.stdout.write(
+                f"{size:>12} {scalar_seconds:>12.4f} {vector_seconds:>12.4f} "
+                f"{scalar_seconds / vector_seconds:>8.1f}x {stats_seconds:>10.4f}"
+            )
@@ -0,0 +1,62 @@
+import time
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from core.renderers import ORJSONRenderer, MessagePackRenderer
+
+
+class Command(BaseCommand):
+    """
+    Benchmark of encode time and payload size of the JSON, orjson and MessagePack renderers.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the timings and sizes for every page size
+    """
+    help = "Benchmark DRF's JSON renderer against the orjson and MessagePack renderers on report card pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000], help="Report cards per page.")
+        parser.add_argument('--subjects', type=int, default=12, help="Marks per report card.")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per size, the fastest is reported.")
+
+    def page(self, size, subjects):
+        return {
+            'count': size,
+            'next': None,
+            'previous': None,
+            'results': {
+                'success': True,
+                'data': [
+                    {
+                        'id': index,
+                        'student': index,
+                        'year': 2025,
+                        'term': 'Term 1',
+                        'marks': [
+                            {'id': index * subjects + subject, 'subject': subject, 'score': f"{(index + subject) % 100}.25"}
+                            for subject in range(subjects)
+                        ],
+                    }
+                    for index in range(size)
+                ],
+                'message': 'ReportCards retrieved successfully',
+            },
+        }
+
+    def handle(self, *args, **options):
+        renderers = [('json', JSONRenderer()), ('orjson', ORJSONRenderer()), ('msgpack', MessagePackRenderer())]
+        self.stdout.write(f"{'page size':>10} {'renderer':>9} {'encode (ms)':>12} {'bytes':>10} {'speedup':>9}")
+        for size in options['sizes']:
+            data = self.page(size, options['subjects'])
+            baseline = None
+            for name, renderer in renderers:
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    content = renderer.render(data)
+                    timings.append(time.perf_counter() - started)
+                seconds = min(timings)
+                baseline = baseline or seconds
+                self.stdout.write(
+                    f"{size:>10} {name:>9} {seconds * 1000:>12.3f} {len(content):>10} {baseline / seconds:>8.1f}x"
+                )
@@ -0,0 +1,69 @@
+import time
+from datetime import date
+from decimal import Decimal
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from django.core.management.base import BaseCommand
+from students.models import Student, Subject, ReportCard, Mark
+from students.apis.v1.serializers import ReportCardSerializer, REPORT_CARD_VALUES, serialize_report_cards
+
+
+class Command(BaseCommand):
+    """
+    Benchmark of ReportCardSerializer against the values() read path for list pages.
+    Fixture rows are written inside a transaction that is rolled back afterwards.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the timings for every page size
+    """
+    help = "Benchmark the ModelSerializer report card page against the values() read serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000], help="Report cards per page.")
+        parser.add_argument('--subjects', type=int, default=12, help="Marks per report card.")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per size, the fastest is reported.")
+
+    def fastest(self, call, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = call()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'page size':>10} {'serializer (s)':>15} {'values (s)':>11} {'speedup':>9} {'identical':>10}")
+        with transaction.atomic():
+            subjects = Subject.objects.bulk_create([
+                Subject(name=f"Benchmark subject {index}", code=f"BENCH{index}") for index in range(options['subjects'])
+            ])
+            students = Student.objects.bulk_create([
+                Student(name="Benchmark student", email=f"benchmark{index}@example.com", date_of_birth=date(2005, 1, 1))
+                for index in range(max(options['sizes']))
+            ])
+            report_cards = ReportCard.objects.bulk_create([
+                ReportCard(student=student, term="Term 1", year=1900) for student in students
+            ])
+            Mark.objects.bulk_create([
+                Mark(report_card=report_card, subject=subject, score=Decimal(index % 100) + Decimal('0.25'))
+                for index, report_card in enumerate(report_cards)
+                for subject in subjects
+            ])
+            queryset = ReportCard.objects.filter(year=1900)
+            renderer = JSONRenderer()
+            for size in options['sizes']:
+                page = queryset[:size]
+                slow_seconds, slow = self.fastest(
+                    lambda: renderer.render(ReportCardSerializer(ReportCardSerializer.setup_eager_loading(page), many=True).data),
+                    options['repeat'],
+                )
+                fast_seconds, fast = self.fastest(
+                    lambda: renderer.render(serialize_report_cards(page.values(*REPORT_CARD_VALUES.columns))),
+                    options['repeat'],
+                )
+                self.stdout.write(
+                    f"{size:>10} {slow_seconds:>15.4f} {fast_seconds:>11.4f} "
+                    f"{slow_seconds / fast_seconds:>8.1f}x {str(slow == fast):>10}"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,23 @@
+import hashlib
+from django.core.management.base import BaseCommand
+from core.openapi import generate_schema, write_schema
+
+
+class Command(BaseCommand):
+    """
+    Generate the OpenAPI document served by /swagger/ and /documentation/.
+    Run on every deploy (entrypoint.sh), the schema views serve the file until the next one.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the path, size and ETag of the document
+    """
+    help = "Generate the OpenAPI schema file served by the API docs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Path of the schema file, defaults to OPENAPI_SCHEMA_FILE.")
+
+    def handle(self, *args, **options):
+        content = generate_schema()
+        path = write_schema(content, options['output'])
+        self.stdout.write(f"OpenAPI schema written to {path} ({len(content)} bytes, ETag {hashlib.sha256(content).hexdigest()[:16]})")
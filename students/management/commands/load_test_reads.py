@@ -0,0 +1,105 @@
+import time
+import asyncio
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Load test of read endpoints with many concurrent keep-alive clients.
+    Point it at the WSGI server (gunicorn reportcardsystem.wsgi) and the ASGI server
+    (uvicorn reportcardsystem.asgi) to compare the sync and async endpoints.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints throughput, latency percentiles and errors for every url
+    """
+    help = "Load test read endpoints, e.g. /apis/v1/reportcard/1/ against /apis/v1/async/reportcard/1/."
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help="Full urls, tested one after the other.")
+        parser.add_argument('--token', default='', help="JWT access token sent as a Bearer token.")
+        parser.add_argument('--clients', type=int, default=500, help="Concurrent connections.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds per url.")
+        parser.add_argument('--timeout', type=float, default=30, help="Seconds before a request counts as an error.")
+
+    async def client(self, url, headers, deadline, timeout, latencies, errors):
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else '')
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n{headers}Connection: keep-alive\r\n\r\n"
+        ).encode()
+        reader = writer = None
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(parts.hostname, parts.port or 80), timeout
+                    )
+                writer.write(request)
+                status_code, keep_alive = await asyncio.wait_for(self.read_response(reader), timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            if status_code >= 400:
+                errors[status_code] = errors.get(status_code, 0) + 1
+            latencies.append(time.monotonic() - started)
+            if not keep_alive:
+                # gunicorn's sync workers close the connection after every response
+                writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    async def read_response(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        status_code = int(lines[0].split()[1])
+        headers = dict(line.lower().split(': ', 1) for line in lines[1:] if ': ' in line)
+        if 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        return status_code, headers.get('connection') != 'close'
+
+    async def run(self, url, options):
+        headers = f"Authorization: Bearer {options['token']}\r\n" if options['token'] else ''
+        latencies, errors = [], {}
+        started = time.monotonic()
+        deadline = started + options['duration']
+        await asyncio.gather(*[
+            self.client(url, headers, deadline, options['timeout'], latencies, errors)
+            for _ in range(options['clients'])
+        ])
+        return latencies, errors, time.monotonic() - started
+
+    def handle(self, *args, **options):
+        for url in options['urls']:
+            if urlsplit(url).scheme != 'http':
+                raise CommandError(f"Only http:// urls are supported: {url}")
+        self.stdout.write(
+            f"{'requests/s':>11} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}  url"
+        )
+        for url in options['urls']:
+            latencies, errors, elapsed = asyncio.run(self.run(url, options))
+            latencies.sort()
+
+            def percentile(fraction):
+                if not latencies:
+                    return 0
+                return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+            self.stdout.write(
+                f"{len(latencies) / elapsed:>11.1f} {percentile(0.5):>9.1f} {percentile(0.95):>9.1f} "
+                f"{percentile(0.99):>9.1f} {sum(errors.values()):>7}  {url}"
+            )
+            if errors:
+                self.stdout.write(f"{'':>49}errors: {errors}")
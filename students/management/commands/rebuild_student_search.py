@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from students.search import install_student_search
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the SQLite FTS5 student search index from the students table.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints whether the index was rebuilt
+    """
+    help = "Rebuild the student full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if install_student_search(options['database'], rebuild=True):
+            self.stdout.write("Student search index rebuilt.")
+        else:
+            self.stdout.write("Full-text search is not available on this database, searches use icontains.")
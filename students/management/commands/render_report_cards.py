@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from students.models import ReportCard
+from students.rendering import render_report_cards
+
+
+class Command(BaseCommand):
+    """
+    Render printable HTML and PDF report cards for a year and term into MEDIA_ROOT.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the run report
+    """
+    help = "Render printable report cards for a year and term with a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, required=True)
+        parser.add_argument('--term', choices=['Term 1', 'Term 2', 'Term 3'])
+        parser.add_argument('--student', type=int, nargs='+', help="Only render these student ids.")
+        parser.add_argument('--workers', type=int, help="Render processes, defaults to REPORT_CARD_RENDER_WORKERS.")
+
+    def handle(self, *args, **options):
+        report_cards = ReportCard.objects.filter(year=options['year'])
+        if options['term']:
+            report_cards = report_cards.filter(term=options['term'])
+        if options['student']:
+            report_cards = report_cards.filter(student_id__in=options['student'])
+        report = render_report_cards(report_cards, workers=options['workers'])
+        self.stdout.write(
+            f"{report['rendered']} rendered, {report['skipped']} unchanged in {report['elapsed_seconds']}s"
+        )
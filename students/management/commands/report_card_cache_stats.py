@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from students.caching import cache_stats
+
+
+class Command(BaseCommand):
+    """
+    Print the hit and miss counters of the report card read-through cache.
+    Base classes:
+        - BaseCommand
+    Returns:
+        - prints the counters
+    """
+    help = "Show report card cache hits, misses and hit ratio."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after reading them.")
+
+    def handle(self, *args, **options):
+        stats = cache_stats(reset=options['reset'])
+        self.stdout.write(f"{stats['hits']} hits, {stats['misses']} misses, hit ratio {stats['hit_ratio']}")
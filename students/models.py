@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 class Student(models.Model):
     """
@@ -14,6 +15,13 @@ class Student(models.Model):
     date_of_birth = models.DateField()
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
+    # case folded copies kept by the database on every write, short searches seek them as prefix ranges
+    name_folded = models.GeneratedField(
+        expression=Lower('name'), output_field=models.CharField(max_length=100), db_persist=True
+    )
+    email_folded = models.GeneratedField(
+        expression=Lower('email'), output_field=models.CharField(max_length=254), db_persist=True
+    )
 
     def __str__(self):
         return self.name
@@ -23,6 +31,11 @@ class Student(models.Model):
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
         ordering = ['created_date']
+        indexes = [
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['name_folded']),
+            models.Index(fields=['email_folded']),
+        ]
 
 
 class Subject(models.Model):
@@ -46,6 +59,9 @@ class Subject(models.Model):
         verbose_name = 'Subject'
         verbose_name_plural = 'Subjects'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name']),
+        ]
 
 class ReportCard(models.Model):
     """
@@ -65,6 +81,15 @@ class ReportCard(models.Model):
     def __str__(self):
         return f"{self.student.name} - {self.term} - {self.year}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the summary key as loaded so a term/year change can also mark the old key dirty
+        instance._loaded_summary_key = tuple(
+            instance.__dict__.get(field) for field in ('student_id', 'term', 'year')
+        )
+        return instance
+
     class Meta:
         db_table = 'report_cards'
         verbose_name = 'Report Card'
@@ -74,6 +99,9 @@ class ReportCard(models.Model):
         indexes = [
             models.Index(fields=['student', 'year']),
             models.Index(fields=['student', 'term', 'year']),
+            # seek keys of the cursor pagination
+            models.Index(fields=['year', 'term', 'id']),
+            models.Index(fields=['student', 'id']),
         ]
 
 
@@ -126,3 +154,78 @@ class StudentTermSummary(models.Model):
         verbose_name = 'StudentTermSummary'
         verbose_name_plural = 'StudentTermSummary'
         unique_together = ('student', 'term', 'year')
+
+
+class StudentTermRank(models.Model):
+    """
+    Model representing a student's overall rank and percentile within a term and year.
+    Base classes:
+        - models.Model
+    Returns:
+        - StudentTermRank: A StudentTermRank instance ranked on the term average score.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='term_ranks')
+    term = models.CharField(max_length=25)
+    year = models.IntegerField()
+    average_score = models.DecimalField(max_digits=5, decimal_places=2)
+    rank = models.PositiveIntegerField()
+    percentile = models.DecimalField(max_digits=5, decimal_places=2)
+    cohort_size = models.PositiveIntegerField()
+    calculated_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'student_term_ranks'
+        verbose_name = 'StudentTermRank'
+        verbose_name_plural = 'StudentTermRank'
+        unique_together = ('student', 'term', 'year')
+        indexes = [
+            models.Index(fields=['term', 'year', 'rank']),
+        ]
+
+
+class StudentSubjectRank(models.Model):
+    """
+    Model representing a student's rank and percentile in one subject within a term and year.
+    Base classes:
+        - models.Model
+    Returns:
+        - StudentSubjectRank: A StudentSubjectRank instance ranked on the subject score.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='subject_ranks')
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    term = models.CharField(max_length=25)
+    year = models.IntegerField()
+    score = models.DecimalField(max_digits=5, decimal_places=2)
+    rank = models.PositiveIntegerField()
+    percentile = models.DecimalField(max_digits=5, decimal_places=2)
+    cohort_size = models.PositiveIntegerField()
+    calculated_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'student_subject_ranks'
+        verbose_name = 'StudentSubjectRank'
+        verbose_name_plural = 'StudentSubjectRank'
+        unique_together = ('student', 'subject', 'term', 'year')
+        indexes = [
+            models.Index(fields=['student', 'term', 'year']),
+        ]
+
+
+class DirtyTermSummary(models.Model):
+    """
+    Model representing a (student, term, year) whose StudentTermSummary is out of date.
+    Base classes:
+        - models.Model
+    Returns:
+        - DirtyTermSummary: A DirtyTermSummary instance recorded on every mark or report card write.
+    """
+    student_id = models.BigIntegerField()
+    term = models.CharField(max_length=25)
+    year = models.IntegerField()
+    marked_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dirty_term_summaries'
+        verbose_name = 'DirtyTermSummary'
+        verbose_name_plural = 'DirtyTermSummary'
+        unique_together = ('student_id', 'term', 'year')
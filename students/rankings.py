@@ -0,0 +1,141 @@
+from decimal import Decimal
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from core.locks import write_lock
+from students.grading import rank_scores
+from students.models import Mark, StudentTermSummary, StudentTermRank, StudentSubjectRank
+
+TWO_PLACES = Decimal('0.01')
+
+
+def changed_rank_rows(model, rows, key_fields, value_fields, term, year):
+    """
+    Compare freshly ranked rows with the stored rank rows of a cohort.
+    Args:
+        - model (Model): StudentTermRank or StudentSubjectRank.
+        - rows (list): unsaved rank rows of the whole cohort.
+        - key_fields (tuple): attnames identifying a row within the cohort.
+        - value_fields (tuple): attnames compared to detect a change.
+        - term (str): term of the cohort.
+        - year (int): year of the cohort.
+    Returns:
+        - tuple: (rows new or changed, ids of stored rows no longer in the cohort)
+    """
+    stored = {
+        values[:len(key_fields)]: (values[len(key_fields)], values[len(key_fields) + 1:])
+        for values in model.objects
+        .filter(term=term, year=year)
+        .values_list(*key_fields, 'id', *value_fields)
+        .iterator(chunk_size=settings.TERM_SUMMARY_CHUNK_SIZE)
+    }
+    changed = []
+    for row in rows:
+        key = tuple(getattr(row, field) for field in key_fields)
+        _, values = stored.pop(key, (None, None))
+        if values != tuple(getattr(row, field) for field in value_fields):
+            changed.append(row)
+    return changed, [row_id for row_id, _ in stored.values()]
+
+
+def write_rank_rows(model, rows, stale_ids, unique_fields, update_fields):
+    """
+    Upsert changed rank rows and delete stale ones, one short locked transaction per batch,
+    so concurrent writers only ever wait for a single batch.
+    Args:
+        - model (Model): StudentTermRank or StudentSubjectRank.
+        - rows (list): new or changed unsaved rank rows.
+        - stale_ids (list): ids of rank rows to delete.
+        - unique_fields (list): fields of the model's unique constraint.
+        - update_fields (list): fields written when the row exists.
+    Returns:
+        - None
+    """
+    batch_size = settings.TERM_SUMMARY_BATCH_SIZE
+    for index in range(0, len(stale_ids), batch_size):
+        with write_lock(), transaction.atomic():
+            model.objects.filter(id__in=stale_ids[index:index + batch_size]).delete()
+    for index in range(0, len(rows), batch_size):
+        with write_lock(), transaction.atomic():
+            model.objects.bulk_create(
+                rows[index:index + batch_size],
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=[*update_fields, 'calculated_date'],
+            )
+
+
+def refresh_cohort_ranks(term, year):
+    """
+    Refresh the overall and per-subject rank rows of one (term, year) cohort.
+    The cohort is read and ranked outside any lock, only rows whose rank, percentile,
+    score or cohort size changed are written, in batches.
+    Args:
+        - term (str): term of the cohort.
+        - year (int): year of the cohort.
+    Returns:
+        - int: number of students ranked in the cohort.
+    """
+    summaries = list(
+        StudentTermSummary.objects
+        .filter(term=term, year=year)
+        .values_list('student_id', 'average_score')
+    )
+    marks = list(
+        Mark.objects
+        .filter(report_card__term=term, report_card__year=year)
+        .values_list('report_card__student_id', 'subject_id', 'score')
+    )
+    ranks, percentiles = rank_scores([average for _, average in summaries])
+    subject_ids = [subject_id for _, subject_id, _ in marks]
+    subject_ranks, subject_percentiles = rank_scores([score for _, _, score in marks], subject_ids)
+    subject_sizes = Counter(subject_ids)
+
+    term_ranks = [
+        StudentTermRank(
+            student_id=student_id,
+            term=term,
+            year=year,
+            average_score=average,
+            rank=int(rank),
+            percentile=Decimal(percentile).quantize(TWO_PLACES),
+            cohort_size=len(summaries),
+        )
+        for (student_id, average), rank, percentile in zip(summaries, ranks, percentiles)
+    ]
+    subject_rank_rows = [
+        StudentSubjectRank(
+            student_id=student_id,
+            subject_id=subject_id,
+            term=term,
+            year=year,
+            score=score,
+            rank=int(rank),
+            percentile=Decimal(percentile).quantize(TWO_PLACES),
+            cohort_size=subject_sizes[subject_id],
+        )
+        for (student_id, subject_id, score), rank, percentile in zip(marks, subject_ranks, subject_percentiles)
+    ]
+    term_values = ('average_score', 'rank', 'percentile', 'cohort_size')
+    subject_values = ('score', 'rank', 'percentile', 'cohort_size')
+    changed, stale_ids = changed_rank_rows(StudentTermRank, term_ranks, ('student_id',), term_values, term, year)
+    write_rank_rows(StudentTermRank, changed, stale_ids, ['student', 'term', 'year'], term_values)
+    changed, stale_ids = changed_rank_rows(
+        StudentSubjectRank, subject_rank_rows, ('student_id', 'subject_id'), subject_values, term, year
+    )
+    write_rank_rows(StudentSubjectRank, changed, stale_ids, ['student', 'subject', 'term', 'year'], subject_values)
+    return len(term_ranks)
+
+
+def refresh_rankings(cohorts):
+    """
+    Refresh the rank rows of every (term, year) cohort whose summaries changed.
+    Args:
+        - cohorts (iterable): (term, year) pairs.
+    Returns:
+        - int: number of cohorts refreshed.
+    """
+    cohorts = sorted({(term, year) for term, year in cohorts})
+    for term, year in cohorts:
+        refresh_cohort_ranks(term, year)
+    return len(cohorts)
@@ -0,0 +1,271 @@
+import os
+import logging
+import json
+import time
+import hashlib
+import itertools
+import multiprocessing
+from contextlib import ExitStack
+from decimal import Decimal
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import django
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from fpdf.fonts import FontFace
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.text import slugify
+from django.template.loader import render_to_string
+from core.logs.logger import logger
+from students.exports import export_rows
+from students.grading import grade_scores
+
+TEMPLATE_NAME = 'students/report_card.html'
+# bump when the template or the PDF layout changes so every card is rendered again
+RENDER_VERSION = '2'
+TWO_PLACES = Decimal('0.01')
+# fontTools logs every table it subsets at INFO, once per PDF
+logging.getLogger('fontTools').setLevel(logging.WARNING)
+
+
+def card_payloads(report_cards):
+    """
+    Group the joined report card and mark rows into one plain payload per report card.
+    Args:
+        - report_cards (QuerySet): filtered ReportCard queryset.
+    Returns:
+        - iterator of dicts ready to be pickled to a render worker.
+    """
+    for _, rows in itertools.groupby(export_rows(report_cards), key=lambda row: row[0]):
+        rows = list(rows)
+        card_id, _, student_name, student_email, term, year = rows[0][:6]
+        marks = [
+            {'subject_code': code, 'subject_name': name, 'score': str(score)}
+            for *_, code, name, score in rows
+            if code is not None
+        ]
+        total = sum((Decimal(mark['score']) for mark in marks), Decimal(0))
+        average = total / len(marks) if marks else Decimal(0)
+        yield {
+            'id': card_id,
+            'student_name': student_name,
+            'student_email': student_email,
+            'term': term,
+            'year': year,
+            'marks': marks,
+            'total': str(total.quantize(TWO_PLACES)),
+            'average': str(average.quantize(TWO_PLACES)),
+        }
+
+
+def content_hash(payload):
+    """
+    Hash everything printed on a report card, so unchanged cards keep their artifacts.
+    Args:
+        - payload (dict): a payload built by card_payloads.
+    Returns:
+        - str: hex sha256 digest.
+    """
+    encoded = json.dumps([RENDER_VERSION, payload], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def artifact_paths(payload, digest):
+    """
+    Locate the HTML and PDF artifacts of a report card under MEDIA_ROOT.
+    Args:
+        - payload (dict): a payload built by card_payloads.
+        - digest (str): content hash of the payload.
+    Returns:
+        - tuple: (html path, pdf path)
+    """
+    directory = Path(settings.MEDIA_ROOT) / 'report_cards' / str(payload['year']) / slugify(payload['term'])
+    stem = f"{payload['id']}-{digest[:16]}"
+    return directory / f"{stem}.html", directory / f"{stem}.pdf"
+
+
+def pdf_fonts():
+    """
+    The TrueType fonts embedded in the PDF, the first one is the main font and the others
+    fill in the glyphs it lacks, e.g. Devanagari names.
+    Returns:
+        - list: font file paths from REPORT_CARD_PDF_FONTS.
+    """
+    fonts = [font for font in settings.REPORT_CARD_PDF_FONTS if font]
+    missing = [font for font in fonts if not Path(font).is_file()]
+    if not fonts or missing:
+        raise ImproperlyConfigured(f"REPORT_CARD_PDF_FONTS has missing font files: {missing or 'none configured'}")
+    return fonts
+
+
+def render_pdf(payload):
+    """
+    Lay out a report card payload as an A4 PDF with embedded, shaped TrueType fonts.
+    Args:
+        - payload (dict): a payload built by card_payloads, with its grade.
+    Returns:
+        - bytes: the PDF document.
+    """
+    pdf = FPDF(format='A4')
+    families = []
+    for index, font in enumerate(pdf_fonts()):
+        family = f"font{index}"
+        pdf.add_font(family, fname=font)
+        families.append(family)
+    pdf.set_font(families[0], size=10)
+    pdf.set_fallback_fonts(families[1:])
+    # HarfBuzz shaping joins the conjuncts and vowel signs of scripts such as Devanagari
+    pdf.set_text_shaping(True)
+    pdf.add_page()
+
+    pdf.set_font_size(16)
+    pdf.cell(text='Report Card', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font_size(10)
+    pdf.ln(4)
+    pdf.cell(
+        text=f"Student: {payload['student_name']} ({payload['student_email']})",
+        new_x=XPos.LMARGIN, new_y=YPos.NEXT
+    )
+    pdf.cell(text=f"{payload['term']} {payload['year']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(4)
+    if payload['marks']:
+        # headings keep the regular style, only regular fonts are embedded
+        heading = FontFace(emphasis=None, fill_color=(230, 230, 230))
+        with pdf.table(col_widths=(3, 1, 1), text_align=('LEFT', 'LEFT', 'RIGHT'), headings_style=heading) as table:
+            table.row(('Subject', 'Code', 'Score'))
+            for mark in payload['marks']:
+                table.row((mark['subject_name'], mark['subject_code'], mark['score']))
+    else:
+        pdf.cell(text='No marks recorded.', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(4)
+    for label, key in (('Total', 'total'), ('Average', 'average'), ('Grade', 'grade')):
+        pdf.cell(w=40, text=label)
+        pdf.cell(text=str(payload[key]), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    return bytes(pdf.output())
+
+
+def write_file(path, content):
+    """
+    Write bytes next to the final path first so readers never see a half written artifact.
+    """
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+
+def render_artifacts(payload, digest):
+    """
+    Render the HTML and PDF of one report card and drop artifacts of older content.
+    Runs inside a worker process and never touches the database.
+    Args:
+        - payload (dict): a payload built by card_payloads, with its grade.
+        - digest (str): content hash of the payload.
+    Returns:
+        - tuple: the artifact paths written, as strings.
+    """
+    paths = html_path, pdf_path = artifact_paths(payload, digest)
+    html_path.parent.mkdir(parents=True, exist_ok=True)
+    write_file(html_path, render_to_string(TEMPLATE_NAME, {'card': payload}).encode())
+    write_file(pdf_path, render_pdf(payload))
+    for stale in html_path.parent.glob(f"{payload['id']}-*"):
+        if stale not in paths:
+            stale.unlink(missing_ok=True)
+    return tuple(str(path) for path in paths)
+
+
+def map_in_process(function, *iterables, chunksize=1):
+    # Executor.map signature, for rendering without a pool
+    return map(function, *iterables)
+
+
+def render_report_cards(report_cards, workers=None, chunk_size=None):
+    """
+    Render printable HTML and PDF report cards with a process pool, skipping unchanged cards.
+    Renders in the calling process with a single worker, or inside a daemonic process such as
+    a Celery prefork worker, which is not allowed to start a pool of its own.
+    Args:
+        - report_cards (QuerySet): filtered ReportCard queryset, e.g. one year and term.
+        - workers (int, optional): render processes, defaults to REPORT_CARD_RENDER_WORKERS.
+        - chunk_size (int, optional): report cards handed to the pool at a time.
+    Returns:
+        - dict: run report with rendered and skipped counts and elapsed seconds.
+    """
+    workers = workers or settings.REPORT_CARD_RENDER_WORKERS
+    chunk_size = chunk_size or settings.REPORT_CARD_RENDER_CHUNK_SIZE
+    started = time.monotonic()
+    report = {'rendered': 0, 'skipped': 0}
+    payloads = card_payloads(report_cards)
+    with ExitStack() as stack:
+        if workers > 1 and not multiprocessing.current_process().daemon:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers, initializer=django.setup))
+            render_map = executor.map
+        else:
+            workers = 1
+            render_map = map_in_process
+        while True:
+            chunk = list(itertools.islice(payloads, chunk_size))
+            if not chunk:
+                break
+            # grade the unrounded average like the term summaries, the exact total is printed unrounded
+            averages = [Decimal(payload['total']) / len(payload['marks']) if payload['marks'] else 0 for payload in chunk]
+            for payload, grade in zip(chunk, grade_scores(averages).tolist()):
+                payload['grade'] = grade
+            pending = []
+            for payload in chunk:
+                digest = content_hash(payload)
+                if all(path.exists() for path in artifact_paths(payload, digest)):
+                    report['skipped'] += 1
+                    continue
+                pending.append((payload, digest))
+            if pending:
+                payloads_to_render, digests = zip(*pending)
+                batch = max(1, len(pending) // (workers * 4))
+                for _ in render_map(render_artifacts, payloads_to_render, digests, chunksize=batch):
+                    report['rendered'] += 1
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"Report card rendering finished: {report['rendered']} rendered, "
+        f"{report['skipped']} unchanged ({report['elapsed_seconds']}s)"
+    )
+    return report
+
+
+def plan_render_chunks(report_cards, chunk_size=None):
+    """
+    Split the report cards into id ranges that Celery renders as separate tasks.
+    Args:
+        - report_cards (QuerySet): filtered ReportCard queryset, e.g. one year and term.
+        - chunk_size (int, optional): report cards per range, defaults to REPORT_CARD_RENDER_CHUNK_SIZE.
+    Returns:
+        - list: (first_id, last_id) ranges, both ends inclusive.
+    """
+    chunk_size = chunk_size or settings.REPORT_CARD_RENDER_CHUNK_SIZE
+    ids = list(report_cards.order_by('id').values_list('id', flat=True))
+    return [
+        (ids[index], ids[min(index + chunk_size, len(ids)) - 1])
+        for index in range(0, len(ids), chunk_size)
+    ]
+
+
+def merge_render_reports(reports, started_at):
+    """
+    Merge the chunk reports of a report card rendering run fanned out over Celery.
+    Args:
+        - reports (list): chunk reports returned by render_report_cards.
+        - started_at (float): unix timestamp taken when the chunks were dispatched.
+    Returns:
+        - dict: run report with totals, the slowest chunk and the total run time.
+    """
+    report = {
+        'chunks': len(reports),
+        'rendered': sum(chunk['rendered'] for chunk in reports),
+        'skipped': sum(chunk['skipped'] for chunk in reports),
+        'slowest_chunk_seconds': max((chunk['elapsed_seconds'] for chunk in reports), default=0),
+        'elapsed_seconds': round(time.time() - started_at, 3),
+    }
+    logger.info(
+        f"Report card rendering finished: {report['rendered']} rendered, {report['skipped']} unchanged "
+        f"in {report['chunks']} chunks ({report['elapsed_seconds']}s)"
+    )
+    return report
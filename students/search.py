@@ -0,0 +1,99 @@
+from django.db import connections
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'students_search'
+# the trigram tokenizer matches any substring of three or more characters
+TRIGRAM_LENGTH = 3
+# sorts after every character of the basic multilingual plane, closing a prefix range
+PREFIX_END = '\uffff'
+
+SEARCH_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE}
+    USING fts5(name, email, content='students', content_rowid='id', tokenize='trigram')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert AFTER INSERT ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete AFTER DELETE ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update AFTER UPDATE OF name, email ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+]
+
+
+def full_text_search_available(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def install_student_search(using='default', rebuild=False):
+    """
+    Create the FTS5 student index and the triggers that keep it in sync with the students table.
+    The triggers cover every write path, StudentView, the admin and bulk queries alike.
+    Args:
+        - using (str): database alias.
+        - rebuild (bool): rebuild the index from the students table even if it already exists.
+    Returns:
+        - bool: True when the index is available on this backend.
+    """
+    if not full_text_search_available(using):
+        return False
+    with connections[using].cursor() as cursor:
+        table_names = connections[using].introspection.table_names(cursor)
+        if 'students' not in table_names:
+            return False
+        created = SEARCH_TABLE not in table_names
+        for statement in SEARCH_SCHEMA:
+            cursor.execute(statement)
+        if created or rebuild:
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def is_prefix_search(query):
+    """
+    Whether a search is too short for the trigram index and only matches prefixes,
+    as typed in a type-ahead box.
+    """
+    return 0 < len(query.strip()) < TRIGRAM_LENGTH
+
+
+def prefix_range(field, query):
+    """
+    Match values of a case folded column starting with the query, as a range the column index can seek.
+    The query is folded by the database with the same function as the column.
+    """
+    return Q(**{f'{field}__gte': Lower(Value(query)), f'{field}__lt': Lower(Value(query + PREFIX_END))})
+
+
+def search_students(queryset, query):
+    """
+    Filter students whose name or email contains the query.
+    Uses the FTS5 trigram index on SQLite and falls back to icontains on other backends.
+    Args:
+        - queryset (QuerySet): Student queryset.
+        - query (str): search text typed by the user.
+    Returns:
+        - QuerySet: the matching students.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+    if not full_text_search_available(queryset.db):
+        return queryset.filter(Q(name__icontains=query) | Q(email__icontains=query))
+    if is_prefix_search(query):
+        # too short for a trigram, match the start of the name or email instead
+        return queryset.filter(prefix_range('name_folded', query) | prefix_range('email_folded', query))
+    phrase = '"' + query.replace('"', '""') + '"'
+    return queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [phrase]))
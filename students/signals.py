@@ -0,0 +1,67 @@
+from django.utils import timezone
+from django.dispatch import receiver
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, post_migrate
+from students.models import Student, ReportCard, Mark
+from students.caching import invalidate_report_cards
+from students.search import install_student_search
+from students.summaries import mark_term_summaries_dirty, mark_report_cards_dirty
+
+
+def deleted_with(origin, models):
+    """
+    Tell whether a delete signal was caused by deleting an instance or queryset of one of the models.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model in models
+    return isinstance(origin, models)
+
+
+@receiver(post_save, sender=ReportCard)
+def report_card_saved(sender, instance, **kwargs):
+    """
+    Mark the summary of a saved report card dirty, including its previous key if term or year changed.
+    """
+    key = (instance.student_id, instance.term, instance.year)
+    loaded_key = getattr(instance, '_loaded_summary_key', None)
+    mark_term_summaries_dirty([key, loaded_key] if loaded_key else [key])
+    instance._loaded_summary_key = key
+    invalidate_report_cards([instance.pk])
+
+
+@receiver(post_delete, sender=ReportCard)
+def report_card_deleted(sender, instance, **kwargs):
+    """
+    Mark the summary of a deleted report card dirty so the incremental run removes it, and drop its cached copy.
+    """
+    mark_term_summaries_dirty([(instance.student_id, instance.term, instance.year)])
+    invalidate_report_cards([instance.pk])
+
+
+@receiver(post_save, sender=Mark)
+@receiver(post_delete, sender=Mark)
+def mark_changed(sender, instance, signal, origin=None, **kwargs):
+    """
+    Mark the summary of the report card owning a saved or deleted mark dirty and drop its cached copy.
+    """
+    # marks removed by a report card or student cascade are covered by report_card_deleted
+    if deleted_with(origin, (ReportCard, Student)):
+        return
+    invalidate_report_cards([instance.report_card_id])
+    if signal is post_delete:
+        # a removed mark leaves no newer updated_date behind, so move the report card's Last-Modified
+        ReportCard.objects.filter(pk=instance.report_card_id).update(updated_date=timezone.now())
+    if Mark.report_card.is_cached(instance):
+        report_card = instance.report_card
+        mark_term_summaries_dirty([(report_card.student_id, report_card.term, report_card.year)])
+    else:
+        mark_report_cards_dirty([instance.report_card_id])
+
+
+@receiver(post_migrate)
+def student_search_installed(sender, using, **kwargs):
+    """
+    Create the student full-text index and its triggers once the students table exists.
+    """
+    if sender.name == 'students':
+        install_student_search(using)
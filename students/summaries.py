@@ -0,0 +1,428 @@
+import time
+from decimal import Decimal, Context
+from django.conf import settings
+from django.db import transaction
+from core.locks import write_lock
+from django.utils import timezone
+from django.db.models import Sum, Avg, Min, Max, Exists, OuterRef
+from core.logs.logger import logger
+from students.grading import grade_scores
+from students.rankings import refresh_rankings
+from students.models import ReportCard, StudentTermSummary, DirtyTermSummary
+
+TWO_PLACES = Decimal('0.01')
+# averages keep the 15 significant digits the database AVG returned to the API
+AVERAGE_CONTEXT = Context(prec=15)
+
+
+def calculate_grade(score):
+    """
+    calculate the grade of student according to the score
+    Args:
+        - score (student marks)
+    Returns:
+        garde of student
+    """
+    if score >= 90:
+        return 'A+'
+    elif score >= 80:
+        return 'A'
+    elif score >= 70:
+        return 'B'
+    elif score >= 60:
+        return 'C'
+    elif score >= 50:
+        return 'D'
+    else:
+        return 'F'
+
+
+def term_summary_rows(report_cards=None, chunk_size=None):
+    """
+    Stream total and average score for every (student, term, year) group.
+    Args:
+        - report_cards (QuerySet, optional): ReportCard queryset to restrict the groups.
+        - chunk_size (int, optional): rows fetched from the database cursor at a time.
+    Returns:
+        - iterator of dicts with student_id, term, year, total and average keys.
+    """
+    if report_cards is None:
+        report_cards = ReportCard.objects.all()
+    chunk_size = chunk_size or settings.TERM_SUMMARY_CHUNK_SIZE
+    rows = report_cards \
+        .filter(year__isnull=False) \
+        .values('student_id', 'term', 'year') \
+        .annotate(total=Sum('marks__score'), average=Avg('marks__score')) \
+        .order_by('student_id', 'year', 'term')
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def build_term_summaries(rows):
+    """
+    Build unsaved StudentTermSummary rows from aggregated rows, grading the whole batch at once.
+    The grade is given by the unrounded average, like calculate_grade, only the stored scores are rounded.
+    Args:
+        - rows (list): rows yielded by term_summary_rows.
+    Returns:
+        - list of StudentTermSummary instances.
+    """
+    totals = [Decimal(row['total'] or 0).quantize(TWO_PLACES) for row in rows]
+    grades = grade_scores([row['average'] or 0 for row in rows]).tolist()
+    averages = [Decimal(row['average'] or 0).quantize(TWO_PLACES) for row in rows]
+    return [
+        StudentTermSummary(
+            student_id=row['student_id'],
+            term=row['term'],
+            year=row['year'],
+            total_score=total,
+            average_score=average,
+            grade=grade,
+        )
+        for row, total, average, grade in zip(rows, totals, averages, grades)
+    ]
+
+
+def upsert_term_summaries(summaries):
+    """
+    Insert or update a batch of StudentTermSummary rows in a single statement.
+    Args:
+        - summaries (list): unsaved StudentTermSummary instances.
+    Returns:
+        - None
+    """
+    StudentTermSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['student', 'term', 'year'],
+        update_fields=['total_score', 'average_score', 'grade', 'calculated_date'],
+    )
+
+
+def write_term_summaries(report_cards=None, batch_size=None):
+    """
+    Recalculate and upsert StudentTermSummary rows for the given report cards.
+    The grouped query streams outside the write lock, each upsert batch takes the lock
+    and commits on its own so concurrent writers wait for one batch at most.
+    Args:
+        - report_cards (QuerySet, optional): ReportCard queryset to restrict the run.
+        - batch_size (int, optional): number of summaries written per upsert.
+    Returns:
+        - tuple: (number of summaries written, number of upsert batches, set of (term, year) cohorts)
+    """
+    batch_size = batch_size or settings.TERM_SUMMARY_BATCH_SIZE
+    summaries_count = 0
+    batches = 0
+    batch = []
+    cohorts = set()
+    for row in term_summary_rows(report_cards):
+        batch.append(row)
+        cohorts.add((row['term'], row['year']))
+        if len(batch) >= batch_size:
+            write_term_summary_batch(batch)
+            summaries_count += len(batch)
+            batches += 1
+            batch = []
+    if batch:
+        write_term_summary_batch(batch)
+        summaries_count += len(batch)
+        batches += 1
+    return summaries_count, batches, cohorts
+
+
+def write_term_summary_batch(rows):
+    """
+    Grade and upsert one batch of aggregated rows in its own short locked transaction.
+    """
+    summaries = build_term_summaries(rows)
+    with write_lock(), transaction.atomic():
+        upsert_term_summaries(summaries)
+
+
+def compute_term_summaries(report_cards=None, batch_size=None):
+    """
+    Recalculate StudentTermSummary rows with one grouped query and batched upserts.
+    Args:
+        - report_cards (QuerySet, optional): ReportCard queryset to restrict the run.
+        - batch_size (int, optional): number of summaries written per upsert.
+    Returns:
+        - dict: run report with the number of summaries, batches, ranked cohorts and elapsed seconds.
+    """
+    started = time.monotonic()
+    summaries_count, batches, cohorts = write_term_summaries(report_cards, batch_size)
+    report = {
+        'summaries': summaries_count,
+        'batches': batches,
+        'ranked_cohorts': refresh_rankings(cohorts),
+        'elapsed_seconds': round(time.monotonic() - started, 3),
+    }
+    logger.info(
+        f"StudentTermSummary run finished: {report['summaries']} summaries "
+        f"in {report['batches']} batches ({report['elapsed_seconds']}s)"
+    )
+    return report
+
+
+def plan_term_summary_shards(shard_size=None, concurrency=None):
+    """
+    Split the report cards into student id ranges spread over a number of shards.
+    Args:
+        - shard_size (int, optional): number of student ids covered by one range.
+        - concurrency (int, optional): maximum number of shards, ranges are dealt round-robin.
+    Returns:
+        - list: one list of (start_id, end_id) ranges per shard, end_id exclusive.
+    """
+    shard_size = shard_size or settings.TERM_SUMMARY_SHARD_SIZE
+    concurrency = concurrency or settings.TERM_SUMMARY_SHARD_CONCURRENCY
+    bounds = ReportCard.objects.aggregate(first=Min('student_id'), last=Max('student_id'))
+    if bounds['first'] is None:
+        return []
+    ranges = [
+        (start, min(start + shard_size, bounds['last'] + 1))
+        for start in range(bounds['first'], bounds['last'] + 1, shard_size)
+    ]
+    return [ranges[index::concurrency] for index in range(min(concurrency, len(ranges)))]
+
+
+def compute_term_summary_shard(ranges, batch_size=None):
+    """
+    Recalculate StudentTermSummary rows for the students of one shard.
+    Shards read outside the write lock and take it per upsert batch only, so concurrent
+    shards overlap their reads and grading and serialize on the short batch writes.
+    Args:
+        - ranges (list): (start_id, end_id) student id ranges, end_id exclusive.
+        - batch_size (int, optional): number of summaries written per upsert.
+    Returns:
+        - dict: shard report with the number of summaries, batches, touched cohorts and elapsed seconds.
+    """
+    started = time.monotonic()
+    report = {'summaries': 0, 'batches': 0}
+    cohorts = set()
+    for start_id, end_id in ranges:
+        report_cards = ReportCard.objects.filter(student_id__gte=start_id, student_id__lt=end_id)
+        summaries_count, batches, shard_cohorts = write_term_summaries(report_cards, batch_size)
+        report['summaries'] += summaries_count
+        report['batches'] += batches
+        cohorts |= shard_cohorts
+    # ranks need the whole cohort, so they are rebuilt once by the merge callback
+    report['cohorts'] = sorted(cohorts)
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    return report
+
+
+def merge_term_summary_reports(reports, started_at):
+    """
+    Merge the shard reports of a sharded StudentTermSummary run and rebuild the touched ranks.
+    Args:
+        - reports (list): shard reports returned by compute_term_summary_shard.
+        - started_at (float): unix timestamp taken when the shards were dispatched.
+    Returns:
+        - dict: run report with totals, the slowest shard and the total run time.
+    """
+    report = {
+        'shards': len(reports),
+        'summaries': sum(shard['summaries'] for shard in reports),
+        'batches': sum(shard['batches'] for shard in reports),
+        'ranked_cohorts': refresh_rankings(
+            (term, year) for shard in reports for term, year in shard['cohorts']
+        ),
+        'slowest_shard_seconds': max((shard['elapsed_seconds'] for shard in reports), default=0),
+        'elapsed_seconds': round(time.time() - started_at, 3),
+    }
+    logger.info(
+        f"Sharded StudentTermSummary run finished: {report['summaries']} summaries "
+        f"in {report['shards']} shards, slowest shard {report['slowest_shard_seconds']}s "
+        f"({report['elapsed_seconds']}s)"
+    )
+    return report
+
+
+def mark_term_summaries_dirty(keys):
+    """
+    Record (student_id, term, year) keys whose summaries must be recalculated.
+    Args:
+        - keys (iterable): (student_id, term, year) tuples, keys without a year are ignored.
+    Returns:
+        - None
+    """
+    dirty = [
+        DirtyTermSummary(student_id=student_id, term=term, year=year)
+        for student_id, term, year in set(keys)
+        if student_id is not None and year is not None
+    ]
+    if dirty:
+        DirtyTermSummary.objects.bulk_create(
+            dirty,
+            update_conflicts=True,
+            unique_fields=['student_id', 'term', 'year'],
+            update_fields=['marked_date'],
+        )
+
+
+def mark_report_cards_dirty(report_card_ids):
+    """
+    Record the summary keys of the given report cards as dirty.
+    Args:
+        - report_card_ids (iterable): ReportCard primary keys.
+    Returns:
+        - None
+    """
+    keys = ReportCard.objects \
+        .filter(pk__in=list(report_card_ids)) \
+        .values_list('student_id', 'term', 'year')
+    mark_term_summaries_dirty(keys)
+
+
+def matching_summary_key(queryset):
+    """
+    Filter a queryset to rows with the same (student_id, term, year) as the outer query.
+    Args:
+        - queryset (QuerySet): queryset of a model with student_id, term and year columns.
+    Returns:
+        - QuerySet usable inside Exists()
+    """
+    return queryset.filter(
+        student_id=OuterRef('student_id'),
+        term=OuterRef('term'),
+        year=OuterRef('year'),
+    )
+
+
+def delete_claimed_keys(claimed, batch_size):
+    """
+    Delete the claimed dirty keys that were not marked again since they were claimed.
+    Runs under the write lock, so no key is re-marked between reading and deleting a batch.
+    Args:
+        - claimed (list): (id, marked_date, term, year) rows read when the run started.
+        - batch_size (int): number of keys compared per query.
+    Returns:
+        - int: number of keys deleted.
+    """
+    deleted = 0
+    for index in range(0, len(claimed), batch_size):
+        batch = {key_id: marked_date for key_id, marked_date, _, _ in claimed[index:index + batch_size]}
+        current = DirtyTermSummary.objects.filter(id__in=list(batch)).values_list('id', 'marked_date')
+        unchanged = [key_id for key_id, marked_date in current if batch[key_id] == marked_date]
+        if unchanged:
+            deleted += DirtyTermSummary.objects.filter(id__in=unchanged).delete()[0]
+    return deleted
+
+
+def compute_dirty_term_summaries(batch_size=None):
+    """
+    Recalculate only the StudentTermSummary rows recorded as dirty since the last run.
+    Args:
+        - batch_size (int, optional): number of summaries written per upsert.
+    Returns:
+        - dict: run report with the number of dirty keys, summaries, removed summaries, ranked cohorts
+        and elapsed seconds.
+    """
+    started = time.monotonic()
+    batch_size = batch_size or settings.TERM_SUMMARY_BATCH_SIZE
+    run_started = timezone.now()
+    report = {'dirty': 0, 'summaries': 0, 'batches': 0, 'removed': 0, 'ranked_cohorts': 0}
+    # the claim is read once, later writes re-mark a key with a new marked_date and never change this list
+    claimed = list(
+        DirtyTermSummary.objects
+        .filter(marked_date__lte=run_started)
+        .order_by('id')
+        .values_list('id', 'marked_date', 'term', 'year')
+    )
+    if claimed:
+        # keys added while this run is in progress get higher ids and are left to the next run
+        is_dirty = Exists(matching_summary_key(DirtyTermSummary.objects.filter(id__lte=claimed[-1][0])))
+        cohorts = {(term, year) for _, _, term, year in claimed}
+        # every upsert batch commits on its own, a run that fails keeps its claim and is redone
+        report['summaries'], report['batches'], _ = write_term_summaries(
+            ReportCard.objects.filter(is_dirty), batch_size
+        )
+        with write_lock(), transaction.atomic():
+            report['removed'], _ = StudentTermSummary.objects \
+                .filter(is_dirty) \
+                .exclude(Exists(matching_summary_key(ReportCard.objects.all()))) \
+                .delete()
+            report['dirty'] = delete_claimed_keys(claimed, batch_size)
+        # ranks read the committed summaries and write in their own short batches
+        report['ranked_cohorts'] = refresh_rankings(cohorts)
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"Incremental StudentTermSummary run finished: {report['dirty']} dirty keys, "
+        f"{report['summaries']} summaries, {report['removed']} removed ({report['elapsed_seconds']}s)"
+    )
+    return report
+
+
+def yearly_report_rows(student_id, year):
+    """
+    Query the joined report card and mark rows of a student's year, one row per mark.
+    """
+    return ReportCard.objects \
+        .filter(student_id=student_id, year=year) \
+        .order_by('term', 'id', 'marks__subject__name') \
+        .values_list(
+            'id', 'student_id', 'year', 'term', 'updated_date',
+            'marks__id', 'marks__subject_id', 'marks__score', 'marks__updated_date',
+        )
+
+
+def yearly_report(student_id, year):
+    """
+    Build a student's report cards for a year with per-subject and overall averages from one fetch.
+    The joined card and mark rows are read once and aggregated in a single pass.
+    Args:
+        - student_id (int): primary key of the student.
+        - year (int): academic year.
+    Returns:
+        - tuple: (report cards in ReportCardSerializer shape, summary dict, validator stats)
+    """
+    return build_yearly_report(yearly_report_rows(student_id, year))
+
+
+async def ayearly_report(student_id, year):
+    """
+    Async version of yearly_report for the ASGI views.
+    """
+    return build_yearly_report([row async for row in yearly_report_rows(student_id, year)])
+
+
+def build_yearly_report(rows):
+    """
+    Aggregate the rows of yearly_report_rows in a single pass.
+    Args:
+        - rows (iterable): tuples in the yearly_report_rows column order.
+    Returns:
+        - tuple: (report cards, summary dict, validator stats)
+    """
+    report_cards = {}
+    subjects = {}
+    total, count = Decimal(0), 0
+    stats = {'card_count': 0, 'mark_count': 0, 'card_modified': None, 'mark_modified': None}
+    for card_id, student, card_year, term, card_modified, mark_id, subject_id, score, mark_modified in rows:
+        if card_id not in report_cards:
+            report_cards[card_id] = {'id': card_id, 'student': student, 'year': card_year, 'term': term, 'marks': []}
+            stats['card_count'] += 1
+            stats['card_modified'] = max(filter(None, [stats['card_modified'], card_modified]))
+        subject_total = subjects.setdefault(subject_id, [Decimal(0), 0])
+        if mark_id is None:
+            continue
+        report_cards[card_id]['marks'].append({'id': mark_id, 'subject': subject_id, 'score': f"{score.quantize(TWO_PLACES):f}"})
+        subject_total[0] += score
+        subject_total[1] += 1
+        total += score
+        count += 1
+        stats['mark_count'] += 1
+        stats['mark_modified'] = max(filter(None, [stats['mark_modified'], mark_modified]))
+    # a report card without marks shows up as a null subject, as the LEFT JOIN aggregate did
+    average_per_subject = [
+        {
+            'marks__subject': subject_id,
+            'avg_score': AVERAGE_CONTEXT.divide(subject_sum, subject_count) if subject_count else None,
+        }
+        for subject_id, (subject_sum, subject_count) in sorted(
+            subjects.items(), key=lambda item: (item[0] is not None, item[0] or 0)
+        )
+    ]
+    summary = {
+        'average_per_subject': average_per_subject,
+        'overall_average': AVERAGE_CONTEXT.divide(total, count) if count else None,
+    }
+    return list(report_cards.values()), summary, stats
@@ -1,56 +1,125 @@
-from celery import shared_task
-from core.logs.logger import logger
-from django.db.models import Sum, Avg
+import time
+from celery import chord, shared_task
+from django.utils import timezone
+from core.routers import use_replicas
 from students.models import ReportCard
-from students.models import StudentTermSummary, Mark
+from students.rendering import render_report_cards, plan_render_chunks, merge_render_reports
+from students.summaries import (
+    calculate_grade,
+    compute_term_summaries,
+    compute_dirty_term_summaries,
+    plan_term_summary_shards,
+    compute_term_summary_shard,
+    merge_term_summary_reports,
+)
 
-def calculate_grade(score):
+
+@shared_task
+def calculate_student_term_summaries():
     """
-    calculate the grade of student according to the score
+    calculate the student terms summaries, split into student id shards when
+    TERM_SUMMARY_SHARD_CONCURRENCY is greater than one
     Args:
-        - score (student marks)
-    Returns:
-        garde of student
-    """
-    if score >= 90:
-        return 'A+'
-    elif score >= 80:
-        return 'A'
-    elif score >= 70:
-        return 'B'
-    elif score >= 60:
-        return 'C'
-    elif score >= 50:
-        return 'D'
-    else:
-        return 'F'
+        -
+    Return: run report of the summaries written into StudentTermSummary models,
+    or the shard count and callback id when the run was dispatched as a chord
+    """
+    shards = plan_term_summary_shards()
+    if len(shards) <= 1:
+        return compute_term_summaries()
+    callback = chord(
+        calculate_term_summary_shard.s(ranges) for ranges in shards
+    )(merge_term_summary_shards.s(time.time()))
+    return {'shards': len(shards), 'callback_id': callback.id}
 
 
 @shared_task
-def calculate_student_term_summaries():
+def calculate_term_summary_shard(ranges):
+    """
+    calculate the student terms summaries for one shard of student id ranges
+    Args:
+        - ranges (list of [start_id, end_id])
+    Return: shard report
+    """
+    return compute_term_summary_shard(ranges)
+
+
+@shared_task
+def merge_term_summary_shards(reports, started_at):
+    """
+    merge the shard reports of a sharded term summary run
+    Args:
+        - reports (list of shard reports)
+        - started_at (unix timestamp of the dispatch)
+    Return: run report of the whole sharded run
+    """
+    return merge_term_summary_reports(reports, started_at)
+
+
+@shared_task
+def calculate_dirty_term_summaries():
     """
-    calculate the student terms summaries
+    calculate the student terms summaries changed since the last run
     Args:
         -
-    Return: create calculated data into StudentTermSummary models
-    """
-    report_cards = ReportCard.objects.all().select_related('student')
-    for rc in report_cards:
-        marks = Mark.objects.filter(report_card=rc)
-        total = marks.aggregate(total=Sum('score'))['total'] or 0
-        average = marks.aggregate(avg=Avg('score'))['avg'] or 0
-        grade = calculate_grade(average)
-        obj, created = StudentTermSummary.objects.update_or_create(
-            student=rc.student,
-            term=rc.term,
-            year=rc.year,
-            defaults={
-                'total_score': total,
-                'average_score': average,
-                'grade': grade,
-            }
-        )
-        if created:
-            logger.info(f"Created StudentTermSummary for {rc.student.name}, {rc.term} {rc.year}")
-        else:
-            logger.info(f"Updated StudentTermSummary for {rc.student.name}, {rc.term} {rc.year}")
\ No newline at end of file
+    Return: run report of the dirty summaries recalculated into StudentTermSummary models
+    """
+    return compute_dirty_term_summaries()
+
+
+# summary and rank tasks write rows derived from what they read, so they read the primary,
+# only read-only work such as rendering is sent to the replicas
+@shared_task
+@use_replicas()
+def render_term_report_cards(year=None, term=None):
+    """
+    render printable HTML and PDF report cards of a year, optionally one term, split into
+    report card id chunks rendered by separate tasks, as a prefork worker cannot start a process pool
+    Args:
+        - year (defaults to the current year)
+        - term (optional)
+    Return: run report with rendered and unchanged report card counts,
+    or the chunk count and callback id when the run was dispatched as a chord
+    """
+    year = year or timezone.now().year
+    chunks = plan_render_chunks(term_report_cards(year, term))
+    if len(chunks) <= 1:
+        return render_report_cards(term_report_cards(year, term), workers=1)
+    callback = chord(
+        render_report_card_chunk.s(year, term, first_id, last_id) for first_id, last_id in chunks
+    )(merge_report_card_renders.s(time.time()))
+    return {'chunks': len(chunks), 'callback_id': callback.id}
+
+
+@shared_task
+@use_replicas()
+def render_report_card_chunk(year, term, first_id, last_id):
+    """
+    render the report cards of one id chunk of a year and term
+    Args:
+        - year
+        - term (optional)
+        - first_id, last_id (inclusive report card id range)
+    Return: chunk report
+    """
+    report_cards = term_report_cards(year, term).filter(id__gte=first_id, id__lte=last_id)
+    return render_report_cards(report_cards, workers=1)
+
+
+@shared_task
+def merge_report_card_renders(reports, started_at):
+    """
+    merge the chunk reports of a report card rendering run
+    Args:
+        - reports (list of chunk reports)
+        - started_at (unix timestamp of the dispatch)
+    Return: run report of the whole rendering run
+    """
+    return merge_render_reports(reports, started_at)
+
+
+def term_report_cards(year, term=None):
+    report_cards = ReportCard.objects.filter(year=year)
+    if term:
+        report_cards = report_cards.filter(term=term)
+    return report_cards
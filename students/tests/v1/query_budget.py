@@ -0,0 +1,43 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from students.caching import report_card_cache
+
+
+class QueryBudgetMixin:
+    """
+    Mixin for TestCase classes that pins how many queries an endpoint may run.
+    Args:
+        - used next to TestCase
+    Returns:
+        - None
+    Helpers:
+        - assertQueryBudget: the call runs at most budget queries
+        - assertQueriesConstant: the query count does not grow with the rows returned
+    """
+    def count_queries(self, call):
+        # measure the database work, not the read-through cache
+        report_card_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = call()
+        return response, queries.captured_queries
+
+    def assertQueryBudget(self, call, budget):
+        response, queries = self.count_queries(call)
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{len(queries)} queries over a budget of {budget}:\n" + "\n".join(query['sql'] for query in queries)
+        )
+        return response
+
+    def assertQueriesConstant(self, small_call, large_call, budget=None):
+        """
+        Run the endpoint for a small and a large result and fail when the query count differs.
+        """
+        _, small = self.count_queries(small_call)
+        _, large = self.count_queries(large_call)
+        self.assertEqual(
+            len(small), len(large),
+            "Query count grows with the result size:\n" + "\n".join(query['sql'] for query in large)
+        )
+        if budget is not None:
+            self.assertLessEqual(len(large), budget, "\n".join(query['sql'] for query in large))
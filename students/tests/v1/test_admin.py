@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark
+from students.tests.v1.query_budget import QueryBudgetMixin
+
+
+class AdminPerformanceModeTest(QueryBudgetMixin, TestCase):
+    """
+    This class tests the performance mode of the students admin changelists.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - The mark changelist runs the same queries for 5 and 50 rows
+        - Counts past ADMIN_EXACT_COUNT_LIMIT are estimated
+        - Search matches indexed name prefixes and exact years
+        - With the mode off, the regular search and list filters apply
+        - Foreign keys are edited as raw ids in performance mode only
+    """
+    url = '/admin/students/mark/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser(email='admin@example.com', username='admin', password='pass'))
+        self.subjects = [Subject.objects.create(name=f"Subject {index}", code=f"SUB{index}") for index in range(5)]
+        self.add_report_cards(range(10))
+
+    def add_report_cards(self, indexes):
+        for index in indexes:
+            student = Student.objects.create(name=f"Student {index}", email=f"student{index}@example.com", date_of_birth=date(2005, 1, 1))
+            report_card = ReportCard.objects.create(student=student, term="Term 1", year=2020 + index)
+            Mark.objects.bulk_create([Mark(report_card=report_card, subject=subject, score=Decimal(70)) for subject in self.subjects])
+
+    def test_changelist_queries_constant(self):
+        _, small = self.count_queries(lambda: self.client.get(self.url))
+        self.add_report_cards(range(10, 30))
+        _, large = self.count_queries(lambda: self.client.get(self.url))
+        self.assertEqual(len(small), len(large), "\n".join(query['sql'] for query in large))
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=20)
+    def test_estimated_count(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 50)
+        self.assertTrue(response.context['cl'].paginator.estimated)
+        self.assertIsNone(response.context['cl'].full_result_count)
+        response = self.client.get(self.url, {'subject__id__exact': self.subjects[0].id})
+        self.assertEqual(response.context['cl'].result_count, 10)
+        self.assertFalse(response.context['cl'].paginator.estimated)
+        response = self.client.get(self.url, {'q': 'Student'})
+        self.assertEqual(response.context['cl'].result_count, 20)
+        self.assertTrue(response.context['cl'].paginator.estimated)
+
+    def test_prefix_search(self):
+        response = self.client.get(self.url, {'q': 'student 3'})
+        self.assertEqual(response.context['cl'].result_count, 5)
+        response = self.client.get(self.url, {'q': 'tudent'})
+        self.assertEqual(response.context['cl'].result_count, 0)
+        response = self.client.get('/admin/students/reportcard/', {'q': '2024'})
+        self.assertEqual([card.year for card in response.context['cl'].result_list], [2024])
+
+    @override_settings(ADMIN_PERFORMANCE_MODE=False)
+    def test_performance_mode_off(self):
+        response = self.client.get(self.url, {'q': 'student'})
+        self.assertEqual(response.context['cl'].result_count, 50)
+        self.assertEqual(response.context['cl'].full_result_count, 50)
+        # the regular search matches inside names and keeps the date filters
+        response = self.client.get(self.url, {'q': 'tudent 7'})
+        self.assertEqual(response.context['cl'].result_count, 5)
+        self.assertIn('created_date', response.context['cl'].list_filter)
+
+    def test_raw_id_fields(self):
+        mark = Mark.objects.first()
+        url = f'/admin/students/mark/{mark.id}/change/'
+        widget = self.client.get(url).context['adminform'].form.fields['report_card'].widget
+        self.assertEqual(type(widget).__name__, 'ForeignKeyRawIdWidget')
+        with override_settings(ADMIN_PERFORMANCE_MODE=False):
+            widget = self.client.get(url).context['adminform'].form.fields['report_card'].widget
+            self.assertEqual(type(widget.widget).__name__, 'Select')
@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import User
+from students.caching import report_card_cache
+from students.models import Student, Subject, ReportCard, Mark
+
+
+class AsyncReadViewTest(TestCase):
+    """
+    This class tests that the async read endpoints answer exactly like the sync ViewSets.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Student, subject, report card retrieve, list and yearly summary bodies match the sync views
+        - Requests without a valid JWT are rejected the same way
+        - Conditional GET answers 304
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        user = User.objects.create_user(email='admin@example.com', username='admin', password='pass', is_active=True)
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        math = Subject.objects.create(name="Mathematics", code="MATH101")
+        science = Subject.objects.create(name="Science", code="SCI101")
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        for term in ("Term 1", "Term 2", "Term 3"):
+            self.report_card = ReportCard.objects.create(student=self.student, term=term, year=2025)
+            Mark.objects.create(report_card=self.report_card, subject=math, score=Decimal('80.5'))
+            Mark.objects.create(report_card=self.report_card, subject=science, score=Decimal('71'))
+        self.subject = math
+
+    def assertSameResponse(self, path, query=''):
+        sync = self.client.get(f'/apis/v1/{path}{query}', **self.auth)
+        asynchronous = self.client.get(f'/apis/v1/async/{path}{query}', **self.auth)
+        self.assertIn(sync.status_code, (200, 400, 404), sync.content)
+        self.assertEqual(asynchronous.status_code, sync.status_code)
+        self.assertEqual(asynchronous['Content-Type'], 'application/json')
+        sync_body, async_body = sync.json(), asynchronous.json()
+        for body in (sync_body, async_body):
+            # links point at their own endpoint
+            if body.get('next'):
+                body['next'] = body['next'].replace('/async/', '/')
+        self.assertEqual(async_body, sync_body)
+        return asynchronous
+
+    def test_same_responses(self):
+        self.assertSameResponse(f'student/{self.student.id}/')
+        self.assertSameResponse(f'subject/{self.subject.id}/')
+        self.assertSameResponse(f'reportcard/{self.report_card.id}/')
+        self.assertSameResponse('reportcard/', '?page_size=2')
+        self.assertSameResponse('reportcard/', '?pagination=cursor&page_size=2')
+        self.assertSameResponse('reportcard/', f'?student={self.student.id}&term=Term+2')
+        self.assertSameResponse(f'reportcard/student/{self.student.id}/year/2025/')
+        self.assertSameResponse('reportcard/student/999/year/2025/')
+        response = self.assertSameResponse('reportcard/', '?student=999')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['student'])
+
+    def test_authentication(self):
+        url = f'/apis/v1/async/reportcard/{self.report_card.id}/'
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer invalid'}):
+            sync = self.client.get(f'/apis/v1/reportcard/{self.report_card.id}/', **headers)
+            response = self.client.get(url, **headers)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.json(), sync.json())
+            self.assertEqual(response['WWW-Authenticate'], sync['WWW-Authenticate'])
+        self.assertEqual(self.client.post(url, **self.auth).status_code, 405)
+
+    def test_not_modified(self):
+        url = f'/apis/v1/async/reportcard/{self.report_card.id}/'
+        response = self.client.get(url, **self.auth)
+        self.assertEqual(response.status_code, 200, response.content)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'], **self.auth)
+        self.assertEqual(response.status_code, 304)
+        etag = self.client.get(f'/apis/v1/student/{self.student.id}/', **self.auth)['ETag']
+        response = self.client.get(f'/apis/v1/async/student/{self.student.id}/', HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,69 @@
+from datetime import date
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark, DirtyTermSummary
+from students.tests.v1.query_budget import QueryBudgetMixin
+
+
+class BulkReportCardCreateTest(QueryBudgetMixin, TestCase):
+    """
+    This class tests the bulk report card create endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - A class of report cards is created with a fixed number of queries
+        - Any invalid item stops the whole batch unless partial is set
+        - Partial mode creates the valid items and reports the rest
+    """
+    url = '/apis/v1/reportcard/bulk/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.subjects = [Subject.objects.create(name=f"Subject {index}", code=f"SUB{index}") for index in range(12)]
+        self.students = [
+            Student.objects.create(name="Student", email=f"student{index}@example.com", date_of_birth=date(2005, 1, 1))
+            for index in range(40)
+        ]
+
+    def item(self, student_id, term="Term 1"):
+        return {
+            'student': student_id,
+            'term': term,
+            'year': 2025,
+            'marks': [{'subject': subject.id, 'score': '75.50'} for subject in self.subjects],
+        }
+
+    def test_create_class(self):
+        payload = {'report_cards': [self.item(student.id) for student in self.students]}
+        # sqlite splits the 480 mark insert into statements of at most 999 parameters
+        response = self.assertQueryBudget(lambda: self.client.post(self.url, payload, format='json'), 10)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ReportCard.objects.count(), 40)
+        self.assertEqual(Mark.objects.count(), 480)
+        self.assertEqual(DirtyTermSummary.objects.count(), 40)
+        first = response.data['data'][0]
+        self.assertEqual(first['data']['student'], self.students[0].id)
+        self.assertEqual(len(first['data']['marks']), 12)
+
+    def test_invalid_item_stops_batch(self):
+        ReportCard.objects.create(student=self.students[0], term="Term 1", year=2025)
+        payload = {'report_cards': [self.item(self.students[0].id), self.item(self.students[1].id), self.item(0)]}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ReportCard.objects.count(), 1)
+        self.assertIn('non_field_errors', response.data['data'][0]['errors'])
+        self.assertIn('student', response.data['data'][2]['errors'])
+
+    def test_partial_mode(self):
+        payload = {
+            'partial': True,
+            'report_cards': [self.item(self.students[0].id), self.item(self.students[0].id), {'student': 'x'}],
+        }
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['success'] for result in response.data['data']], [True, False, False])
+        self.assertEqual(ReportCard.objects.count(), 1)
@@ -0,0 +1,141 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.caching import report_card_cache, cache_stats
+from students.models import Student, Subject, ReportCard, Mark
+
+
+class ReportCardCacheTest(TestCase):
+    """
+    This class tests the read-through cache of the report card retrieve and list endpoints.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - A repeated retrieve is served from the cache without queries
+        - Updating marks invalidates the cached report card and list pages
+        - Deleting a mark through the ORM invalidates the cached report card
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.science = Subject.objects.create(name="Science", code="SCI101")
+        student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        self.report_card = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+        self.mark = Mark.objects.create(report_card=self.report_card, subject=self.math, score=Decimal('80'))
+
+    def test_retrieve_served_from_cache(self):
+        url = f'/apis/v1/reportcard/{self.report_card.id}/'
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats(), {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_update_marks_invalidates(self):
+        detail_url = f'/apis/v1/reportcard/{self.report_card.id}/'
+        self.client.get(detail_url)
+        self.client.get('/apis/v1/reportcard/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/apis/v1/reportcard/{self.report_card.id}/update-marks/',
+                {'marks': [{'subject': self.science.id, 'score': 70}]},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        detail = self.client.get(detail_url)
+        self.assertEqual(len(detail.data['data']['marks']), 2)
+        page = self.client.get('/apis/v1/reportcard/')
+        self.assertEqual(len(page.data['results']['data'][0]['marks']), 2)
+
+    def test_mark_delete_invalidates(self):
+        url = f'/apis/v1/reportcard/{self.report_card.id}/'
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mark.delete()
+        self.assertEqual(self.client.get(url).data['data']['marks'], [])
+
+
+class ConditionalGetTest(TestCase):
+    """
+    This class tests the ETag and Last-Modified validators of the report card and student read endpoints.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - retrieve, list and the yearly summary answer a matching If-None-Match with 304
+        - student retrieve and list answer a matching If-None-Match with 304
+        - If-Modified-Since at the Last-Modified time gives 304
+        - Changing a mark changes the ETag
+        - A list page's ETag covers its own cards and the total count only
+        - Updating a student changes the ETag of the student and of its list page
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        self.report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2025)
+        self.mark = Mark.objects.create(report_card=self.report_card, subject=self.math, score=Decimal('80'))
+
+    def test_not_modified(self):
+        for url in [
+            f'/apis/v1/reportcard/{self.report_card.id}/',
+            '/apis/v1/reportcard/?year=2025',
+            f'/apis/v1/reportcard/student/{self.student.id}/year/2025/',
+            f'/apis/v1/student/{self.student.id}/',
+            '/apis/v1/student/?search=stu',
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('ETag', response)
+            repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(repeat.status_code, 304)
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(since.status_code, 304)
+
+    def test_etag_changes_with_marks(self):
+        url = f'/apis/v1/reportcard/{self.report_card.id}/'
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mark.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_page_etag_covers_the_page(self):
+        url = '/apis/v1/reportcard/?year=2025&page_size=1'
+        etag = self.client.get(url)['ETag']
+        student = Student.objects.create(name="Student 2", email="student2@example.com", date_of_birth=date(2005, 1, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            other = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+        # the new card is on page 2, only the total count on page 1 changed
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Mark.objects.create(report_card=other, subject=self.math, score=Decimal('70'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_student_etag_changes_with_student(self):
+        urls = [f'/apis/v1/student/{self.student.id}/', '/apis/v1/student/']
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        response = self.client.put(urls[0], {
+            'name': "Student Renamed", 'email': "student@example.com", 'date_of_birth': "2005-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+        # a new student joins the list page
+        Student.objects.create(name="Student 2", email="student2@example.com", date_of_birth=date(2005, 1, 1))
+        self.assertEqual(self.client.get(urls[1], HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
@@ -0,0 +1,221 @@
+import random
+import tempfile
+import threading
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from django.apps import apps
+from django.db.models import Sum
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.utils import load_backend
+from django.test import TestCase, override_settings
+from core.locks import write_lock, WriteLockTimeout
+from students.models import Student, Subject, ReportCard, Mark, StudentTermSummary, StudentTermRank
+from students.summaries import compute_term_summaries, compute_dirty_term_summaries
+
+ALIAS = 'sqlite_stress'
+
+
+class SQLiteConcurrencyTest(TestCase):
+    """
+    This class stress tests the SQLite connection profile with concurrent readers and writers
+    sharing one database file, like gunicorn and the Celery worker do.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Every connection runs in WAL mode with the busy timeout
+        - Readers, short writers and long write batches run together without "database is locked"
+        - Mark writers run alongside the full and incremental summary runs without "database is locked"
+        - The write lock gives up after its timeout
+    """
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'stress.sqlite3'
+        settings_override = override_settings(SQLITE_WRITE_LOCK_FILE=str(Path(directory.name) / 'stress.lock'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        with self.connection() as cursor:
+            cursor.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY, worker TEXT, value INTEGER)")
+
+    def connection(self):
+        """
+        Open a connection to the stress database with the profile of the default database, for this thread.
+        """
+        settings_dict = connections.configure_settings({
+            'default': {**connections.settings['default'], 'NAME': str(self.path)},
+        })['default']
+        wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, ALIAS)
+        connections[ALIAS] = wrapper
+        return wrapper.cursor()
+
+    def use_stress_database(self):
+        """
+        Point the default alias of this thread at the stress database, so the ORM and the
+        summary runs use it the way a worker process uses the real database file.
+        """
+        settings_dict = connections.configure_settings({
+            'default': {**connections.settings['default'], 'NAME': str(self.path)},
+        })['default']
+        connections[DEFAULT_DB_ALIAS] = load_backend(settings_dict['ENGINE']).DatabaseWrapper(
+            settings_dict, DEFAULT_DB_ALIAS
+        )
+
+    def in_stress_database(self, worker):
+        def run():
+            self.use_stress_database()
+            try:
+                worker()
+            finally:
+                connections[DEFAULT_DB_ALIAS].close()
+        return run
+
+    def create_school(self):
+        with connections[DEFAULT_DB_ALIAS].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+        subjects = Subject.objects.bulk_create(
+            Subject(name=f"Subject {index}", code=f"SUB{index}") for index in range(4)
+        )
+        students = Student.objects.bulk_create(
+            Student(name=f"Student {index}", email=f"student{index}@example.com", date_of_birth=date(2005, 1, 1))
+            for index in range(60)
+        )
+        report_cards = ReportCard.objects.bulk_create(
+            ReportCard(student=student, term=term, year=2025)
+            for student in students for term in ("Term 1", "Term 2")
+        )
+        Mark.objects.bulk_create(
+            Mark(report_card=report_card, subject=subject, score=Decimal(50 + (report_card.id + subject.id) % 50))
+            for report_card in report_cards for subject in subjects
+        )
+
+    def run_threads(self, workers):
+        errors = []
+
+        def run(worker):
+            try:
+                self.connection().close()
+                worker()
+            except Exception as e:
+                errors.append(repr(e))
+            finally:
+                connections[ALIAS].close()
+
+        threads = [threading.Thread(target=run, args=(worker,)) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_connection_profile(self):
+        with self.connection() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 20000)
+        connections[ALIAS].close()
+
+    def test_concurrent_readers_and_writers(self):
+        def short_writer():
+            for value in range(100):
+                # read then write in one transaction, the case that deadlocks deferred transactions
+                with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*) FROM entries")
+                    cursor.execute("INSERT INTO entries (worker, value) VALUES ('short', %s)", [value])
+
+        def batch_writer():
+            for _ in range(5):
+                with write_lock(using=ALIAS), transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+                    cursor.executemany(
+                        "INSERT INTO entries (worker, value) VALUES ('batch', %s)", [[value] for value in range(2000)]
+                    )
+
+        def reader():
+            for _ in range(200):
+                with connections[ALIAS].cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*), MAX(value) FROM entries")
+                    cursor.fetchone()
+
+        errors = self.run_threads([short_writer] * 4 + [batch_writer] * 2 + [reader] * 4)
+        self.assertEqual(errors, [])
+        with self.connection() as cursor:
+            cursor.execute("SELECT worker, COUNT(*) FROM entries GROUP BY worker ORDER BY worker")
+            self.assertEqual(cursor.fetchall(), [('batch', 20000), ('short', 400)])
+        connections[ALIAS].close()
+
+    def test_summary_runs_alongside_writers(self):
+        self.assertEqual(self.run_threads([self.in_stress_database(self.create_school)]), [])
+
+        writers = 3
+        writers_done = threading.Event()
+        finished_writing = threading.Barrier(writers, action=writers_done.set)
+
+        def mark_writer():
+            mark_ids = list(Mark.objects.values_list('id', flat=True))
+            try:
+                for _ in range(40):
+                    with transaction.atomic():
+                        mark = Mark.objects.select_related('report_card').get(id=random.choice(mark_ids))
+                        mark.score = Decimal(random.randint(0, 100))
+                        mark.save()
+            finally:
+                finished_writing.wait()
+
+        def full_run():
+            while not writers_done.is_set():
+                compute_term_summaries(batch_size=10)
+
+        def dirty_run():
+            while not writers_done.is_set():
+                compute_dirty_term_summaries(batch_size=10)
+
+        def reader():
+            for _ in range(100):
+                list(StudentTermSummary.objects.order_by('-average_score')[:10])
+                StudentTermRank.objects.filter(rank=1).count()
+
+        workers = [mark_writer] * writers + [full_run, dirty_run] + [reader] * 2
+        errors = self.run_threads([self.in_stress_database(worker) for worker in workers])
+        self.assertEqual(errors, [])
+
+        def check():
+            compute_dirty_term_summaries()
+            totals = dict(
+                ReportCard.objects.filter(term="Term 1").values_list('student_id').annotate(total=Sum('marks__score'))
+            )
+            summaries = dict(
+                StudentTermSummary.objects.filter(term="Term 1").values_list('student_id', 'total_score')
+            )
+            self.assertEqual(summaries, totals)
+            self.assertEqual(StudentTermRank.objects.filter(term="Term 1").count(), 60)
+
+        self.assertEqual(self.run_threads([self.in_stress_database(check)]), [])
+
+    def test_write_lock_timeout(self):
+        self.connection().close()
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            self.connection().close()
+            with write_lock(using=ALIAS):
+                held.set()
+                release.wait(5)
+            connections[ALIAS].close()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait(5)
+        try:
+            with self.assertRaises(WriteLockTimeout):
+                with write_lock(using=ALIAS, timeout=0.2):
+                    pass
+        finally:
+            release.set()
+            thread.join()
+        with write_lock(using=ALIAS, timeout=1):
+            pass
+        connections[ALIAS].close()
@@ -0,0 +1,55 @@
+import json
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark
+
+
+class ReportCardExportTest(TestCase):
+    """
+    This class tests the streaming report card export endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - CSV export streams one row per mark with a header
+        - NDJSON export honours the ReportCardFilter fields
+        - Report cards without marks are still exported
+    """
+    url = '/apis/v1/reportcard/export/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        student = Student.objects.create(name="Alice Smith", email="alice@example.com", date_of_birth=date(2001, 5, 15))
+        math = Subject.objects.create(name="Mathematics", code="MATH101")
+        science = Subject.objects.create(name="Science", code="SCI101")
+        term_one = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+        Mark.objects.create(report_card=term_one, subject=math, score=Decimal('88.50'))
+        Mark.objects.create(report_card=term_one, subject=science, score=Decimal('70'))
+        ReportCard.objects.create(student=student, term="Term 2", year=2025)
+        ReportCard.objects.create(student=student, term="Term 1", year=2024)
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        lines = self.read(self.client.get(self.url, {'year': 2025})).splitlines()
+        self.assertEqual(lines[0].split(',')[0], 'report_card_id')
+        self.assertEqual(len(lines), 4)
+        self.assertIn('MATH101,Mathematics,88.50', lines[1])
+        self.assertTrue(lines[3].endswith(',Term 2,2025,,,'))
+
+    def test_ndjson_export_with_filters(self):
+        response = self.client.get(self.url, {'year': 2025, 'term': 'Term 1', 'export_format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['subject_code'] for row in rows], ['MATH101', 'SCI101'])
+        self.assertEqual(rows[0]['score'], '88.50')
+
+    def test_unknown_export_format(self):
+        self.assertEqual(self.client.get(self.url, {'export_format': 'xml'}).status_code, 400)
@@ -0,0 +1,48 @@
+import statistics
+import numpy as np
+from decimal import Decimal
+from django.test import SimpleTestCase
+from students.summaries import calculate_grade
+from students.grading import grade_scores, group_statistics, rank_scores
+
+
+class GradingEngineTest(SimpleTestCase):
+    """
+    This class tests the vectorized grading and statistics engine.
+    Args:
+        - Baseclass (SimpleTestCase): No database is needed.
+    Returns:
+        - None
+    Tests:
+        - Vectorized grades match the scalar calculate_grade
+        - Group statistics match the statistics module
+        - Ranks and percentiles within groups, including ties
+    """
+    def test_grades_match_scalar_grading(self):
+        scores = [0, 49.99, 50, 59.99, 60, 69.99, 70, 79.99, 80, 89.99, 90, 100, Decimal('87.88')]
+        self.assertEqual(grade_scores(scores).tolist(), [calculate_grade(score) for score in scores])
+
+    def test_group_statistics(self):
+        scores = [70, 80, 90, 55, 65, 75, 85]
+        terms = ['Term 1', 'Term 1', 'Term 1', 'Term 2', 'Term 2', 'Term 2', 'Term 2']
+        result = group_statistics(scores, terms)
+        self.assertEqual(result['keys'], [('Term 1',), ('Term 2',)])
+        self.assertEqual(result['count'].tolist(), [3, 4])
+        self.assertEqual(result['mean'].tolist(), [80.0, 70.0])
+        self.assertEqual(result['median'].tolist(), [80.0, 70.0])
+        self.assertAlmostEqual(result['std'][1], statistics.pstdev(scores[3:]))
+        self.assertEqual(result['p75'][1], np.percentile(scores[3:], 75))
+        self.assertEqual(result['min'].tolist(), [70.0, 55.0])
+        self.assertEqual(result['max'].tolist(), [90.0, 85.0])
+
+    def test_group_statistics_with_several_columns(self):
+        result = group_statistics([60, 70, 80], ['Term 1', 'Term 1', 'Term 1'], [2024, 2025, 2024])
+        self.assertEqual(result['keys'], [('Term 1', 2024), ('Term 1', 2025)])
+        self.assertEqual(result['mean'].tolist(), [70.0, 70.0])
+
+    def test_rank_scores(self):
+        scores = [70, 90, 90, 60, 50, 80]
+        years = [2024, 2024, 2024, 2024, 2025, 2025]
+        ranks, percentiles = rank_scores(scores, years)
+        self.assertEqual(ranks.tolist(), [3, 1, 1, 4, 2, 1])
+        self.assertEqual(percentiles.tolist(), [50.0, 100.0, 100.0, 25.0, 50.0, 100.0])
@@ -0,0 +1,70 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark, DirtyTermSummary
+
+
+class MarkImportTest(TestCase):
+    """
+    This class tests the streaming bulk mark import endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - CSV rows create report cards and marks
+        - NDJSON rows update existing marks
+        - Invalid rows are reported per line without stopping the import
+        - Unsupported content types are rejected
+    """
+    url = '/apis/v1/reportcard/import/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.student = Student.objects.create(name="Alice Smith", email="alice@example.com", date_of_birth=date(2001, 5, 15))
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.science = Subject.objects.create(name="Science", code="SCI101")
+
+    def test_csv_import(self):
+        body = (
+            "student_email,subject_code,term,year,score\n"
+            "alice@example.com,MATH101,Term 1,2025,88.5\n"
+            "alice@example.com,SCI101,Term 1,2025,91\n"
+        )
+        response = self.client.generic('POST', self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['imported'], 2)
+        report_card = ReportCard.objects.get(student=self.student, term="Term 1", year=2025)
+        self.assertEqual(report_card.marks.get(subject=self.math).score, Decimal('88.50'))
+        self.assertTrue(DirtyTermSummary.objects.filter(student_id=self.student.id, term="Term 1", year=2025).exists())
+
+    def test_ndjson_import_updates_existing_marks(self):
+        report_card = ReportCard.objects.create(student=self.student, term="Term 2", year=2025)
+        Mark.objects.create(report_card=report_card, subject=self.math, score=Decimal('40'))
+        body = '{"student_email": "alice@example.com", "subject_code": "MATH101", "term": "Term 2", "year": 2025, "score": 75}\n'
+        response = self.client.generic('POST', self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Mark.objects.get(report_card=report_card, subject=self.math).score, Decimal('75'))
+        self.assertEqual(Mark.objects.count(), 1)
+
+    def test_row_errors_are_reported(self):
+        body = (
+            "student_email,subject_code,term,year,score\n"
+            "alice@example.com,MATH101,Term 1,2025,70\n"
+            "nobody@example.com,MATH101,Term 1,2025,70\n"
+            "alice@example.com,SCI101,Term 9,2025,abc\n"
+        )
+        response = self.client.generic('POST', self.url, body, content_type='text/csv')
+        data = response.data['data']
+        self.assertFalse(response.data['success'])
+        self.assertEqual((data['rows'], data['imported'], data['failed']), (3, 1, 2))
+        errors = {error['line']: error['errors'] for error in data['errors']}
+        self.assertEqual(errors[3], {'student_email': ["Student not found."]})
+        self.assertEqual(set(errors[4]), {'term', 'score'})
+
+    def test_unsupported_content_type(self):
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 415)
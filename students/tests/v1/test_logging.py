@@ -0,0 +1,110 @@
+import os
+import json
+import queue
+import logging
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase
+from core.logs.logger import (
+    TEXT_FORMAT,
+    JSONFormatter,
+    LocalTimeFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    SizeAndTimeRotatingFileHandler,
+)
+
+
+def make_record(message, created=1760000000.0, level=logging.INFO, lineno=10, name='core.logs.logger', exc_info=None):
+    record = logging.LogRecord(name, level, '/code/students/apis/v1/views.py', lineno, message, None, exc_info)
+    record.created = created
+    record.username = 'Anonymous'
+    record.short_path = 'apis/v1/views.py'
+    return record
+
+
+class LoggingPipelineTest(SimpleTestCase):
+    """
+    This class tests the formatters, filters and handlers of the logging pipeline.
+    Args:
+        - Baseclass (SimpleTestCase): Provides testing framework without a database.
+    Returns:
+        - None
+    Tests:
+        - Every record is stamped with its own creation time, in text and JSON
+        - Hot call sites are rate limited and sampled, warnings always pass
+        - The file rotates by size and reopens a file rotated by another process
+        - A full queue drops records without blocking and reports the drops
+    """
+    def test_record_time(self):
+        formatter = LocalTimeFormatter(TEXT_FORMAT)
+        first = formatter.format(make_record("first"))
+        second = formatter.format(make_record("second", created=1760000000.0 + 3600))
+        self.assertNotEqual(first.split(' -- ')[1], second.split(' -- ')[1])
+        self.assertTrue(first.startswith('INFO -- 2025-10-09 '))
+        self.assertTrue(first.endswith('-- apis/v1/views.py:10 -- User: Anonymous -- Message: first'))
+
+        try:
+            raise ValueError("bad score")
+        except ValueError as e:
+            entry = json.loads(JSONFormatter().format(make_record("failed", exc_info=(type(e), e, e.__traceback__))))
+        self.assertEqual(entry['message'], 'failed')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['path'], 'apis/v1/views.py:10')
+        self.assertIn('ValueError: bad score', entry['exception'])
+        self.assertTrue(entry['time'].startswith('2025-10-09T'))
+
+    def test_sampling(self):
+        rate_limit = SamplingFilter(rate_limit=2, window=60)
+        kept = [rate_limit.filter(make_record("hot", created=1000 + index)) for index in range(5)]
+        self.assertEqual(kept, [True, True, False, False, False])
+        self.assertTrue(rate_limit.filter(make_record("other site", lineno=20)))
+        self.assertTrue(rate_limit.filter(make_record("error", level=logging.ERROR)))
+        record = make_record("hot", created=1100)
+        self.assertTrue(rate_limit.filter(record))
+        self.assertEqual(record.suppressed, 3)
+        self.assertIn("(3 similar messages suppressed)", LocalTimeFormatter(TEXT_FORMAT).format(record))
+
+        sampling = SamplingFilter(sample_rates={'django.request': 0})
+        self.assertFalse(sampling.filter(make_record("sampled", name='django.request')))
+        self.assertTrue(sampling.filter(make_record("sampled", name='django.request', level=logging.WARNING)))
+        self.assertTrue(sampling.filter(make_record("kept")))
+
+    def test_rotation(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'reportcardsystem.log'
+        handler = SizeAndTimeRotatingFileHandler(str(path), max_bytes=200, backup_count=2)
+        self.addCleanup(handler.close)
+        handler.setFormatter(LocalTimeFormatter(TEXT_FORMAT))
+        for index in range(4):
+            handler.emit(make_record(f"message {index}"))
+        self.assertTrue(path.with_name('reportcardsystem.log.1').exists())
+        self.assertLessEqual(path.stat().st_size, 200)
+
+        # another process rotated the file, this one reopens it instead of rotating again
+        os.replace(path, path.with_name('reportcardsystem.log.2'))
+        path.touch()
+        self.assertTrue(handler.rotated_elsewhere())
+        handler.doRollover()
+        handler.emit(make_record("after rotation"))
+        self.assertIn("after rotation", path.read_text())
+        self.assertFalse(handler.rotated_elsewhere())
+
+        timed = SizeAndTimeRotatingFileHandler(str(path), interval=3600)
+        self.addCleanup(timed.close)
+        self.assertFalse(timed.shouldRollover(make_record("now")))
+        timed.rollover_at = 0
+        self.assertTrue(timed.shouldRollover(make_record("later")))
+
+    def test_full_queue(self):
+        handler = NonBlockingQueueHandler(queue.Queue(2))
+        for index in range(4):
+            handler.handle(make_record(f"message {index}", lineno=index))
+        self.assertEqual(handler.dropped, 2)
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record("next"))
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "next")
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "2 log records dropped, the log queue was full")
+        self.assertEqual(handler.dropped, 0)
@@ -0,0 +1,116 @@
+import os
+import sys
+import tempfile
+import subprocess
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from accounts.models import User
+from core.metrics import collect_request_stats, install_query_timers
+from core.renderers import ORJSONRenderer
+from students.apis.v1.serializers import ReportCardSerializer, STUDENT_VALUES
+from students.caching import report_card_cache
+from students.models import Student, Subject, ReportCard, Mark
+
+OBSERVE_SCRIPT = """
+import django
+django.setup()
+from core.metrics import RequestStats, observe
+stats = RequestStats()
+stats.db_queries = 3
+observe('reportcard-list', 'GET', 200, stats, 0.25, 1000)
+"""
+
+
+def sample(name, route, method='GET'):
+    return REGISTRY.get_sample_value(name, {'route': route, 'method': method}) or 0
+
+
+class PerformanceMiddlewareTest(TestCase):
+    """
+    This class tests the request metrics middleware and the Prometheus endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Server-Timing reports the queries the request ran
+        - Serializing and encoding are timed as separate phases, queries run while serializing stay db time
+        - Requests are observed per resolved route, streamed bodies once sent
+        - /metrics/ requires METRICS_TOKEN when set and sums the files of every worker process
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        self.report_card = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+        Mark.objects.create(report_card=self.report_card, subject=self.math, score=Decimal('80'))
+
+    def test_server_timing(self):
+        count = sample('http_request_duration_seconds_count', 'reportcard-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/apis/v1/reportcard/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for metric in ('db;dur=', 'serialize;dur=', 'encode;dur=', 'app;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertEqual(sample('http_request_duration_seconds_count', 'reportcard-list'), count + 1)
+        self.assertGreaterEqual(sample('http_request_db_queries_sum', 'reportcard-list'), len(queries))
+
+        count = sample('http_request_duration_seconds_count', 'reportcard-update-marks', 'PATCH')
+        self.client.patch(
+            f'/apis/v1/reportcard/{self.report_card.id}/update-marks/',
+            {'marks': [{'subject': self.math.id, 'score': 90}]}, format='json',
+        )
+        self.assertEqual(sample('http_request_duration_seconds_count', 'reportcard-update-marks', 'PATCH'), count + 1)
+        self.client.get('/apis/v1/no-such-route/')
+        self.assertGreaterEqual(sample('http_request_duration_seconds_count', 'unmatched'), 1)
+
+    def test_serialize_and_encode_phases(self):
+        install_query_timers()
+        with collect_request_stats() as stats:
+            # the marks are not prefetched, the nested serializer queries them while serializing
+            data = ReportCardSerializer(ReportCard.objects.all(), many=True).data
+            data = {'cards': data, 'students': STUDENT_VALUES.serialize(Student.objects.all())}
+            serialize_time, db_time = stats.serialize_time, stats.db_time
+            self.assertGreater(serialize_time, 0)
+            self.assertEqual(stats.db_queries, 3)
+            self.assertEqual(stats.encode_time, 0)
+            ORJSONRenderer().render(data)
+        self.assertGreater(stats.encode_time, 0)
+        self.assertEqual((stats.serialize_time, stats.db_time), (serialize_time, db_time))
+
+    def test_streamed_size(self):
+        size = sample('http_response_size_bytes_sum', 'reportcard-export')
+        response = self.client.get('/apis/v1/reportcard/export/')
+        self.assertEqual(sample('http_response_size_bytes_sum', 'reportcard-export'), size)
+        body = b''.join(response.streaming_content)
+        self.assertEqual(sample('http_response_size_bytes_sum', 'reportcard-export'), size + len(body))
+
+    def test_metrics_endpoint(self):
+        self.client.get('/apis/v1/reportcard/')
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics/').status_code, 403)
+            response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_request_duration_seconds_bucket{le="0.005",method="GET",route="reportcard-list"}', response.content)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory.name, 'DJANGO_SETTINGS_MODULE': 'reportcardsystem.settings'}
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', OBSERVE_SCRIPT], env=env, cwd=settings.BASE_DIR, check=True, capture_output=True)
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory.name
+        self.addCleanup(os.environ.pop, 'PROMETHEUS_MULTIPROC_DIR')
+        content = self.client.get('/metrics/').content.decode()
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="reportcard-list"} 2.0', content)
+        self.assertIn('http_request_db_queries_sum{method="GET",route="reportcard-list"} 6.0', content)
+        self.assertIn('http_requests_total{method="GET",route="reportcard-list",status="200"} 2.0', content)
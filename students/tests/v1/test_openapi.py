@@ -0,0 +1,54 @@
+import json
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase, override_settings
+from core.openapi import clear_schema_cache, write_schema
+
+
+class CachedSchemaTest(SimpleTestCase):
+    """
+    This class tests that the OpenAPI document is generated once and served with an ETag.
+    Args:
+        - Baseclass (SimpleTestCase): Provides testing framework without a database.
+    Returns:
+        - None
+    Tests:
+        - The first request generates the document and writes the schema file
+        - Later requests answer If-None-Match with 304
+        - A new schema file is served once the cache is cleared, as on deploy
+    """
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.schema_file = Path(directory.name) / 'openapi.json'
+        settings_override = override_settings(OPENAPI_SCHEMA_CACHE=True, OPENAPI_SCHEMA_FILE=str(self.schema_file))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        clear_schema_cache()
+        self.addCleanup(clear_schema_cache)
+
+    def test_generated_once(self):
+        response = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/openapi+json; charset=utf-8')
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(response.content, self.schema_file.read_bytes())
+        schema = json.loads(response.content)
+        self.assertIn('/apis/v1/reportcard/', schema['paths'])
+        self.assertEqual(schema['info']['title'], 'Report Card System API')
+        # generated without a request, the docs use the host serving them
+        self.assertNotIn('host', schema)
+
+        response = self.client.get('/documentation/?format=openapi', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/swagger/').status_code, 200)
+
+    def test_deploy(self):
+        etag = self.client.get('/swagger/?format=openapi')['ETag']
+        write_schema(b'{"swagger": "2.0", "paths": {}}', self.schema_file)
+        self.assertEqual(self.client.get('/swagger/?format=openapi', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        clear_schema_cache()
+        response = self.client.get('/swagger/?format=openapi', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"swagger": "2.0", "paths": {}}')
+        self.assertNotEqual(response['ETag'], etag)
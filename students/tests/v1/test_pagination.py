@@ -0,0 +1,74 @@
+from datetime import date
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.caching import report_card_cache
+from students.models import Student, ReportCard
+
+
+class KeysetPaginationTest(TestCase):
+    """
+    This class tests the cursor pagination mode of the report card list.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Following next links walks every report card once in (year, term, id) order
+        - The student ordering works together with the filters
+        - No count query is run and a broken cursor gives 404
+        - A page after a cursor seeks with an equality prefix on the (year, term, id) index
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.students = [
+            Student.objects.create(name=f"Student {chr(65 + index)}", email=f"student{index}@example.com", date_of_birth=date(2005, 1, 1))
+            for index in range(4)
+        ]
+        for student in self.students:
+            for year in (2024, 2025):
+                for term in ("Term 1", "Term 2"):
+                    ReportCard.objects.create(student=student, term=term, year=year)
+        ReportCard.objects.create(student=self.students[0], term="Term 3", year=None)
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [report_card['id'] for report_card in response.data['results']['data']]
+            url = response.data['next']
+        return ids
+
+    def test_walk_year_ordering(self):
+        ids = self.walk('/apis/v1/reportcard/?pagination=cursor&page_size=3')
+        expected = list(ReportCard.objects.order_by('year', 'term', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_walk_student_ordering_with_filter(self):
+        ids = self.walk('/apis/v1/reportcard/?pagination=cursor&ordering=student&year=2025&page_size=3')
+        expected = list(ReportCard.objects.filter(year=2025).order_by('student_id', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/apis/v1/reportcard/?pagination=cursor&page_size=3')
+        self.assertFalse(any('COUNT(*)' in query['sql'] for query in queries.captured_queries))
+        response = self.client.get('/apis/v1/reportcard/?pagination=cursor&cursor=broken')
+        self.assertEqual(response.status_code, 404)
+
+    def test_seek_uses_the_index_prefix(self):
+        first = self.client.get('/apis/v1/reportcard/?pagination=cursor&page_size=2')
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']['data']), 2)
+        seeks = [query['sql'] for query in queries.captured_queries if 'LIMIT' in query['sql']]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {seeks[0]}")
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('year=? AND term=? AND id>?', plan)
@@ -0,0 +1,55 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark
+from students.tests.v1.query_budget import QueryBudgetMixin
+
+
+class ReportCardQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    This class pins the query counts of the report card read endpoints.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - list runs the same queries for a page of 5 and a page of 50
+        - retrieve and the yearly summary stay within a fixed budget
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        subjects = [Subject.objects.create(name=f"Subject {index}", code=f"SUB{index}") for index in range(3)]
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        for index in range(50):
+            student = Student.objects.create(name="Student", email=f"student{index}@example.com", date_of_birth=date(2005, 1, 1))
+            report_card = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+            Mark.objects.bulk_create([
+                Mark(report_card=report_card, subject=subject, score=Decimal(60 + index % 40)) for subject in subjects
+            ])
+        for term in ("Term 1", "Term 2", "Term 3"):
+            report_card = ReportCard.objects.create(student=self.student, term=term, year=2025)
+            Mark.objects.bulk_create([Mark(report_card=report_card, subject=subject, score=Decimal(70)) for subject in subjects])
+        self.report_card = report_card
+
+    def test_list_constant(self):
+        self.assertQueriesConstant(
+            lambda: self.client.get('/apis/v1/reportcard/?page_size=5'),
+            lambda: self.client.get('/apis/v1/reportcard/?page_size=50'),
+            budget=4,
+        )
+        self.assertQueriesConstant(
+            lambda: self.client.get('/apis/v1/reportcard/?pagination=cursor&page_size=5'),
+            lambda: self.client.get('/apis/v1/reportcard/?pagination=cursor&page_size=50'),
+            budget=5,
+        )
+
+    def test_retrieve_and_summary_budget(self):
+        response = self.assertQueryBudget(lambda: self.client.get(f'/apis/v1/reportcard/{self.report_card.id}/'), 3)
+        self.assertEqual(len(response.data['data']['marks']), 3)
+        response = self.assertQueryBudget(
+            lambda: self.client.get(f'/apis/v1/reportcard/student/{self.student.id}/year/2025/'), 1
+        )
+        self.assertEqual(len(response.data['data']['report_cards']), 3)
@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student, Subject, ReportCard, Mark, StudentTermRank, StudentSubjectRank
+from students.summaries import compute_term_summaries, compute_dirty_term_summaries
+
+
+class RankingTest(TestCase):
+    """
+    This class tests the materialized student rank tables and the rank endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Overall and per-subject ranks are written by the summary run
+        - Ranks refresh when the incremental run picks up a changed mark
+        - Only rank rows that changed are written, rows of removed students are deleted
+        - The rank endpoint returns the precomputed rank, and 400 for a student ID that is not a number
+    """
+    def setUp(self):
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.science = Subject.objects.create(name="Science", code="SCI101")
+        self.students = []
+        for index, (math_score, science_score) in enumerate([(90, 60), (70, 80), (50, 70)]):
+            student = Student.objects.create(
+                name=f"Student {index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2005, 1, 1)
+            )
+            report_card = ReportCard.objects.create(student=student, term="Term 2", year=2025)
+            Mark.objects.create(report_card=report_card, subject=self.math, score=Decimal(math_score))
+            Mark.objects.create(report_card=report_card, subject=self.science, score=Decimal(science_score))
+            self.students.append(student)
+
+    def test_ranks_written_by_summary_run(self):
+        report = compute_term_summaries()
+        self.assertEqual(report['ranked_cohorts'], 1)
+        ranks = dict(StudentTermRank.objects.values_list('student_id', 'rank'))
+        self.assertEqual(ranks, {self.students[0].id: 1, self.students[1].id: 1, self.students[2].id: 3})
+        top = StudentTermRank.objects.get(student=self.students[2])
+        self.assertEqual(top.cohort_size, 3)
+        self.assertEqual(top.percentile, Decimal('33.33'))
+        science = StudentSubjectRank.objects.get(student=self.students[1], subject=self.science)
+        self.assertEqual(science.rank, 1)
+
+    def test_ranks_refresh_incrementally(self):
+        compute_dirty_term_summaries()
+        mark = Mark.objects.get(report_card__student=self.students[2], subject=self.math)
+        mark.score = Decimal('100')
+        mark.save()
+        compute_dirty_term_summaries()
+        self.assertEqual(StudentTermRank.objects.get(student=self.students[2]).rank, 1)
+        self.assertEqual(StudentSubjectRank.objects.get(student=self.students[0], subject=self.math).rank, 2)
+
+    def test_only_changed_ranks_are_written(self):
+        compute_term_summaries()
+        written = dict(StudentTermRank.objects.values_list('student_id', 'calculated_date'))
+        # student 1 overtakes student 0, student 2 keeps rank 3
+        Mark.objects.filter(report_card__student=self.students[1], subject=self.math).update(score=Decimal(75))
+        compute_term_summaries()
+        rewritten = dict(StudentTermRank.objects.values_list('student_id', 'calculated_date'))
+        self.assertEqual(rewritten[self.students[2].id], written[self.students[2].id])
+        self.assertGreater(rewritten[self.students[1].id], written[self.students[1].id])
+        self.assertEqual(StudentTermRank.objects.get(student=self.students[0]).rank, 2)
+
+        ReportCard.objects.filter(student=self.students[2]).delete()
+        compute_dirty_term_summaries()
+        self.assertFalse(StudentTermRank.objects.filter(student=self.students[2]).exists())
+        self.assertFalse(StudentSubjectRank.objects.filter(student=self.students[2]).exists())
+        self.assertEqual(StudentTermRank.objects.get(student=self.students[0]).cohort_size, 2)
+
+    def test_rank_endpoint(self):
+        compute_term_summaries()
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        response = client.get(f'/apis/v1/rank/{self.students[0].id}/', {'term': 'Term 2', 'year': 2025})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['rank'], 1)
+        self.assertEqual(len(response.data['data']['subjects']), 2)
+        missing = client.get(f'/apis/v1/rank/{self.students[0].id}/', {'term': 'Term 1', 'year': 2025})
+        self.assertEqual(missing.status_code, 404)
+        invalid = client.get('/apis/v1/rank/abc/', {'term': 'Term 2', 'year': 2025})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertFalse(invalid.data['success'])
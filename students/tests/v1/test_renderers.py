@@ -0,0 +1,82 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import msgpack
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from accounts.models import User
+from core.renderers import ORJSONRenderer, MessagePackRenderer
+from students.caching import report_card_cache
+from students.models import Student, Subject, ReportCard, Mark
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """
+    This class tests that the orjson renderer matches DRF's JSON renderer.
+    Args:
+        - Baseclass (SimpleTestCase): Provides testing framework without a database.
+    Returns:
+        - None
+    Tests:
+        - Decimals, dates, datetimes, lazy strings and integer keys render the same bytes
+    """
+    def test_same_bytes(self):
+        data = {
+            'score': Decimal('75.58333333333333'),
+            'date_of_birth': date(2005, 1, 1),
+            'calculated_date': datetime(2025, 5, 1, 10, 30, 15, 123456, tzinfo=timezone.utc),
+            'message': gettext_lazy("Report card"),
+            'subjects': {1: 'Nepali '},
+            'marks': [{'subject': 1, 'score': '80.00'}, None, True],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class RendererNegotiationTest(TestCase):
+    """
+    This class tests content negotiation between JSON and MessagePack on the report card endpoints.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Accept: application/msgpack returns the same payload as JSON
+        - A MessagePack request body is parsed
+        - JSON and MessagePack responses get different ETags and vary on Accept
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.subject = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2025)
+        Mark.objects.create(report_card=report_card, subject=self.subject, score=Decimal('80'))
+        self.report_card = report_card
+
+    def test_msgpack_response(self):
+        json_response = self.client.get('/apis/v1/reportcard/')
+        response = self.client.get('/apis/v1/reportcard/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+
+    def test_msgpack_request(self):
+        body = MessagePackRenderer().render({'report_cards': [{
+            'student': self.student.id, 'term': 'Term 2', 'year': 2025,
+            'marks': [{'subject': self.subject.id, 'score': '91.50'}],
+        }]})
+        response = self.client.post('/apis/v1/reportcard/bulk/', body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ReportCard.objects.filter(term='Term 2').count(), 1)
+
+    def test_etag_per_representation(self):
+        url = f'/apis/v1/reportcard/{self.report_card.id}/'
+        json_response = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=json_response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertNotEqual(response['ETag'], json_response['ETag'])
+        self.assertIn('Accept', response['Vary'])
+        repeat = self.client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
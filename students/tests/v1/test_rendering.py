@@ -0,0 +1,134 @@
+import tempfile
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
+from django.test import TestCase, override_settings
+from students.models import Student, Subject, ReportCard, Mark
+from students.rendering import render_report_cards, plan_render_chunks
+from students.tasks import render_term_report_cards, render_report_card_chunk, merge_report_card_renders
+
+NOTO_FONTS = [
+    '/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf',
+    '/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf',
+]
+DEJAVU_FONTS = ['/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf']
+HAS_NOTO = all(Path(font).is_file() for font in NOTO_FONTS)
+TEST_FONTS = NOTO_FONTS if HAS_NOTO else DEJAVU_FONTS
+
+
+@skipUnless(all(Path(font).is_file() for font in TEST_FONTS), "no TrueType font for the report card PDF")
+class ReportCardRenderingTest(TestCase):
+    """
+    This class tests the batch report card rendering pipeline.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - HTML and PDF artifacts are written under MEDIA_ROOT
+        - Unchanged report cards are skipped on the next run
+        - A changed mark re-renders only its card and drops the old artifacts
+        - The printed grade is given by the unrounded average, like the term summaries
+        - A daemonic process (Celery prefork worker) renders without a process pool
+        - Names outside latin-1 are printed in the PDF with the embedded fonts
+        - Devanagari names are printed in the PDF with the fallback font
+        - The render task fans id chunks out as a chord and merges the chunk reports
+    """
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root.name, REPORT_CARD_PDF_FONTS=TEST_FONTS)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        for index in range(2):
+            student = Student.objects.create(
+                name=f"Student {index}",
+                email=f"student{index}@example.com",
+                date_of_birth=date(2005, 1, 1)
+            )
+            report_card = ReportCard.objects.create(student=student, term="Term 1", year=2025)
+            Mark.objects.create(report_card=report_card, subject=self.math, score=Decimal(80 + index))
+
+    def artifacts(self):
+        return sorted(path.name for path in Path(self.media_root.name).rglob('*') if path.is_file())
+
+    def test_render_and_skip_unchanged(self):
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=2)
+        self.assertEqual(report['rendered'], 2)
+        artifacts = self.artifacts()
+        self.assertEqual(len(artifacts), 4)
+        pdf = next(Path(self.media_root.name).rglob('*.pdf')).read_bytes()
+        self.assertTrue(pdf.startswith(b'%PDF-'))
+        self.assertTrue(pdf.rstrip().endswith(b'%%EOF'))
+        html = next(Path(self.media_root.name).rglob('*.html')).read_text()
+        self.assertIn('Mathematics', html)
+
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=2)
+        self.assertEqual((report['rendered'], report['skipped']), (0, 2))
+        self.assertEqual(self.artifacts(), artifacts)
+
+    def test_changed_card_is_rendered_again(self):
+        render_report_cards(ReportCard.objects.filter(year=2025), workers=2)
+        before = self.artifacts()
+        Mark.objects.filter(score=Decimal(80)).update(score=Decimal(95))
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=2)
+        self.assertEqual((report['rendered'], report['skipped']), (1, 1))
+        after = self.artifacts()
+        self.assertEqual(len(after), 4)
+        self.assertEqual(len(set(before) & set(after)), 2)
+
+    def test_grade_uses_unrounded_average(self):
+        report_card = ReportCard.objects.get(student__name="Student 0")
+        Mark.objects.filter(report_card=report_card).update(score=Decimal('89.99'))
+        for code in ("SCI101", "HIS101"):
+            subject = Subject.objects.create(name=code, code=code)
+            Mark.objects.create(report_card=report_card, subject=subject, score=Decimal('90.00'))
+        render_report_cards(ReportCard.objects.filter(pk=report_card.pk), workers=1)
+        html = next(Path(self.media_root.name).rglob('*.html')).read_text()
+        self.assertRegex(html, r'class="score">90\.00<')
+        self.assertRegex(html, r'class="score">A<')
+
+    def test_daemonic_process_renders_in_process(self):
+        process = mock.Mock(daemon=True)
+        with mock.patch('students.rendering.multiprocessing.current_process', return_value=process), \
+                mock.patch('students.rendering.ProcessPoolExecutor', side_effect=AssertionError) as executor:
+            report = render_report_cards(ReportCard.objects.filter(year=2025), workers=4)
+        executor.assert_not_called()
+        self.assertEqual(report['rendered'], 2)
+        self.assertEqual(len(self.artifacts()), 4)
+
+    def test_non_latin_name_is_printed_in_pdf(self):
+        Student.objects.filter(name="Student 0").update(name="Ελένη Παπαδοπούλου")
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=1)
+        self.assertEqual(report['rendered'], 2)
+        self.assertEqual(len(list(Path(self.media_root.name).rglob('*.pdf'))), 2)
+        self.assertEqual(len(list(Path(self.media_root.name).rglob('*.html'))), 2)
+
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=1)
+        self.assertEqual((report['rendered'], report['skipped']), (0, 2))
+
+    @skipUnless(HAS_NOTO, "Noto Devanagari font is not installed")
+    def test_devanagari_name_is_printed_in_pdf(self):
+        Student.objects.filter(name="Student 0").update(name="राम शर्मा")
+        report = render_report_cards(ReportCard.objects.filter(year=2025), workers=1)
+        self.assertEqual(report['rendered'], 2)
+        self.assertEqual(len(list(Path(self.media_root.name).rglob('*.pdf'))), 2)
+
+    @override_settings(REPORT_CARD_RENDER_CHUNK_SIZE=1)
+    def test_render_task_fans_out_chunks(self):
+        ids = list(ReportCard.objects.order_by('id').values_list('id', flat=True))
+        self.assertEqual(plan_render_chunks(ReportCard.objects.filter(year=2025)), [(ids[0], ids[0]), (ids[1], ids[1])])
+        with mock.patch('students.tasks.chord') as chord:
+            chord.return_value.return_value.id = 'callback'
+            report = render_term_report_cards(year=2025, term="Term 1")
+        self.assertEqual(report, {'chunks': 2, 'callback_id': 'callback'})
+        signatures = list(chord.call_args.args[0])
+        self.assertEqual([signature.args for signature in signatures], [(2025, "Term 1", id, id) for id in ids])
+
+        reports = [render_report_card_chunk(2025, "Term 1", id, id) for id in ids]
+        self.assertEqual([chunk['rendered'] for chunk in reports], [1, 1])
+        report = merge_report_card_renders(reports, 0)
+        self.assertEqual((report['chunks'], report['rendered'], report['skipped']), (2, 2, 0))
+        self.assertEqual(len(self.artifacts()), 4)
@@ -0,0 +1,123 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from datetime import date
+from decimal import Decimal
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.db.utils import load_backend
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from accounts.models import User
+from core import routers
+from core.routers import use_replicas
+from students.models import Student, Subject, ReportCard, Mark, StudentTermSummary
+from students.tasks import calculate_student_term_summaries
+from students.caching import report_card_cache, acached_report_card
+
+REPLICA = 'replica_test'
+
+
+class ReadReplicaRouterTest(TestCase):
+    """
+    This class tests the read replica router with a second SQLite file standing in for the replica.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - GET requests read from the replica, writes go to the primary
+        - Reads after a write in the same block stay on the primary
+        - A replica failing its health check is skipped
+        - Cache misses load from the primary, so a lagging replica never fills the cache
+        - Summary tasks read the primary, so a lagging replica never overwrites fresher summaries
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        self.student = Student.objects.create(name="Replica Name", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.replica_path = Path(directory.name) / 'replica.sqlite3'
+        self.use_replica(self.replica_path)
+        routers._replica_health.clear()
+        self.addCleanup(routers._replica_health.clear)
+
+    def use_replica(self, path):
+        replica_settings = connections.configure_settings({
+            'default': connections.settings['default'],
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': f"{path.as_uri()}?mode=ro", 'OPTIONS': {'uri': True}},
+        })[REPLICA]
+        connections[REPLICA] = load_backend(replica_settings['ENGINE']).DatabaseWrapper(replica_settings, REPLICA)
+        self.addCleanup(self.drop_replica)
+        settings_override = override_settings(DATABASE_REPLICAS=[REPLICA])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def drop_replica(self):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+
+    def replicate(self):
+        # copy the primary as it is now, later writes are the replication lag
+        connections['default'].ensure_connection()
+        # the full text search index is left out, the dump cannot recreate virtual tables
+        dump = '\n'.join(
+            statement for statement in connections['default'].connection.iterdump()
+            if 'students_search' not in statement
+        )
+        with sqlite3.connect(self.replica_path) as replica:
+            replica.executescript(dump)
+        replica.close()
+
+    def test_reads_from_replica(self):
+        self.replicate()
+        Student.objects.filter(pk=self.student.pk).update(name="Primary Name")
+        response = self.client.get(f'/apis/v1/student/{self.student.pk}/')
+        self.assertEqual(response.data['data']['name'], "Replica Name")
+        response = self.client.post('/apis/v1/student/', {'name': "New", 'email': "new@example.com", 'date_of_birth': "2006-01-01"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Student.objects.using('default').filter(email="new@example.com").exists())
+
+    def test_read_after_write_stays_on_primary(self):
+        self.replicate()
+        with use_replicas():
+            self.assertEqual(Student.objects.get(pk=self.student.pk)._state.db, REPLICA)
+            Student.objects.filter(pk=self.student.pk).update(name="Primary Name")
+            student = Student.objects.get(pk=self.student.pk)
+        self.assertEqual((student._state.db, student.name), ('default', "Primary Name"))
+        self.assertEqual(Student.objects.get(pk=self.student.pk)._state.db, 'default')
+
+    def test_unhealthy_replica_is_skipped(self):
+        # nothing was replicated, so the read only replica file does not exist
+        with use_replicas():
+            self.assertEqual(Student.objects.get(pk=self.student.pk)._state.db, 'default')
+        self.assertFalse(routers._replica_health[REPLICA][0])
+
+    def test_cache_is_filled_from_primary(self):
+        report_card_cache().clear()
+        report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2025)
+        self.replicate()
+        math = Subject.objects.create(name="Mathematics", code="MATH101")
+        Mark.objects.create(report_card=report_card, subject=math, score=Decimal('80'))
+        Student.objects.filter(pk=self.student.pk).update(name="Primary Name")
+        response = self.client.get(f'/apis/v1/reportcard/{report_card.pk}/')
+        self.assertEqual(len(response.data['data']['marks']), 1)
+
+        async def load():
+            return (await Student.objects.aget(pk=self.student.pk)).name
+
+        async def read():
+            with use_replicas():
+                return await acached_report_card(report_card.pk, load, part='student_name')
+
+        self.assertEqual(async_to_sync(read)(), "Primary Name")
+
+    @override_settings(TERM_SUMMARY_SHARD_CONCURRENCY=1)
+    def test_summary_task_reads_primary(self):
+        report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2025)
+        self.replicate()
+        math = Subject.objects.create(name="Mathematics", code="MATH101")
+        Mark.objects.create(report_card=report_card, subject=math, score=Decimal('80'))
+        calculate_student_term_summaries()
+        self.assertEqual(StudentTermSummary.objects.get(student=self.student).total_score, Decimal('80'))
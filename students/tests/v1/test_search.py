@@ -0,0 +1,67 @@
+from datetime import date
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.models import Student
+from students.search import search_students
+
+
+class StudentSearchTest(TestCase):
+    """
+    This class tests the student list and full-text search endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Substrings of names and emails match, case insensitively
+        - Short queries match name prefixes
+        - Short queries seek the case folded name and email indexes
+        - Short queries count at most STUDENT_SEARCH_COUNT_LIMIT matches
+        - The index follows creates, updates and deletes through StudentView
+    """
+    url = '/apis/v1/student/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        for name, email in [("Hom Prasad Dhakal", "hom@example.com"), ("Sita Sharma", "sita.sharma@school.com"), ("Ram Thapa", "ram@example.com")]:
+            Student.objects.create(name=name, email=email, date_of_birth=date(2005, 1, 1))
+
+    def names(self, search):
+        response = self.client.get(self.url, {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [student['name'] for student in response.data['results']['data']]
+
+    def test_substring_search(self):
+        self.assertEqual(self.names('prasad'), ["Hom Prasad Dhakal"])
+        self.assertEqual(self.names('SHARMA@'), ["Sita Sharma"])
+        self.assertEqual(self.names('Ra'), ["Ram Thapa"])
+        self.assertEqual(self.client.get(self.url).data['count'], 3)
+
+    def test_prefix_search_seeks_folded_indexes(self):
+        Student.objects.filter(name="Ram Thapa").update(name="RAMESH Thapa")
+        self.assertEqual(self.names('rA'), ["RAMESH Thapa"])
+        self.assertEqual(self.names('hO'), ["Hom Prasad Dhakal"])
+        plan = search_students(Student.objects.order_by('name', 'id'), 'ra').explain()
+        self.assertIn('name_folded>? AND name_folded<?', plan)
+        self.assertIn('email_folded>? AND email_folded<?', plan)
+
+    @override_settings(STUDENT_SEARCH_COUNT_LIMIT=1)
+    def test_prefix_search_count_is_capped(self):
+        Student.objects.create(name="Sarita Rai", email="sarita@example.com", date_of_birth=date(2005, 1, 1))
+        response = self.client.get(self.url, {'search': 's', 'page_size': 1})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']['data']), 1)
+        self.assertEqual(self.client.get(self.url, {'search': 'sarita'}).data['count'], 1)
+
+    def test_index_follows_student_view(self):
+        response = self.client.post(self.url, {'name': "Gita Karki", 'email': "gita@example.com", 'date_of_birth': "2006-02-01"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.names('karki'), ["Gita Karki"])
+        student = Student.objects.get(email="gita@example.com")
+        self.client.put(f'{self.url}{student.id}/', {'name': "Gita Adhikari", 'email': "gita@example.com", 'date_of_birth': "2006-02-01"}, format='json')
+        self.assertEqual(self.names('karki'), [])
+        self.assertEqual(self.names('adhikari'), ["Gita Adhikari"])
+        self.client.delete(f'{self.url}{student.id}/')
+        self.assertEqual(self.names('adhikari'), [])
@@ -0,0 +1,114 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from students.caching import report_card_cache
+from students.models import Student, Subject, ReportCard, Mark, DirtyTermSummary
+from rest_framework.renderers import JSONRenderer
+from students.apis.v1.serializers import (
+    StudentSerializer,
+    SubjectSerializer,
+    ReportCardSerializer,
+    STUDENT_VALUES,
+    SUBJECT_VALUES,
+    REPORT_CARD_VALUES,
+    serialize_report_cards,
+)
+from students.tests.v1.query_budget import QueryBudgetMixin
+
+
+class ReportCardSerializerWriteTest(QueryBudgetMixin, TestCase):
+    """
+    This class tests the set based write path of ReportCardSerializer.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Creating a 12 subject card runs a fixed handful of queries
+        - Updating upserts marks in one statement and keeps unlisted marks by default
+        - delete_missing_marks removes marks missing from the payload in one statement
+    """
+    def setUp(self):
+        self.subjects = [Subject.objects.create(name=f"Subject {index:02}", code=f"SUB{index}") for index in range(12)]
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+
+    def payload(self, subjects, score):
+        return {
+            'student': self.student.id,
+            'term': 'Term 1',
+            'year': 2025,
+            'marks': [{'subject': subject.id, 'score': score} for subject in subjects],
+        }
+
+    def save(self, serializer):
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def test_create_fixed_queries(self):
+        serializer = ReportCardSerializer(data=self.payload(self.subjects, '80.00'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        report_card = self.assertQueryBudget(serializer.save, 6)
+        self.assertEqual(report_card.marks.count(), 12)
+
+    def test_update_upserts(self):
+        report_card = self.save(ReportCardSerializer(data=self.payload(self.subjects[:6], '50.00')))
+        serializer = ReportCardSerializer(report_card, data=self.payload(self.subjects[3:], '90.00'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertQueryBudget(serializer.save, 6)
+        scores = dict(report_card.marks.values_list('subject_id', 'score'))
+        self.assertEqual(len(scores), 12)
+        self.assertEqual(scores[self.subjects[0].id], Decimal('50.00'))
+        self.assertEqual(scores[self.subjects[3].id], Decimal('90.00'))
+
+    def test_delete_missing_marks(self):
+        report_card = self.save(ReportCardSerializer(data=self.payload(self.subjects, '50.00')))
+        serializer = ReportCardSerializer(
+            report_card, data=self.payload(self.subjects[:4], '70.00'), context={'delete_missing_marks': True}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertQueryBudget(serializer.save, 8)
+        self.assertEqual(sorted(report_card.marks.values_list('subject_id', flat=True)), [subject.id for subject in self.subjects[:4]])
+        self.assertTrue(DirtyTermSummary.objects.filter(student_id=self.student.id, term='Term 1', year=2025).exists())
+
+
+class ValuesSerializerParityTest(TestCase):
+    """
+    This class tests that the values() based read serializers render the same bytes as the ModelSerializers.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Students and subjects match
+        - Report cards with marks, without marks and without a year match
+        - The list endpoint renders the ModelSerializer output
+    """
+    def setUp(self):
+        report_card_cache().clear()
+        subjects = [Subject.objects.create(name=name, code=code) for name, code in [("Science", "SCI1"), ("Art", "ART1"), ("Maths", "MTH1")]]
+        for index, year in enumerate([2024, 2025, None]):
+            student = Student.objects.create(name=f"Student {chr(65 + index)}", email=f"student{index}@example.com", date_of_birth=date(2004 + index, 2, 29 - index))
+            report_card = ReportCard.objects.create(student=student, term=f"Term {index + 1}", year=year)
+            for subject, score in zip(subjects[index:], ['0', '99.5', '100.00']):
+                Mark.objects.create(report_card=report_card, subject=subject, score=Decimal(score))
+            ReportCard.objects.create(student=student, term="Term 3" if index < 2 else "Term 1", year=2023)
+
+    def assertSameJSON(self, fast, slow):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_students_and_subjects(self):
+        self.assertSameJSON(STUDENT_VALUES.serialize(Student.objects.all()), StudentSerializer(Student.objects.all(), many=True).data)
+        self.assertSameJSON(SUBJECT_VALUES.serialize(Subject.objects.all()), SubjectSerializer(Subject.objects.all(), many=True).data)
+
+    def test_report_cards(self):
+        fast = serialize_report_cards(ReportCard.objects.values(*REPORT_CARD_VALUES.columns))
+        self.assertSameJSON(fast, ReportCardSerializer(ReportCard.objects.all(), many=True).data)
+        self.assertEqual(sum(not report_card['marks'] for report_card in fast), 3)
+
+    def test_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        response = client.get('/apis/v1/reportcard/?page_size=100')
+        self.assertSameJSON(response.data['results']['data'], ReportCardSerializer(ReportCard.objects.all(), many=True).data)
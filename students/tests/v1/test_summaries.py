@@ -0,0 +1,283 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+from contextlib import contextmanager
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db.models import Avg, F
+from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
+from accounts.models import User
+from students.apis.v1.serializers import ReportCardSerializer
+from students.models import Student, Subject, ReportCard, Mark, StudentTermSummary, DirtyTermSummary
+from students import summaries
+from students.summaries import (
+    compute_term_summaries,
+    compute_dirty_term_summaries,
+    plan_term_summary_shards,
+    compute_term_summary_shard,
+    merge_term_summary_reports,
+)
+from students.tasks import calculate_grade
+
+
+def create_report_cards(count, subjects, offset=0):
+    """
+    create report cards with one mark per subject for new students
+    Args:
+        - count (int): number of report cards to create
+        - subjects (list): subjects to give a mark for
+        - offset (int): used to keep student emails unique
+    Returns:
+        - list of ReportCard
+    """
+    report_cards = []
+    for index in range(offset, offset + count):
+        student = Student.objects.create(
+            name=f"Student {index}",
+            email=f"student{index}@example.com",
+            date_of_birth=date(2005, 1, 1)
+        )
+        report_card = ReportCard.objects.create(student=student, term="Term 1", year=2024)
+        Mark.objects.bulk_create([
+            Mark(report_card=report_card, subject=subject, score=Decimal(60 + index % 40))
+            for subject in subjects
+        ])
+        report_cards.append(report_card)
+    return report_cards
+
+
+class ComputeTermSummariesTest(TestCase):
+    """
+    This class tests the set-based StudentTermSummary computation.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Total, average and grade are calculated per (student, term, year)
+        - The grade is given by the unrounded average, only the stored average is rounded
+        - Existing summaries are updated in place
+        - Report cards without marks get a zero summary
+        - Query count does not grow with the number of report cards
+        - Sharded run matches the sequential run, reads outside the write lock and reports its elapsed time
+    """
+    def setUp(self):
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.science = Subject.objects.create(name="Science", code="SCI101")
+        self.student = Student.objects.create(
+            name="Alice Smith",
+            email="alice@example.com",
+            date_of_birth=date(2001, 5, 15)
+        )
+        self.report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2024)
+        Mark.objects.create(report_card=self.report_card, subject=self.math, score=Decimal('95.50'))
+        Mark.objects.create(report_card=self.report_card, subject=self.science, score=Decimal('80.25'))
+
+    def test_summary_values(self):
+        report = compute_term_summaries()
+        summary = StudentTermSummary.objects.get(student=self.student, term="Term 1", year=2024)
+        self.assertEqual(report['summaries'], 1)
+        self.assertEqual(summary.total_score, Decimal('175.75'))
+        self.assertEqual(summary.average_score, Decimal('87.88'))
+        self.assertEqual(summary.grade, calculate_grade(Decimal('87.88')))
+
+    def test_grade_uses_unrounded_average(self):
+        Mark.objects.filter(report_card=self.report_card, subject=self.math).update(score=Decimal('89.99'))
+        Mark.objects.filter(report_card=self.report_card, subject=self.science).update(score=Decimal('90.00'))
+        history = Subject.objects.create(name="History", code="HIS101")
+        Mark.objects.create(report_card=self.report_card, subject=history, score=Decimal('90.00'))
+        compute_term_summaries()
+        summary = StudentTermSummary.objects.get(student=self.student, term="Term 1", year=2024)
+        # 89.9966... prints as 90.00 and grades as calculate_grade grades the average, an A
+        self.assertEqual(summary.average_score, Decimal('90.00'))
+        self.assertEqual(summary.grade, 'A')
+        self.assertEqual(summary.grade, calculate_grade(Decimal('269.99') / 3))
+
+    def test_existing_summary_is_updated(self):
+        compute_term_summaries()
+        Mark.objects.filter(report_card=self.report_card, subject=self.science).update(score=Decimal('40'))
+        compute_term_summaries()
+        summary = StudentTermSummary.objects.get(student=self.student, term="Term 1", year=2024)
+        self.assertEqual(StudentTermSummary.objects.count(), 1)
+        self.assertEqual(summary.total_score, Decimal('135.50'))
+        self.assertEqual(summary.grade, 'C')
+
+    def test_report_card_without_marks(self):
+        ReportCard.objects.create(student=self.student, term="Term 2", year=2024)
+        compute_term_summaries()
+        summary = StudentTermSummary.objects.get(student=self.student, term="Term 2", year=2024)
+        self.assertEqual(summary.total_score, Decimal('0'))
+        self.assertEqual(summary.grade, 'F')
+
+    def test_query_count_is_constant(self):
+        subjects = [self.math, self.science]
+        create_report_cards(5, subjects)
+        with CaptureQueriesContext(connection) as small_run:
+            compute_term_summaries()
+        create_report_cards(40, subjects, offset=5)
+        with CaptureQueriesContext(connection) as large_run:
+            report = compute_term_summaries()
+        self.assertEqual(report['summaries'], 46)
+        self.assertEqual(len(small_run.captured_queries), len(large_run.captured_queries))
+
+    def test_sharded_run_matches_sequential_run(self):
+        create_report_cards(23, [self.math, self.science])
+        fields = ('student_id', 'term', 'year', 'total_score', 'average_score', 'grade')
+        compute_term_summaries()
+        sequential = list(StudentTermSummary.objects.order_by('student_id').values_list(*fields))
+        StudentTermSummary.objects.all().delete()
+        shards = plan_term_summary_shards(shard_size=5, concurrency=3)
+        self.assertEqual(len(shards), 3)
+        held, locked_reads = [], []
+
+        @contextmanager
+        def recording_lock(*args, **kwargs):
+            held.append(True)
+            try:
+                yield
+            finally:
+                held.pop()
+
+        def record_locked_reads(execute, sql, params, many, context):
+            if held and sql.lstrip().upper().startswith('SELECT'):
+                locked_reads.append(sql)
+            return execute(sql, params, many, context)
+
+        started_at = time.time()
+        with mock.patch('students.summaries.write_lock', recording_lock), \
+                connection.execute_wrapper(record_locked_reads):
+            reports = [compute_term_summary_shard(ranges, batch_size=4) for ranges in shards]
+        report = merge_term_summary_reports(reports, started_at=started_at)
+        sharded = list(StudentTermSummary.objects.order_by('student_id').values_list(*fields))
+        self.assertEqual(report['summaries'], 24)
+        self.assertEqual(sharded, sequential)
+        # shards read outside the write lock, so they only serialize on their batch writes
+        self.assertEqual(locked_reads, [])
+        self.assertGreaterEqual(report['elapsed_seconds'], report['slowest_shard_seconds'])
+        self.assertLess(report['elapsed_seconds'], time.time() - started_at + 0.001)
+
+
+class DirtyTermSummaryTest(TestCase):
+    """
+    This class tests the dirty tracking and incremental StudentTermSummary computation.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - Mark and ReportCard writes record the affected key
+        - Incremental run recalculates only dirty keys and clears them
+        - Changing a report card term marks the old and new key
+        - Deleted report cards lose their summary
+        - A key marked again during a run stays dirty, whatever its marked_date
+    """
+    def setUp(self):
+        self.math = Subject.objects.create(name="Mathematics", code="MATH101")
+        self.student = Student.objects.create(
+            name="Bob Johnson",
+            email="bob@example.com",
+            date_of_birth=date(2000, 7, 20)
+        )
+        self.report_card = ReportCard.objects.create(student=self.student, term="Term 1", year=2024)
+        Mark.objects.create(report_card=self.report_card, subject=self.math, score=Decimal('72'))
+
+    def dirty_keys(self):
+        return set(DirtyTermSummary.objects.values_list('student_id', 'term', 'year'))
+
+    def test_writes_record_dirty_key(self):
+        self.assertEqual(self.dirty_keys(), {(self.student.id, "Term 1", 2024)})
+
+    def test_incremental_run_clears_dirty_keys(self):
+        other = create_report_cards(1, [self.math])[0]
+        DirtyTermSummary.objects.filter(student_id=other.student_id).delete()
+        report = compute_dirty_term_summaries()
+        self.assertEqual(report['summaries'], 1)
+        self.assertEqual(self.dirty_keys(), set())
+        self.assertTrue(StudentTermSummary.objects.filter(student=self.student).exists())
+        self.assertFalse(StudentTermSummary.objects.filter(student_id=other.student_id).exists())
+
+    def test_mark_update_refreshes_summary(self):
+        compute_dirty_term_summaries()
+        mark = Mark.objects.get(report_card=self.report_card)
+        mark.score = Decimal('91')
+        mark.save()
+        compute_dirty_term_summaries()
+        self.assertEqual(StudentTermSummary.objects.get(student=self.student).grade, 'A+')
+
+    def test_term_change_marks_old_and_new_key(self):
+        compute_dirty_term_summaries()
+        report_card = ReportCard.objects.get(pk=self.report_card.pk)
+        report_card.term = "Term 2"
+        report_card.save()
+        self.assertEqual(self.dirty_keys(), {
+            (self.student.id, "Term 1", 2024),
+            (self.student.id, "Term 2", 2024),
+        })
+        compute_dirty_term_summaries()
+        terms = list(StudentTermSummary.objects.filter(student=self.student).values_list('term', flat=True))
+        self.assertEqual(terms, ["Term 2"])
+
+    def test_deleted_report_card_removes_summary(self):
+        compute_dirty_term_summaries()
+        self.report_card.delete()
+        report = compute_dirty_term_summaries()
+        self.assertEqual(report['removed'], 1)
+        self.assertFalse(StudentTermSummary.objects.filter(student=self.student).exists())
+
+    def test_key_marked_during_run_stays_dirty(self):
+        write_term_summaries = summaries.write_term_summaries
+
+        def write_and_mark_again(*args):
+            result = write_term_summaries(*args)
+            # another server with a slower clock marks the key again before the claim is deleted
+            DirtyTermSummary.objects.update(marked_date=F('marked_date') - timedelta(microseconds=1))
+            return result
+
+        with mock.patch('students.summaries.write_term_summaries', side_effect=write_and_mark_again):
+            report = compute_dirty_term_summaries()
+        self.assertEqual((report['summaries'], report['dirty']), (1, 0))
+        self.assertEqual(self.dirty_keys(), {(self.student.id, "Term 1", 2024)})
+        self.assertEqual(compute_dirty_term_summaries()['dirty'], 1)
+        self.assertEqual(self.dirty_keys(), set())
+
+
+class YearlyReportTest(TestCase):
+    """
+    This class tests the single pass yearly report behind the report_cards_with_summary endpoint.
+    Args:
+        - Baseclass (TestCase): Provides testing framework and DB setup.
+    Returns:
+        - None
+    Tests:
+        - The endpoint renders the same JSON as serializing the cards and aggregating in the database
+        - The endpoint runs a single query
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='admin@example.com', username='admin', password='pass'))
+        math = Subject.objects.create(name="Mathematics", code="MATH101")
+        science = Subject.objects.create(name="Science", code="SCI101")
+        self.student = Student.objects.create(name="Student", email="student@example.com", date_of_birth=date(2005, 1, 1))
+        for term, scores in [("Term 2", [(science, '71.50'), (math, '90')]), ("Term 1", [(math, '65.25')]), ("Term 3", [])]:
+            report_card = ReportCard.objects.create(student=self.student, term=term, year=2025)
+            for subject, score in scores:
+                Mark.objects.create(report_card=report_card, subject=subject, score=Decimal(score))
+        ReportCard.objects.create(student=self.student, term="Term 1", year=2024)
+
+    def test_matches_database_aggregates(self):
+        url = f'/apis/v1/reportcard/student/{self.student.id}/year/2025/'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(queries), 1)
+        report_cards = ReportCard.objects.filter(student=self.student, year=2025)
+        expected = {
+            'report_cards': ReportCardSerializer(report_cards, many=True).data,
+            'summary': {
+                'average_per_subject': list(report_cards.values('marks__subject').annotate(avg_score=Avg('marks__score'))),
+                'overall_average': report_cards.aggregate(overall_avg=Avg('marks__score'))['overall_avg'],
+            },
+        }
+        self.assertEqual(JSONRenderer().render(response.data['data']), JSONRenderer().render(expected))